@@ -34,10 +34,33 @@ class Settings(BaseSettings):
     CONTRACTOR_2_MNEMONIC: str = os.getenv("CONTRACTOR_2_MNEMONIC", "")
     
     # IPFS (for NFT metadata)
+    # Storage backend: "infura" (any /api/v0/add endpoint), "pinata", or
+    # "local" (files under IPFS_LOCAL_BLOCKSTORE_DIR; offline tests and benchmarks)
+    IPFS_BACKEND: str = os.getenv("IPFS_BACKEND", "infura")
     IPFS_API_URL: str = os.getenv("IPFS_API_URL", "https://ipfs.infura.io:5001")
     IPFS_PROJECT_ID: str = os.getenv("IPFS_PROJECT_ID", "")
     IPFS_PROJECT_SECRET: str = os.getenv("IPFS_PROJECT_SECRET", "")
     IPFS_GATEWAY: str = os.getenv("IPFS_GATEWAY", "https://ipfs.io/ipfs/")
+    PINATA_API_URL: str = os.getenv("PINATA_API_URL", "https://api.pinata.cloud")
+    PINATA_JWT: str = os.getenv("PINATA_JWT", "")
+    IPFS_LOCAL_BLOCKSTORE_DIR: str = os.getenv("IPFS_LOCAL_BLOCKSTORE_DIR", ".cache/ipfs-blockstore")
+    # Directory for metadata fetched from the gateway, keyed by CID (never expires)
+    IPFS_METADATA_CACHE_DIR: str = os.getenv("IPFS_METADATA_CACHE_DIR", ".cache/ipfs-metadata")
+    # Largest metadata document fetched from the gateway (capped at one 256 KiB chunk)
+    IPFS_METADATA_MAX_BYTES: int = int(os.getenv("IPFS_METADATA_MAX_BYTES", "65536"))
+    IPFS_TIMEOUT_SECONDS: float = float(os.getenv("IPFS_TIMEOUT_SECONDS", "10"))
+    IPFS_MAX_RETRIES: int = int(os.getenv("IPFS_MAX_RETRIES", "2"))
+    # Pin outbox worker: seconds between polls (0 disables), parallel uploads,
+    # and attempts before a pin is marked failed
+    IPFS_PIN_INTERVAL_SECONDS: int = int(os.getenv("IPFS_PIN_INTERVAL_SECONDS", "5"))
+    IPFS_PIN_CONCURRENCY: int = int(os.getenv("IPFS_PIN_CONCURRENCY", "4"))
+    IPFS_PIN_MAX_ATTEMPTS: int = int(os.getenv("IPFS_PIN_MAX_ATTEMPTS", "8"))
+    # NFT status cache: seconds between indexer scans for asset config/destroy
+    # transactions (0 disables), and entry lifetime when no indexer is configured
+    NFT_STATUS_OBSERVE_INTERVAL_SECONDS: int = int(os.getenv("NFT_STATUS_OBSERVE_INTERVAL_SECONDS", "10"))
+    NFT_STATUS_FALLBACK_TTL_SECONDS: int = int(os.getenv("NFT_STATUS_FALLBACK_TTL_SECONDS", "60"))
+    # Concurrent algod reads when fetching asset params for many NFTs
+    NFT_STATUS_MAX_CONCURRENCY: int = int(os.getenv("NFT_STATUS_MAX_CONCURRENCY", "8"))
     
     # Network (testnet/mainnet)
     ALGORAND_NETWORK: str = os.getenv("ALGORAND_NETWORK", "testnet")
@@ -49,6 +72,29 @@ class Settings(BaseSettings):
         "http://127.0.0.1:5173",
     ]
     
+    # Response caching (seconds before a cached public response is rebuilt)
+    TENDER_CACHE_TTL_SECONDS: int = int(os.getenv("TENDER_CACHE_TTL_SECONDS", "30"))
+    # Rounds a simulate preflight result stays valid for the same unsigned group
+    PREFLIGHT_ROUND_WINDOW: int = int(os.getenv("PREFLIGHT_ROUND_WINDOW", "10"))
+    # Concurrent algod reads when fetching global state for many applications
+    APP_STATE_MAX_CONCURRENCY: int = int(os.getenv("APP_STATE_MAX_CONCURRENCY", "8"))
+    # Seconds between chain/database reconciliation passes; 0 disables the
+    # background worker (enable it on a single process only)
+    RECONCILE_INTERVAL_SECONDS: int = int(os.getenv("RECONCILE_INTERVAL_SECONDS", "0"))
+    # Most rounds of app calls scanned per app in one reconciliation pass; a
+    # contract further behind catches up over the following passes
+    RECONCILE_MAX_SCAN_ROUNDS: int = int(os.getenv("RECONCILE_MAX_SCAN_ROUNDS", "1000"))
+
+    # Metrics: prometheus_client's multiprocess directory, shared by the uvicorn
+    # workers for /metrics to merge (empty: single process). prometheus_client
+    # reads it from the environment itself, so set it there, not in .env. Empty it
+    # before starting the server.
+    PROMETHEUS_MULTIPROC_DIR: str = os.getenv("PROMETHEUS_MULTIPROC_DIR", "")
+    # Warn when one request runs the same SQL statement more than this many
+    # times, a likely N+1 query (0 disables). With DEBUG, responses also carry
+    # X-DB-Queries and X-DB-Time headers.
+    DB_REPEATED_STATEMENT_THRESHOLD: int = int(os.getenv("DB_REPEATED_STATEMENT_THRESHOLD", "10"))
+
     # Application
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
     DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
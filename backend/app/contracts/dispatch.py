@@ -0,0 +1,80 @@
+"""
+Constant-cost ABI method dispatch for PyTeal programs
+
+PyTeal has no expression for the TEAL v8 `pushbytess` and `match` opcodes, so
+MethodDispatch emits them directly:
+
+    pushbytess 0x<selector 1> 0x<selector 2> ...
+    txna ApplicationArgs 0
+    match <method 1> <method 2> ...
+    err
+
+Every call costs the same three opcodes whichever method it targets. Each
+route is a zero-argument PyTeal Subroutine that must end the program with
+Approve or Reject: `match` jumps into it without a callsub, so compile with
+OptimizeOptions(frame_pointers=False) to keep `proto` out of the bodies.
+"""
+
+from typing import TYPE_CHECKING, List, Tuple
+import pyteal as pt
+from pyteal.ir import Op, TealOp, TealSimpleBlock
+from pyteal.types import TealType
+from app.contracts.methods import method_selector
+
+if TYPE_CHECKING:
+    from pyteal.compiler import CompileOptions
+
+
+class _AvmOp:
+    """Stand-in for a pyteal.Op member, for opcodes PyTeal does not know about"""
+
+    def __init__(self, name: str, min_version: int):
+        self.name = name
+        self.min_version = min_version
+        self.mode = pt.Mode.Application | pt.Mode.Signature
+
+    def __str__(self) -> str:
+        return self.name
+
+
+_PUSHBYTESS = _AvmOp("pushbytess", 8)
+_MATCH = _AvmOp("match", 8)
+
+
+class MethodDispatch(pt.Expr):
+    """Route application calls on their ARC-4 selector with a single `match`"""
+
+    def __init__(self, routes: List[Tuple[str, pt.SubroutineFnWrapper]]):
+        """
+        Args:
+            routes: (method signature, zero-argument Subroutine) pairs
+        """
+        super().__init__()
+        if not routes:
+            raise ValueError("MethodDispatch needs at least one route")
+        for signature, handler in routes:
+            if handler.subroutine.argument_count() != 0:
+                raise ValueError(f"Handler for {signature} must take no arguments")
+        self.routes = routes
+
+    def __teal__(self, options: "CompileOptions"):
+        selectors = [f"0x{method_selector(signature).hex()}" for signature, _ in self.routes]
+        handlers = [handler.subroutine for _, handler in self.routes]
+        block = TealSimpleBlock([
+            TealOp(self, _PUSHBYTESS, *selectors),
+            TealOp(self, Op.txna, "ApplicationArgs", 0),
+            TealOp(self, _MATCH, *handlers),
+            # No selector matched
+            TealOp(self, Op.err),
+        ])
+        return block, block
+
+    def __str__(self) -> str:
+        return "(MethodDispatch {})".format(" ".join(signature for signature, _ in self.routes))
+
+    def type_of(self):
+        return TealType.none
+
+    def has_return(self):
+        return True
+
@@ -8,9 +8,32 @@ Reference: https://dev.algorand.co/concepts/smart-contracts/storage/box/
 import pyteal as pt
 from typing import List, Dict, Any
 import logging
+from app.contracts.milestone_box import (
+    MilestoneBoxStatus,
+    MILESTONE_BOX_PREFIX,
+    MILESTONE_BOX_SIZE,
+    AMOUNT_OFFSET,
+    STATUS_OFFSET,
+    PROOF_HASH_SIZE,
+)
+from app.contracts import global_state, methods
+from app.contracts.dispatch import MethodDispatch
 
 logger = logging.getLogger(__name__)
 
+# ARC-4 (uint64,uint64,uint64) tuple: milestone_index (8) + amount (8) + due_date (8)
+MILESTONE_RECORD_SIZE = 24
+# ARC-4 dynamic arrays start with a uint16 element count
+ABI_ARRAY_LENGTH_SIZE = 2
+ADDRESS_SIZE = 32
+SIGNATURE_SIZE = 64
+# Milestones one release_batch call may pay: a call carries 8 references,
+# one of which is the contractor account receiving the inner payments
+MAX_RELEASE_BATCH = 7
+# App calls a verify_milestone group needs to pool enough opcode budget
+# (Ed25519Verify alone costs 1900, one call has 700); the rest are opup calls
+VERIFY_MILESTONE_APP_CALLS = 3
+
 
 class FairLensContract:
     """
@@ -36,25 +59,25 @@ class FairLensContract:
         Box keys: "m_{milestone_index}" stores milestone data
         """
         
-        # Global state keys
-        owner_key = pt.Bytes("owner")
-        contractor_key = pt.Bytes("contractor")
-        verifier_key = pt.Bytes("verifier")
-        total_amount_key = pt.Bytes("total_amt")
-        milestone_count_key = pt.Bytes("m_count")
-        current_milestone_key = pt.Bytes("curr_m")
-        paused_key = pt.Bytes("paused")
-        verifier_update_time_key = pt.Bytes("verifier_update")
-        verifier_timelock_key = pt.Bytes("verifier_timelock")  # 24 hours in seconds
+        # Global state keys (names shared with the decoder in global_state.py)
+        owner_key = pt.Bytes(global_state.OWNER_KEY)
+        contractor_key = pt.Bytes(global_state.CONTRACTOR_KEY)
+        verifier_key = pt.Bytes(global_state.VERIFIER_KEY)
+        total_amount_key = pt.Bytes(global_state.TOTAL_AMOUNT_KEY)
+        milestone_count_key = pt.Bytes(global_state.MILESTONE_COUNT_KEY)
+        current_milestone_key = pt.Bytes(global_state.CURRENT_MILESTONE_KEY)
+        paused_key = pt.Bytes(global_state.PAUSED_KEY)
+        verifier_update_time_key = pt.Bytes(global_state.VERIFIER_UPDATE_TIME_KEY)
+        verifier_timelock_key = pt.Bytes(global_state.VERIFIER_TIMELOCK_KEY)  # 24 hours in seconds
         
         # Box key prefix for milestones
-        milestone_box_prefix = pt.Bytes("m_")
+        milestone_box_prefix = pt.Bytes(MILESTONE_BOX_PREFIX)
         
         # On creation: initialize state
         on_creation = pt.Seq([
-            pt.App.globalPut(owner_key, pt.Bytes(self.owner_address)),
-            pt.App.globalPut(contractor_key, pt.Bytes(self.contractor_address)),
-            pt.App.globalPut(verifier_key, pt.Bytes(self.verifier_address)),
+            pt.App.globalPut(owner_key, pt.Addr(self.owner_address)),
+            pt.App.globalPut(contractor_key, pt.Addr(self.contractor_address)),
+            pt.App.globalPut(verifier_key, pt.Addr(self.verifier_address)),
             pt.App.globalPut(total_amount_key, pt.Int(self.total_amount)),
             pt.App.globalPut(milestone_count_key, pt.Int(0)),
             pt.App.globalPut(current_milestone_key, pt.Int(0)),
@@ -68,32 +91,85 @@ class FairLensContract:
         def milestone_box_key(milestone_index: pt.Expr) -> pt.Expr:
             return pt.Concat(milestone_box_prefix, pt.Itob(milestone_index))
         
-        # Add milestone (called by owner)
-        # Args: [1] = milestone_index, [2] = amount, [3] = due_date
-        def add_milestone():
-            milestone_index = pt.Btoi(pt.Txn.application_args[1])
-            amount = pt.Btoi(pt.Txn.application_args[2])
-            due_date = pt.Btoi(pt.Txn.application_args[3])
-            
+        # Helper: Single status byte as a bytes literal
+        def status_byte(milestone_status: MilestoneBoxStatus) -> pt.Expr:
+            return pt.Bytes("base16", f"{int(milestone_status):02x}")
+        
+        # Helper: Create one milestone box, or rewrite one that is still pending,
+        # then bump the count. A verified or paid milestone is never rewritten:
+        # that would reset its status and proof and let its amount change.
+        # Layout is defined in milestone_box.py (MILESTONE_BOX_SIZE bytes, fixed width)
+        def write_milestone(milestone_index: pt.Expr, amount: pt.Expr, due_date: pt.Expr) -> pt.Expr:
             box_key = milestone_box_key(milestone_index)
-            # Box stores: amount (8 bytes) + due_date (8 bytes) + status (1 byte) = 17 bytes
-            box_size = pt.Int(17)
+            existing = pt.App.box_length(box_key)
             
             return pt.Seq([
-                pt.Assert(pt.Txn.sender() == pt.App.globalGet(owner_key)),
-                pt.Assert(pt.App.globalGet(paused_key) == pt.Int(0)),  # Check not paused
-                # Check if box exists, create if not
-                box_len := pt.Box.len(box_key),
-                pt.If(box_len == pt.Int(0))
-                .Then(pt.Box.create(box_key, box_size))
-                .Else(pt.Seq([])),  # Box already exists
-                # Write milestone data: amount (8) + due_date (8) + status (1)
-                pt.Box.replace(box_key, pt.Int(0), pt.Itob(amount)),
-                pt.Box.replace(box_key, pt.Int(8), pt.Itob(due_date)),
-                pt.Box.replace(box_key, pt.Int(16), pt.Itob(pt.Int(0))),  # Status: 0 = pending (1 byte)
+                existing,
+                pt.If(existing.hasValue()).Then(pt.Assert(
+                    pt.App.box_extract(box_key, pt.Int(STATUS_OFFSET), pt.Int(1))
+                    == status_byte(MilestoneBoxStatus.PENDING)
+                )),
+                # One full-record write: amount + due_date, then zeroed
+                # status (pending), proof_hash and verified_round
+                pt.App.box_put(
+                    box_key,
+                    pt.Concat(
+                        pt.Itob(amount),
+                        pt.Itob(due_date),
+                        pt.BytesZero(pt.Int(MILESTONE_BOX_SIZE - STATUS_OFFSET))
+                    )
+                ),
                 # Update milestone count
                 pt.If(milestone_index >= pt.App.globalGet(milestone_count_key))
                 .Then(pt.App.globalPut(milestone_count_key, milestone_index + pt.Int(1))),
+            ])
+        
+        # Method bodies below are the targets of MethodDispatch; each ends the
+        # program with Approve. Argument layouts follow the signatures in methods.py
+        
+        # Add milestone (called by owner)
+        # Args: [1] = milestone_index, [2] = amount, [3] = due_date (uint64 each)
+        def add_milestone():
+            return pt.Seq([
+                pt.Assert(pt.Txn.sender() == pt.App.globalGet(owner_key)),
+                pt.Assert(pt.App.globalGet(paused_key) == pt.Int(0)),  # Check not paused
+                write_milestone(
+                    pt.Btoi(pt.Txn.application_args[1]),
+                    pt.Btoi(pt.Txn.application_args[2]),
+                    pt.Btoi(pt.Txn.application_args[3])
+                ),
+                pt.Approve()
+            ])
+        
+        # Add many milestones in one call (called by owner)
+        # Args: [1] = (uint64,uint64,uint64)[]: uint16 count, then MILESTONE_RECORD_SIZE
+        #       byte records of milestone_index + amount + due_date
+        # Every box written must be in the group's box references
+        def add_milestones():
+            packed = pt.Txn.application_args[1]
+            count = pt.ScratchVar(pt.TealType.uint64)
+            i = pt.ScratchVar(pt.TealType.uint64)
+            offset = pt.ScratchVar(pt.TealType.uint64)
+            record_size = pt.Int(MILESTONE_RECORD_SIZE)
+            
+            return pt.Seq([
+                pt.Assert(pt.Txn.sender() == pt.App.globalGet(owner_key)),
+                pt.Assert(pt.App.globalGet(paused_key) == pt.Int(0)),  # Check not paused
+                count.store(pt.ExtractUint16(packed, pt.Int(0))),
+                pt.Assert(count.load() > pt.Int(0)),
+                pt.Assert(pt.Len(packed) == pt.Int(ABI_ARRAY_LENGTH_SIZE) + count.load() * record_size),
+                pt.For(
+                    i.store(pt.Int(0)),
+                    i.load() < count.load(),
+                    i.store(i.load() + pt.Int(1))
+                ).Do(pt.Seq([
+                    offset.store(pt.Int(ABI_ARRAY_LENGTH_SIZE) + i.load() * record_size),
+                    write_milestone(
+                        pt.ExtractUint64(packed, offset.load()),
+                        pt.ExtractUint64(packed, offset.load() + pt.Int(8)),
+                        pt.ExtractUint64(packed, offset.load() + pt.Int(16))
+                    ),
+                ])),
                 pt.Approve()
             ])
         
@@ -105,6 +181,11 @@ class FairLensContract:
                 pt.Approve()
             ])
         
+        # Opcode budget padding (any caller)
+        # Each app call in a group adds 700 to the pooled budget; this one does nothing else
+        def opup():
+            return pt.Approve()
+        
         # Resume after pause (called by owner)
         def resume_contract():
             return pt.Seq([
@@ -114,7 +195,7 @@ class FairLensContract:
             ])
         
         # Update verifier with timelock (called by owner)
-        # Args: [1] = new_verifier_address
+        # Args: [1] = new_verifier_address (32-byte public key)
         def update_verifier():
             new_verifier = pt.Txn.application_args[1]
             current_time = pt.Global.latest_timestamp()
@@ -123,6 +204,7 @@ class FairLensContract:
             
             return pt.Seq([
                 pt.Assert(pt.Txn.sender() == pt.App.globalGet(owner_key)),
+                pt.Assert(pt.Len(new_verifier) == pt.Int(ADDRESS_SIZE)),
                 # Check if timelock has passed or this is the first update
                 pt.If(update_time == pt.Int(0))
                 .Then(  # First update, allow immediately
@@ -143,13 +225,13 @@ class FairLensContract:
             ])
         
         # Verify milestone (called by verifier)
-        # Args: [1] = milestone_index, [2] = signature (64 bytes), [3] = message (variable length), [4] = proof_hash
+        # Args: [1] = milestone_index, [2] = signature (64 bytes),
+        #       [3] = proof_hash (32 bytes, zeros if there is no proof document)
         # Uses Ed25519Verify for signature validation with replay protection
         def verify_milestone():
             milestone_index = pt.Btoi(pt.Txn.application_args[1])
-            signature = pt.Txn.application_args[2] if pt.Txn.application_args.length() > pt.Int(2) else pt.Bytes("")
-            message = pt.Txn.application_args[3] if pt.Txn.application_args.length() > pt.Int(3) else pt.Bytes("")
-            proof_hash = pt.Txn.application_args[4] if pt.Txn.application_args.length() > pt.Int(4) else pt.Bytes("")
+            signature = pt.Txn.application_args[2]
+            proof_hash = pt.Txn.application_args[3]
             
             box_key = milestone_box_key(milestone_index)
             
@@ -164,22 +246,30 @@ class FairLensContract:
                 pt.Itob(pt.Global.latest_timestamp())
             )
             
-            # Verify signature (Ed25519Verify)
-            signature_valid = pt.Len(signature) == pt.Int(64)
-            
             return pt.Seq([
                 pt.Assert(pt.Txn.sender() == pt.App.globalGet(verifier_key)),
                 pt.Assert(pt.App.globalGet(paused_key) == pt.Int(0)),  # Check not paused
                 pt.Assert(pt.App.globalGet(current_milestone_key) == milestone_index),
-                pt.Assert(pt.Box.len(box_key) > pt.Int(0)),
-                pt.Assert(signature_valid),  # Signature must be 64 bytes for Ed25519
+                milestone := pt.App.box_get(box_key),
+                pt.Assert(milestone.hasValue()),
+                pt.Assert(
+                    pt.GetByte(milestone.value(), pt.Int(STATUS_OFFSET))
+                    == pt.Int(int(MilestoneBoxStatus.PENDING))
+                ),
+                pt.Assert(pt.Len(signature) == pt.Int(SIGNATURE_SIZE)),  # Ed25519 signature
+                pt.Assert(pt.Len(proof_hash) == pt.Int(PROOF_HASH_SIZE)),
                 # Verify the signature using Ed25519
                 pt.Assert(pt.Ed25519Verify(verification_message, signature, verifier_addr)),
-                # Update milestone status to verified (status = 1)
-                pt.Box.replace(box_key, pt.Int(16), pt.Itob(pt.Int(1))),  # Status: 1 = verified
-                # Store proof hash in box for tamper detection (optional)
-                pt.If(pt.Len(proof_hash) > pt.Int(0))
-                .Then(pt.Box.replace(box_key, pt.Int(17), proof_hash)),  # Store proof hash after status
+                # status, proof_hash and verified_round are contiguous: write them at once
+                pt.App.box_replace(
+                    box_key,
+                    pt.Int(STATUS_OFFSET),
+                    pt.Concat(
+                        status_byte(MilestoneBoxStatus.VERIFIED),
+                        proof_hash,
+                        pt.Itob(pt.Global.round())
+                    )
+                ),
                 # Update current milestone
                 pt.App.globalPut(current_milestone_key, milestone_index + pt.Int(1)),
                 pt.Approve()
@@ -191,17 +281,17 @@ class FairLensContract:
             milestone_index = pt.Btoi(pt.Txn.application_args[1])
             box_key = milestone_box_key(milestone_index)
             
-            # Read milestone data from box
-            amount_bytes = pt.Box.extract(box_key, pt.Int(0), pt.Int(8))
-            status_byte = pt.Box.extract(box_key, pt.Int(16), pt.Int(1))
-            amount = pt.Btoi(amount_bytes)
-            status = pt.Btoi(status_byte)
+            # Read the whole milestone record with one box_get
+            milestone = pt.App.box_get(box_key)
+            amount = pt.ExtractUint64(milestone.value(), pt.Int(AMOUNT_OFFSET))
+            status = pt.GetByte(milestone.value(), pt.Int(STATUS_OFFSET))
             
             return pt.Seq([
                 pt.Assert(pt.Txn.sender() == pt.App.globalGet(owner_key)),
                 pt.Assert(pt.App.globalGet(paused_key) == pt.Int(0)),  # Check not paused
-                pt.Assert(pt.Box.len(box_key) > pt.Int(0)),
-                pt.Assert(status == pt.Int(1)),  # Must be verified
+                milestone,
+                pt.Assert(milestone.hasValue()),
+                pt.Assert(status == pt.Int(int(MilestoneBoxStatus.VERIFIED))),  # Must be verified
                 # Create inner transaction to send payment
                 pt.InnerTxnBuilder.Begin(),
                 pt.InnerTxnBuilder.SetFields({
@@ -211,34 +301,85 @@ class FairLensContract:
                     pt.TxnField.fee: pt.Int(0),
                 }),
                 pt.InnerTxnBuilder.Submit(),
-                # Update milestone status to paid (status = 2)
-                pt.Box.replace(box_key, pt.Int(16), pt.Itob(pt.Int(2))),  # Status: 2 = paid
+                # Update milestone status to paid
+                pt.App.box_replace(box_key, pt.Int(STATUS_OFFSET), status_byte(MilestoneBoxStatus.PAID)),
+                pt.Approve()
+            ])
+        
+        # Release payment for every verified milestone in a range (called by owner)
+        # Args: [1] = first milestone_index, [2] = end milestone_index (exclusive)
+        # Pays each verified milestone with its own inner payment, all submitted
+        # as one inner group (itxn_next); pending and paid milestones are skipped.
+        # Inner fees are 0, so the outer transaction must pool 1 + paid fees.
+        def release_batch():
+            first = pt.Btoi(pt.Txn.application_args[1])
+            end = pt.Btoi(pt.Txn.application_args[2])
+            i = pt.ScratchVar(pt.TealType.uint64)
+            paid = pt.ScratchVar(pt.TealType.uint64)
+            box_key = pt.ScratchVar(pt.TealType.bytes)
+            milestone = pt.App.box_get(box_key.load())
+            
+            return pt.Seq([
+                pt.Assert(pt.Txn.sender() == pt.App.globalGet(owner_key)),
+                pt.Assert(pt.App.globalGet(paused_key) == pt.Int(0)),  # Check not paused
+                pt.Assert(first < end),
+                pt.Assert(end - first <= pt.Int(MAX_RELEASE_BATCH)),
+                paid.store(pt.Int(0)),
+                pt.For(
+                    i.store(first),
+                    i.load() < end,
+                    i.store(i.load() + pt.Int(1))
+                ).Do(pt.Seq([
+                    box_key.store(milestone_box_key(i.load())),
+                    milestone,
+                    pt.Assert(milestone.hasValue()),
+                    pt.If(
+                        pt.GetByte(milestone.value(), pt.Int(STATUS_OFFSET))
+                        == pt.Int(int(MilestoneBoxStatus.VERIFIED))
+                    ).Then(pt.Seq([
+                        # First payment opens the inner group, the rest join it
+                        pt.If(paid.load() == pt.Int(0))
+                        .Then(pt.InnerTxnBuilder.Begin())
+                        .Else(pt.InnerTxnBuilder.Next()),
+                        pt.InnerTxnBuilder.SetFields({
+                            pt.TxnField.type_enum: pt.TxnType.Payment,
+                            pt.TxnField.receiver: pt.App.globalGet(contractor_key),
+                            pt.TxnField.amount: pt.ExtractUint64(milestone.value(), pt.Int(AMOUNT_OFFSET)),
+                            pt.TxnField.fee: pt.Int(0),
+                        }),
+                        pt.App.box_replace(
+                            box_key.load(), pt.Int(STATUS_OFFSET), status_byte(MilestoneBoxStatus.PAID)
+                        ),
+                        paid.store(paid.load() + pt.Int(1)),
+                    ])),
+                ])),
+                pt.Assert(paid.load() > pt.Int(0)),  # Nothing to release otherwise
+                pt.InnerTxnBuilder.Submit(),
                 pt.Approve()
             ])
         
         # Main program logic
-        # Method routing: [0] = method_id
-        # 1 = add_milestone, 2 = verify_milestone, 3 = release_payment
-        # 4 = emergency_pause, 5 = resume_contract, 6 = update_verifier
+        # NoOp calls are routed on the ARC-4 selector in application_args[0]
+        # with one match; the table order follows methods.METHOD_SIGNATURES
+        def route(signature: str, body):
+            name = methods.METHODS[signature].name
+            return signature, pt.Subroutine(pt.TealType.none, name=name)(body)
+        
+        dispatch = MethodDispatch([
+            route(methods.ADD_MILESTONE, add_milestone),
+            route(methods.VERIFY_MILESTONE, verify_milestone),
+            route(methods.RELEASE_PAYMENT, release_payment),
+            route(methods.EMERGENCY_PAUSE, emergency_pause),
+            route(methods.RESUME_CONTRACT, resume_contract),
+            route(methods.UPDATE_VERIFIER, update_verifier),
+            route(methods.ADD_MILESTONES, add_milestones),
+            route(methods.RELEASE_BATCH, release_batch),
+            route(methods.OPUP, opup),
+        ])
+        
         program = pt.Cond(
             [pt.Txn.application_id() == pt.Int(0), on_creation],
-            [pt.Txn.on_completion() == pt.OnComplete.NoOp, pt.Seq([
-                pt.Assert(pt.Txn.application_args.length() > pt.Int(0)),
-                method_id := pt.Btoi(pt.Txn.application_args[0]),
-                pt.If(method_id == pt.Int(1))
-                .Then(add_milestone())
-                .ElseIf(method_id == pt.Int(2))
-                .Then(verify_milestone())
-                .ElseIf(method_id == pt.Int(3))
-                .Then(release_payment())
-                .ElseIf(method_id == pt.Int(4))
-                .Then(emergency_pause())
-                .ElseIf(method_id == pt.Int(5))
-                .Then(resume_contract())
-                .ElseIf(method_id == pt.Int(6))
-                .Then(update_verifier())
-                .Else(pt.Reject())
-            ])],
+            [pt.Txn.on_completion() == pt.OnComplete.NoOp, dispatch],
             [pt.Txn.on_completion() == pt.OnComplete.DeleteApplication, 
              pt.Seq([
                  # Only owner can delete, and only after deleting all boxes
@@ -250,7 +391,13 @@ class FairLensContract:
             [pt.Txn.on_completion() == pt.OnComplete.CloseOut, pt.Approve()],
         )
         
-        return pt.compileTeal(program, mode=pt.Mode.Application, version=10)
+        # Method bodies are entered by match, not callsub, so they must not use proto frames
+        return pt.compileTeal(
+            program,
+            mode=pt.Mode.Application,
+            version=10,
+            optimize=pt.OptimizeOptions(frame_pointers=False)
+        )
     
     def clear_program(self) -> str:
         """Clear state program"""
@@ -259,10 +406,11 @@ class FairLensContract:
 
 # Example usage
 if __name__ == "__main__":
+    # Addresses are compiled in with `addr`, so they must be valid Algorand addresses
     contract = FairLensContract(
-        owner_address="GOVERNMENT_ADDRESS",
-        contractor_address="CONTRACTOR_ADDRESS",
-        verifier_address="VERIFIER_ADDRESS",
+        owner_address="AEAQCAIBAEAQCAIBAEAQCAIBAEAQCAIBAEAQCAIBAEAQCAIBAEA5RCDXMI",
+        contractor_address="AIBAEAQCAIBAEAQCAIBAEAQCAIBAEAQCAIBAEAQCAIBAEAQCAIBMXPWWNQ",
+        verifier_address="AMBQGAYDAMBQGAYDAMBQGAYDAMBQGAYDAMBQGAYDAMBQGAYDAMB5DBBASI",
         total_amount=1000000000  # 1000 ALGO in microAlgos
     )
     
@@ -0,0 +1,91 @@
+"""
+FairLens global state schema shared by the contract and the backend
+
+algod returns global state as a list of {"key": base64, "value": {"type",
+"bytes", "uint"}} entries. decode_global_state turns that into a typed
+FairLensGlobalState so consumers never handle the raw encoding.
+"""
+
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List
+from algosdk.encoding import encode_address
+import base64
+
+OWNER_KEY = "owner"
+CONTRACTOR_KEY = "contractor"
+VERIFIER_KEY = "verifier"
+TOTAL_AMOUNT_KEY = "total_amt"
+MILESTONE_COUNT_KEY = "m_count"
+CURRENT_MILESTONE_KEY = "curr_m"
+PAUSED_KEY = "paused"
+VERIFIER_UPDATE_TIME_KEY = "verifier_update"
+VERIFIER_TIMELOCK_KEY = "verifier_timelock"
+
+# algod TealValue types
+_TYPE_BYTES = 1
+_TYPE_UINT = 2
+
+
+@dataclass(frozen=True)
+class FairLensGlobalState:
+    app_id: int
+    round: int
+    owner: str
+    contractor: str
+    verifier: str
+    total_amount: int  # microAlgos
+    milestone_count: int
+    current_milestone: int
+    paused: bool
+    verifier_update_time: int  # unix timestamp, 0 if never rotated
+    verifier_timelock: int  # seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _decode_address(value: bytes) -> str:
+    # Current contracts store 32-byte public keys; apps deployed before that
+    # stored the address string itself
+    if len(value) == 32:
+        return encode_address(value)
+    return value.decode("utf-8", errors="replace")
+
+
+def decode_global_state(app_id: int, round: int, raw: List[Dict[str, Any]]) -> FairLensGlobalState:
+    """
+    Decode algod's global-state list for a FairLens application
+
+    Args:
+        app_id: Application id the state belongs to
+        round: Round the state was read at
+        raw: The "global-state" list from algod application_info
+
+    Returns:
+        FairLensGlobalState; missing keys decode as zero/empty
+    """
+    values: Dict[str, Any] = {}
+    for entry in raw:
+        key = base64.b64decode(entry["key"]).decode("utf-8", errors="replace")
+        value = entry["value"]
+        if value["type"] == _TYPE_BYTES:
+            values[key] = base64.b64decode(value.get("bytes", ""))
+        else:
+            values[key] = value.get("uint", 0)
+
+    def address(key: str) -> str:
+        return _decode_address(values.get(key, b""))
+
+    return FairLensGlobalState(
+        app_id=app_id,
+        round=round,
+        owner=address(OWNER_KEY),
+        contractor=address(CONTRACTOR_KEY),
+        verifier=address(VERIFIER_KEY),
+        total_amount=values.get(TOTAL_AMOUNT_KEY, 0),
+        milestone_count=values.get(MILESTONE_COUNT_KEY, 0),
+        current_milestone=values.get(CURRENT_MILESTONE_KEY, 0),
+        paused=bool(values.get(PAUSED_KEY, 0)),
+        verifier_update_time=values.get(VERIFIER_UPDATE_TIME_KEY, 0),
+        verifier_timelock=values.get(VERIFIER_TIMELOCK_KEY, 0),
+    )
@@ -0,0 +1,67 @@
+"""
+ABI method table shared by the FairLens contract and the backend
+
+Every application call carries a 4-byte ARC-4 method selector in
+application_args[0] followed by one ARC-4 encoded value per argument. The
+contract routes on the selector with a single TEAL `match`, and
+ContractService encodes arguments from the same signatures, so the two sides
+cannot drift apart.
+
+Reference: https://arc.algorand.foundation/ARCs/arc-0004
+"""
+
+from algosdk import abi
+from typing import Any, Dict, List, Sequence
+
+ADD_MILESTONE = "add_milestone(uint64,uint64,uint64)void"
+VERIFY_MILESTONE = "verify_milestone(uint64,byte[64],byte[32])void"
+RELEASE_PAYMENT = "release_payment(uint64)void"
+EMERGENCY_PAUSE = "emergency_pause()void"
+RESUME_CONTRACT = "resume_contract()void"
+UPDATE_VERIFIER = "update_verifier(address)void"
+ADD_MILESTONES = "add_milestones((uint64,uint64,uint64)[])void"
+RELEASE_BATCH = "release_batch(uint64,uint64)void"
+OPUP = "opup()void"
+
+# Dispatch order of the approval program's match table
+METHOD_SIGNATURES: List[str] = [
+    ADD_MILESTONE,
+    VERIFY_MILESTONE,
+    RELEASE_PAYMENT,
+    EMERGENCY_PAUSE,
+    RESUME_CONTRACT,
+    UPDATE_VERIFIER,
+    ADD_MILESTONES,
+    RELEASE_BATCH,
+    OPUP,
+]
+
+METHODS: Dict[str, abi.Method] = {
+    signature: abi.Method.from_signature(signature) for signature in METHOD_SIGNATURES
+}
+
+
+def method_selector(signature: str) -> bytes:
+    """4-byte ARC-4 selector of a method signature"""
+    return METHODS[signature].get_selector()
+
+
+def encode_method_args(signature: str, args: Sequence[Any]) -> List[bytes]:
+    """
+    Encode a method call as application args
+
+    Args:
+        signature: One of METHOD_SIGNATURES
+        args: Python values for the method arguments, in order
+
+    Returns:
+        The selector followed by one ARC-4 encoded value per argument
+    """
+    method = METHODS[signature]
+    if len(args) != len(method.args):
+        raise ValueError(
+            f"{method.name} takes {len(method.args)} arguments, got {len(args)}"
+        )
+    return [method.get_selector()] + [
+        method_arg.type.encode(value) for method_arg, value in zip(method.args, args)
+    ]
@@ -0,0 +1,92 @@
+"""
+Milestone box layout shared by the FairLens contract and the backend
+
+Each milestone lives in its own box named "m_" + uint64 index, holding one
+fixed-width record:
+
+    offset  size  field
+    0       8     amount (uint64, microAlgos)
+    8       8     due_date (uint64, unix timestamp)
+    16      1     status (0 = pending, 1 = verified, 2 = paid)
+    17      32    proof_hash (SHA-256 of the proof document, zeros if none)
+    49      8     verified_round (uint64, 0 until verified)
+
+The size never changes after creation, so the box minimum balance is paid
+once and every field can be read from a single box_get. add_milestone(s) only
+rewrites a record while its status is pending, so a proof_hash and
+verified_round, once set, are never cleared.
+"""
+
+from dataclasses import dataclass
+import enum
+import struct
+
+MILESTONE_BOX_PREFIX = b"m_"
+
+AMOUNT_OFFSET = 0
+DUE_DATE_OFFSET = 8
+STATUS_OFFSET = 16
+PROOF_HASH_OFFSET = 17
+VERIFIED_ROUND_OFFSET = 49
+
+PROOF_HASH_SIZE = 32
+MILESTONE_BOX_SIZE = 57
+
+# Minimum balance the app account needs per milestone box (microAlgos)
+MILESTONE_BOX_MBR = 2500 + 400 * (len(MILESTONE_BOX_PREFIX) + 8 + MILESTONE_BOX_SIZE)
+
+_RECORD = struct.Struct(">QQB32sQ")
+assert _RECORD.size == MILESTONE_BOX_SIZE
+
+
+class MilestoneBoxStatus(enum.IntEnum):
+    PENDING = 0
+    VERIFIED = 1
+    PAID = 2
+
+
+def milestone_box_name(milestone_index: int) -> bytes:
+    """Box key used by the contract for a milestone: "m_" + uint64 index"""
+    return MILESTONE_BOX_PREFIX + milestone_index.to_bytes(8, "big")
+
+
+def milestone_index_from_box_name(name: bytes) -> int:
+    """Inverse of milestone_box_name"""
+    if len(name) != len(MILESTONE_BOX_PREFIX) + 8 or not name.startswith(MILESTONE_BOX_PREFIX):
+        raise ValueError(f"Not a milestone box name: {name!r}")
+    return int.from_bytes(name[len(MILESTONE_BOX_PREFIX):], "big")
+
+
+@dataclass(frozen=True)
+class MilestoneBox:
+    amount: int
+    due_date: int
+    status: MilestoneBoxStatus = MilestoneBoxStatus.PENDING
+    proof_hash: bytes = bytes(PROOF_HASH_SIZE)
+    verified_round: int = 0
+
+    def encode(self) -> bytes:
+        """Encode to the on-chain box contents"""
+        if len(self.proof_hash) != PROOF_HASH_SIZE:
+            raise ValueError(f"proof_hash must be {PROOF_HASH_SIZE} bytes")
+        return _RECORD.pack(
+            self.amount, self.due_date, int(self.status), self.proof_hash, self.verified_round
+        )
+
+    @classmethod
+    def decode(cls, data: bytes) -> "MilestoneBox":
+        """Decode on-chain box contents"""
+        if len(data) != MILESTONE_BOX_SIZE:
+            raise ValueError(f"Milestone box must be {MILESTONE_BOX_SIZE} bytes, got {len(data)}")
+        amount, due_date, status, proof_hash, verified_round = _RECORD.unpack(data)
+        return cls(
+            amount=amount,
+            due_date=due_date,
+            status=MilestoneBoxStatus(status),
+            proof_hash=proof_hash,
+            verified_round=verified_round
+        )
+
+    @property
+    def has_proof(self) -> bool:
+        return self.proof_hash != bytes(PROOF_HASH_SIZE)
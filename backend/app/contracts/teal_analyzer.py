@@ -0,0 +1,565 @@
+"""
+Offline TEAL cost and size analyzer
+
+Parses the TEAL text produced by PyTeal and reports, without an algod node:
+
+- worst-case opcode cost of each method routed by a `match` (dispatch prefix
+  included), against the 700-per-app-call budget
+- box operations per method, as an upper bound in bytes (every box touch is
+  counted as a full fixed-size record)
+- inner transactions issued per method
+- estimated bytecode size, laying out int/byte constants the way the goal
+  assembler does (repeated constants in intcblock/bytecblock, single-use
+  ones pushed inline)
+
+Loops are bounded per method by the caller; a loop without a bound is an
+error rather than a silently optimistic number.
+
+Opcode costs: https://dev.algorand.co/reference/algorand-teal/opcodes/
+"""
+
+from dataclasses import dataclass, asdict, field
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+import base64
+import math
+from algosdk import abi, encoding
+from app.contracts import methods
+from app.contracts.fairlens_contract import (
+    FairLensContract,
+    MAX_RELEASE_BATCH,
+    VERIFY_MILESTONE_APP_CALLS,
+)
+from app.contracts.milestone_box import MILESTONE_BOX_SIZE
+
+# Opcode budget of a single application call; pooled across a group
+APP_CALL_BUDGET = 700
+# Approval + clear program bytes allowed without extra pages
+MAX_PROGRAM_SIZE = 2048
+
+# FairLens methods allowed to pool budget from extra app calls in their group;
+# every other method must fit in a single call. Ed25519Verify alone costs 1900.
+FAIRLENS_APP_CALL_LIMITS = {"verify_milestone": VERIFY_MILESTONE_APP_CALLS}
+
+# Opcodes whose cost is not 1 (AVM v10)
+OPCODE_COSTS: Dict[str, int] = {
+    "sha256": 35,
+    "keccak256": 130,
+    "sha512_256": 45,
+    "sha3_256": 130,
+    "ed25519verify": 1900,
+    "ed25519verify_bare": 1900,
+    "ecdsa_verify": 1700,
+    "ecdsa_pk_decompress": 650,
+    "ecdsa_pk_recover": 2000,
+    "vrf_verify": 5700,
+    "divmodw": 20,
+    "sqrt": 4,
+    "expw": 10,
+    "bsqrt": 40,
+    "b+": 10,
+    "b-": 10,
+    "b*": 20,
+    "b/": 20,
+    "b%": 20,
+    "b|": 6,
+    "b&": 6,
+    "b^": 6,
+    "b~": 4,
+}
+
+BOX_READ_OPS = {"box_get", "box_extract"}
+BOX_WRITE_OPS = {"box_put", "box_replace", "box_splice", "box_create", "box_resize"}
+INNER_TXN_OPS = {"itxn_begin", "itxn_next"}
+
+# Named integer constants accepted by `int`
+NAMED_INTS = {
+    "NoOp": 0, "OptIn": 1, "CloseOut": 2, "ClearState": 3, "UpdateApplication": 4, "DeleteApplication": 5,
+    "unknown": 0, "pay": 1, "keyreg": 2, "acfg": 3, "axfer": 4, "afrz": 5, "appl": 6,
+}
+
+BRANCH_OPS = {"b", "bz", "bnz"}
+MULTI_BRANCH_OPS = {"match", "switch"}
+TERMINAL_OPS = {"return", "err", "retsub"}
+
+
+@dataclass(frozen=True)
+class Instruction:
+    line: int
+    opcode: str
+    immediates: Tuple[str, ...]
+
+
+@dataclass
+class MethodReport:
+    name: str
+    label: str
+    opcode_cost: int
+    box_reads: int
+    box_writes: int
+    box_bytes_read: int
+    box_bytes_written: int
+    inner_txns: int
+
+    @property
+    def app_calls_needed(self) -> int:
+        """App calls whose pooled budget covers this method"""
+        return max(1, math.ceil(self.opcode_cost / APP_CALL_BUDGET))
+
+
+@dataclass
+class ProgramReport:
+    bytecode_size: int
+    dispatch_cost: int
+    methods: Dict[str, MethodReport] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict:
+        return {
+            "bytecode_size": self.bytecode_size,
+            "dispatch_cost": self.dispatch_cost,
+            "methods": {
+                name: {**asdict(report), "app_calls_needed": report.app_calls_needed}
+                for name, report in self.methods.items()
+            },
+        }
+
+
+class TealAnalysisError(ValueError):
+    """Raised when a program cannot be analyzed (unknown label, unbounded loop, ...)"""
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+
+def _tokenize(line: str) -> List[str]:
+    """Split a TEAL line into tokens, keeping quoted strings whole and dropping comments"""
+    tokens: List[str] = []
+    current = ""
+    i = 0
+    while i < len(line):
+        char = line[i]
+        if char == '"':
+            end = i + 1
+            while end < len(line) and line[end] != '"':
+                end += 2 if line[end] == "\\" else 1
+            current += line[i:end + 1]
+            i = end + 1
+            continue
+        if line.startswith("//", i):
+            break
+        if char.isspace():
+            if current:
+                tokens.append(current)
+                current = ""
+        else:
+            current += char
+        i += 1
+    if current:
+        tokens.append(current)
+    return tokens
+
+
+def parse_teal(source: str) -> Tuple[List[Instruction], Dict[str, int]]:
+    """
+    Parse TEAL source
+
+    Returns:
+        (instructions, label -> index of the instruction following the label)
+    """
+    instructions: List[Instruction] = []
+    labels: Dict[str, int] = {}
+    for line_number, line in enumerate(source.splitlines(), start=1):
+        tokens = _tokenize(line)
+        if not tokens or tokens[0].startswith("#"):
+            continue
+        if len(tokens) == 1 and tokens[0].endswith(":"):
+            labels[tokens[0][:-1]] = len(instructions)
+            continue
+        instructions.append(Instruction(line_number, tokens[0], tuple(tokens[1:])))
+    return instructions, labels
+
+
+# ---------------------------------------------------------------------------
+# Bytecode size
+# ---------------------------------------------------------------------------
+
+def _varuint_size(value: int) -> int:
+    return max(1, math.ceil(value.bit_length() / 7))
+
+
+def _byte_constant(instruction: Instruction) -> bytes:
+    """Value of a byte/addr/method pseudo-op"""
+    if instruction.opcode == "addr":
+        return encoding.decode_address(instruction.immediates[0])
+    if instruction.opcode == "method":
+        return abi.Method.from_signature(instruction.immediates[0].strip('"')).get_selector()
+    literal = instruction.immediates
+    if literal[0].startswith('"'):
+        return literal[0][1:-1].encode().decode("unicode_escape").encode("latin-1")
+    if literal[0].startswith("0x"):
+        return bytes.fromhex(literal[0][2:])
+    if literal[0] in ("base64", "b64"):
+        return base64.b64decode(literal[1])
+    if literal[0] in ("base32", "b32"):
+        return base64.b32decode(literal[1] + "=" * (-len(literal[1]) % 8))
+    raise TealAnalysisError(f"Unsupported byte constant on line {instruction.line}")
+
+
+def _int_constant(instruction: Instruction) -> int:
+    token = instruction.immediates[0]
+    if token in NAMED_INTS:
+        return NAMED_INTS[token]
+    try:
+        return int(token, 0)
+    except ValueError:
+        raise TealAnalysisError(f"Unsupported int constant {token} on line {instruction.line}")
+
+
+def _immediate_size(instruction: Instruction) -> int:
+    opcode, immediates = instruction.opcode, instruction.immediates
+    if opcode in BRANCH_OPS or opcode == "callsub":
+        return 2
+    if opcode in MULTI_BRANCH_OPS:
+        return 1 + 2 * len(immediates)
+    if opcode == "pushint":
+        return _varuint_size(int(immediates[0], 0))
+    if opcode == "pushbytes":
+        value = _byte_constant(Instruction(instruction.line, "byte", immediates))
+        return _varuint_size(len(value)) + len(value)
+    if opcode == "pushbytess":
+        values = [bytes.fromhex(token[2:]) for token in immediates]
+        return _varuint_size(len(values)) + sum(_varuint_size(len(v)) + len(v) for v in values)
+    if opcode == "pushints":
+        return _varuint_size(len(immediates)) + sum(_varuint_size(int(t, 0)) for t in immediates)
+    # Field names and small integers are one byte each
+    return len(immediates)
+
+
+def estimate_bytecode_size(instructions: Sequence[Instruction]) -> int:
+    """Estimate assembled program size in bytes, including constant blocks"""
+    size = 1  # version byte
+    int_uses: Dict[int, int] = {}
+    byte_uses: Dict[bytes, int] = {}
+
+    for instruction in instructions:
+        if instruction.opcode == "int":
+            value = _int_constant(instruction)
+            int_uses[value] = int_uses.get(value, 0) + 1
+        elif instruction.opcode in ("byte", "addr", "method"):
+            value = _byte_constant(instruction)
+            byte_uses[value] = byte_uses.get(value, 0) + 1
+        else:
+            size += 1 + _immediate_size(instruction)
+
+    def layout(uses: Dict, value_size: Callable[[object], int]) -> int:
+        pooled = sorted((v for v, n in uses.items() if n > 1), key=lambda v: -uses[v])
+        total = 0
+        if pooled:
+            total += 1 + _varuint_size(len(pooled)) + sum(value_size(v) for v in pooled)
+        for index, value in enumerate(pooled):
+            # intc_0..intc_3 / bytec_0..bytec_3 have no immediate
+            total += uses[value] * (1 if index < 4 else 2)
+        for value, count in uses.items():
+            if count == 1:
+                total += 1 + value_size(value)
+        return total
+
+    size += layout(int_uses, _varuint_size)
+    size += layout(byte_uses, lambda value: _varuint_size(len(value)) + len(value))
+    return size
+
+
+# ---------------------------------------------------------------------------
+# Control flow
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _Block:
+    start: int
+    end: int  # exclusive
+    successors: List[int]
+    terminal: bool
+
+
+class _ControlFlowGraph:
+    def __init__(self, instructions: List[Instruction], labels: Dict[str, int]):
+        self.instructions = instructions
+        self.labels = labels
+
+        leaders = {0, *labels.values()}
+        for index, instruction in enumerate(instructions):
+            if instruction.opcode in BRANCH_OPS | MULTI_BRANCH_OPS | TERMINAL_OPS:
+                leaders.add(index + 1)
+        starts = sorted(leader for leader in leaders if leader < len(instructions))
+
+        self.block_at: Dict[int, int] = {start: i for i, start in enumerate(starts)}
+        self.blocks: List[_Block] = []
+        for i, start in enumerate(starts):
+            end = starts[i + 1] if i + 1 < len(starts) else len(instructions)
+            self.blocks.append(self._make_block(start, end))
+
+    def label_block(self, label: str) -> int:
+        if label not in self.labels:
+            raise TealAnalysisError(f"Unknown label {label}")
+        return self.block_at[self.labels[label]]
+
+    def _make_block(self, start: int, end: int) -> _Block:
+        last = self.instructions[end - 1]
+        fallthrough = [self.block_at[end]] if end in self.block_at else []
+        if last.opcode in TERMINAL_OPS:
+            return _Block(start, end, [], True)
+        if last.opcode == "b":
+            return _Block(start, end, [self.label_block(last.immediates[0])], False)
+        if last.opcode in ("bz", "bnz"):
+            return _Block(start, end, [self.label_block(last.immediates[0])] + fallthrough, False)
+        if last.opcode in MULTI_BRANCH_OPS:
+            targets = [self.label_block(label) for label in last.immediates]
+            return _Block(start, end, targets + fallthrough, False)
+        # Falling off the end of the program ends it
+        return _Block(start, end, fallthrough, not fallthrough)
+
+    def reachable(self, start: int) -> Set[int]:
+        seen = {start}
+        stack = [start]
+        while stack:
+            for successor in self.blocks[stack.pop()].successors:
+                if successor not in seen:
+                    seen.add(successor)
+                    stack.append(successor)
+        return seen
+
+    def back_edges(self, start: int) -> Set[Tuple[int, int]]:
+        edges: Set[Tuple[int, int]] = set()
+        state: Dict[int, int] = {}  # 1 = on stack, 2 = done
+        stack = [(start, iter(self.blocks[start].successors))]
+        state[start] = 1
+        while stack:
+            node, successors = stack[-1]
+            for successor in successors:
+                if state.get(successor) == 1:
+                    edges.add((node, successor))
+                elif successor not in state:
+                    state[successor] = 1
+                    stack.append((successor, iter(self.blocks[successor].successors)))
+                    break
+            else:
+                state[node] = 2
+                stack.pop()
+        return edges
+
+
+class _Analyzer:
+    def __init__(self, source: str, box_size: int):
+        self.instructions, labels = parse_teal(source)
+        self.graph = _ControlFlowGraph(self.instructions, labels)
+        self.box_size = box_size
+        self._subroutine_cache: Dict[Tuple[str, str], int] = {}
+        self._in_progress: Set[str] = set()
+
+    def op_metric(self, metric: str, instruction: Instruction, loop_bound: Optional[int]) -> int:
+        opcode = instruction.opcode
+        if opcode == "callsub":
+            return self.worst_from(metric, self.graph.label_block(instruction.immediates[0]), loop_bound)
+        if metric == "cost":
+            return OPCODE_COSTS.get(opcode, 1)
+        if metric == "box_reads":
+            return int(opcode in BOX_READ_OPS)
+        if metric == "box_writes":
+            return int(opcode in BOX_WRITE_OPS)
+        if metric == "inner_txns":
+            return int(opcode in INNER_TXN_OPS)
+        raise ValueError(f"Unknown metric {metric}")
+
+    def block_weight(self, metric: str, block: _Block, loop_bound: Optional[int], stop: Optional[int] = None) -> int:
+        end = block.end if stop is None else stop + 1
+        return sum(
+            self.op_metric(metric, self.instructions[i], loop_bound) for i in range(block.start, end)
+        )
+
+    def _weights(self, metric: str, start: int, loop_bound: Optional[int]):
+        """Block weights with loop bodies folded into their headers, plus the DAG edges"""
+        graph = self.graph
+        nodes = graph.reachable(start)
+        back_edges = graph.back_edges(start)
+        weights = {node: self.block_weight(metric, graph.blocks[node], loop_bound) for node in nodes}
+        dag = {
+            node: [s for s in graph.blocks[node].successors if (node, s) not in back_edges]
+            for node in nodes
+        }
+        if back_edges and loop_bound is None:
+            raise TealAnalysisError(
+                f"Loop at line {self.instructions[graph.blocks[min(h for _, h in back_edges)].start].line} "
+                "needs an iteration bound"
+            )
+
+        predecessors: Dict[int, List[int]] = {node: [] for node in nodes}
+        for node in nodes:
+            for successor in dag[node]:
+                predecessors[successor].append(node)
+
+        loops = []
+        for tail, header in back_edges:
+            body = {header, tail}
+            stack = [tail]
+            while stack:
+                for predecessor in predecessors[stack.pop()]:
+                    if predecessor not in body:
+                        body.add(predecessor)
+                        stack.append(predecessor)
+            loops.append((len(body), header, tail, body))
+
+        # Inner loops first so their folded weight is repeated by the outer loop
+        for _, header, tail, body in sorted(loops, key=lambda loop: loop[0]):
+            one_pass = self._longest(header, weights, {n: [s for s in dag[n] if s in body] for n in body}, target=tail)
+            weights[header] += loop_bound * one_pass
+
+        return weights, dag
+
+    @staticmethod
+    def _longest(start: int, weights: Dict[int, int], dag: Dict[int, List[int]], target: Optional[int] = None,
+                 terminals: Optional[Set[int]] = None) -> int:
+        best: Dict[int, float] = {}
+
+        def visit(node: int) -> float:
+            if node in best:
+                return best[node]
+            if node == target:
+                best[node] = weights[node]
+                return best[node]
+            tails = [visit(successor) for successor in dag[node]]
+            if tails:
+                value = weights[node] + max(tails)
+            elif target is None and (terminals is None or node in terminals):
+                value = weights[node]
+            else:
+                value = -math.inf
+            best[node] = value
+            return value
+
+        value = visit(start)
+        if value == -math.inf:
+            raise TealAnalysisError("No path to the end of the program")
+        return int(value)
+
+    def worst_from(self, metric: str, start: int, loop_bound: Optional[int]) -> int:
+        weights, dag = self._weights(metric, start, loop_bound)
+        terminals = {node for node in dag if self.graph.blocks[node].terminal}
+        return self._longest(start, weights, dag, terminals=terminals)
+
+    def worst_to(self, metric: str, index: int) -> int:
+        """Worst-case metric from program start up to and including instruction `index`"""
+        graph = self.graph
+        target = max(i for i, block in enumerate(graph.blocks) if block.start <= index)
+        # Paths into a method never pass through its loops, so they count for nothing here
+        weights, dag = self._weights(metric, 0, 0)
+        weights[target] = self.block_weight(metric, graph.blocks[target], None, stop=index)
+        return self._longest(0, weights, dag, target=target)
+
+
+def analyze_teal(
+    source: str,
+    method_names: Optional[Sequence[str]] = None,
+    loop_bounds: Optional[Dict[str, int]] = None,
+    box_size: int = MILESTONE_BOX_SIZE
+) -> ProgramReport:
+    """
+    Analyze an approval program routed by a single `match`
+
+    Args:
+        source: TEAL source
+        method_names: Names for the match targets, in order (defaults to the labels)
+        loop_bounds: Max iterations of any loop inside a method, by method name
+        box_size: Size of every box the program touches, for byte upper bounds
+
+    Returns:
+        ProgramReport with bytecode size, dispatch cost and per-method worst cases
+    """
+    analyzer = _Analyzer(source, box_size)
+    loop_bounds = loop_bounds or {}
+    match_index = next(
+        (i for i, instruction in enumerate(analyzer.instructions) if instruction.opcode == "match"),
+        None
+    )
+    report = ProgramReport(
+        bytecode_size=estimate_bytecode_size(analyzer.instructions),
+        dispatch_cost=0
+    )
+    if match_index is None:
+        return report
+
+    labels = analyzer.instructions[match_index].immediates
+    names = list(method_names) if method_names is not None else list(labels)
+    if len(names) != len(labels):
+        raise TealAnalysisError(f"Expected {len(labels)} method names, got {len(names)}")
+
+    prefix = {metric: analyzer.worst_to(metric, match_index)
+              for metric in ("cost", "box_reads", "box_writes", "inner_txns")}
+    report.dispatch_cost = prefix["cost"]
+
+    for name, label in zip(names, labels):
+        start = analyzer.graph.label_block(label)
+        bound = loop_bounds.get(name)
+        worst = {metric: prefix[metric] + analyzer.worst_from(metric, start, bound) for metric in prefix}
+        report.methods[name] = MethodReport(
+            name=name,
+            label=label,
+            opcode_cost=worst["cost"],
+            box_reads=worst["box_reads"],
+            box_writes=worst["box_writes"],
+            box_bytes_read=worst["box_reads"] * box_size,
+            box_bytes_written=worst["box_writes"] * box_size,
+            inner_txns=worst["inner_txns"],
+        )
+    return report
+
+
+def analyze_fairlens_contract(contract: FairLensContract, loop_bounds: Optional[Dict[str, int]] = None) -> ProgramReport:
+    """
+    Analyze a FairLensContract's approval program, naming methods by ABI name
+
+    add_milestones and release_batch loop once per milestone; by default they
+    are bounded by how ContractService chunks add_milestones (one call's box
+    references) and by the batch size release_batch enforces.
+    """
+    from app.services.contract_service import MAX_BOX_REFERENCES
+
+    bounds = {
+        methods.METHODS[methods.ADD_MILESTONES].name: MAX_BOX_REFERENCES,
+        methods.METHODS[methods.RELEASE_BATCH].name: MAX_RELEASE_BATCH,
+    }
+    bounds.update(loop_bounds or {})
+    return analyze_teal(
+        contract.approval_program(),
+        method_names=[methods.METHODS[signature].name for signature in methods.METHOD_SIGNATURES],
+        loop_bounds=bounds,
+    )
+
+
+def budget_violations(
+    report: ProgramReport,
+    app_call_limits: Optional[Dict[str, int]] = None,
+    max_size: int = MAX_PROGRAM_SIZE
+) -> List[str]:
+    """
+    Check a report against the opcode budget and program size limit
+
+    Args:
+        report: Output of analyze_teal
+        app_call_limits: App calls each method may pool budget from (default 1)
+        max_size: Largest allowed bytecode size
+
+    Returns:
+        Human-readable violations, empty when everything fits
+    """
+    app_call_limits = app_call_limits or {}
+    violations = []
+    if report.bytecode_size > max_size:
+        violations.append(f"program is {report.bytecode_size} bytes, limit is {max_size}")
+    for name, method in report.methods.items():
+        allowed = app_call_limits.get(name, 1)
+        if method.app_calls_needed > allowed:
+            violations.append(
+                f"{name} costs {method.opcode_cost}, more than {allowed} app call(s) "
+                f"({allowed * APP_CALL_BUDGET}) can pay for"
+            )
+    return violations
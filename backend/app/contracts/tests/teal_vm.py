@@ -0,0 +1,143 @@
+"""
+Minimal TEAL interpreter for running FairLens methods offline
+
+Covers the opcodes of the creation path and the add_milestone(s) methods:
+enough to check what those calls do to global state and milestone boxes
+without an algod node. Any other opcode raises NotImplementedError, so a test
+that strays outside that subset fails loudly instead of passing vacuously.
+A rejected call leaves state untouched, as on chain.
+"""
+
+from typing import Callable, Dict, List, Sequence, Union
+import copy
+from algosdk.encoding import decode_address
+from app.contracts.teal_analyzer import Instruction, _byte_constant, _int_constant, parse_teal
+
+Value = Union[int, bytes]
+
+
+class Rejected(Exception):
+    """The program failed (err, a failed assert, or return 0)"""
+
+
+def _binary(operation: Callable[[int, int], int]):
+    def run(vm: "TealVM") -> None:
+        right, left = vm.stack.pop(), vm.stack.pop()
+        vm.stack.append(int(operation(left, right)))
+    return run
+
+
+_ARITHMETIC = {
+    "+": _binary(lambda a, b: a + b),
+    "*": _binary(lambda a, b: a * b),
+    "<": _binary(lambda a, b: a < b),
+    ">": _binary(lambda a, b: a > b),
+    ">=": _binary(lambda a, b: a >= b),
+    "<=": _binary(lambda a, b: a <= b),
+}
+
+
+class TealVM:
+    def __init__(self, approval_source: str, app_id: int = 1):
+        self.instructions, self.labels = parse_teal(approval_source)
+        self.app_id = app_id
+        self.global_state: Dict[bytes, Value] = {}
+        self.boxes: Dict[bytes, bytes] = {}
+
+    def create(self, sender: str) -> None:
+        self._run(sender, [], application_id=0)
+
+    def call(self, sender: str, app_args: Sequence[bytes]) -> None:
+        """Run a NoOp call; raises Rejected (with state unchanged) if the program fails"""
+        self._run(sender, list(app_args), application_id=self.app_id)
+
+    def _run(self, sender: str, app_args: List[bytes], application_id: int) -> None:
+        saved = copy.deepcopy((self.global_state, self.boxes))
+        self.txn = {"Sender": decode_address(sender), "ApplicationID": application_id, "OnCompletion": 0}
+        self.app_args = app_args
+        self.stack: List[Value] = []
+        self.scratch: Dict[int, Value] = {}
+        self.pc = 0
+        try:
+            while True:
+                instruction = self.instructions[self.pc]
+                self.pc += 1
+                if instruction.opcode == "return":
+                    if not self.stack.pop():
+                        raise Rejected("return 0")
+                    return
+                self._step(instruction)
+        except Rejected:
+            self.global_state, self.boxes = saved
+            raise
+
+    def _step(self, instruction: Instruction) -> None:
+        opcode, immediates, stack = instruction.opcode, instruction.immediates, self.stack
+        if opcode in _ARITHMETIC:
+            _ARITHMETIC[opcode](self)
+        elif opcode in ("int", "pushint"):
+            stack.append(_int_constant(instruction))
+        elif opcode in ("byte", "pushbytes", "addr"):
+            stack.append(_byte_constant(instruction))
+        elif opcode == "pushbytess":
+            stack.extend(bytes.fromhex(token[2:]) for token in immediates)
+        elif opcode == "txn":
+            stack.append(self.txn[immediates[0]])
+        elif opcode == "txna" and immediates[0] == "ApplicationArgs":
+            stack.append(self.app_args[int(immediates[1])])
+        elif opcode == "match":
+            value = stack.pop()
+            candidates = [stack.pop() for _ in immediates][::-1]
+            if value in candidates:
+                self.pc = self.labels[immediates[candidates.index(value)]]
+        elif opcode in ("b", "bz", "bnz"):
+            taken = opcode == "b" or bool(stack.pop()) == (opcode == "bnz")
+            if taken:
+                self.pc = self.labels[immediates[0]]
+        elif opcode == "err":
+            raise Rejected(f"err on line {instruction.line}")
+        elif opcode == "assert":
+            if not stack.pop():
+                raise Rejected(f"assert failed on line {instruction.line}")
+        elif opcode == "==":
+            stack.append(int(stack.pop() == stack.pop()))
+        elif opcode == "store":
+            self.scratch[int(immediates[0])] = stack.pop()
+        elif opcode == "load":
+            stack.append(self.scratch.get(int(immediates[0]), 0))
+        elif opcode == "app_global_get":
+            stack.append(self.global_state.get(stack.pop(), 0))
+        elif opcode == "app_global_put":
+            value, key = stack.pop(), stack.pop()
+            self.global_state[key] = value
+        elif opcode == "btoi":
+            stack.append(int.from_bytes(stack.pop(), "big"))
+        elif opcode == "itob":
+            stack.append(stack.pop().to_bytes(8, "big"))
+        elif opcode == "concat":
+            right, left = stack.pop(), stack.pop()
+            stack.append(left + right)
+        elif opcode == "len":
+            stack.append(len(stack.pop()))
+        elif opcode == "bzero":
+            stack.append(bytes(stack.pop()))
+        elif opcode in ("extract_uint16", "extract_uint64"):
+            size = 2 if opcode == "extract_uint16" else 8
+            offset, data = stack.pop(), stack.pop()
+            if offset + size > len(data):
+                raise Rejected(f"{opcode} out of range on line {instruction.line}")
+            stack.append(int.from_bytes(data[offset:offset + size], "big"))
+        elif opcode == "box_len":
+            name = stack.pop()
+            exists = name in self.boxes
+            stack.extend([len(self.boxes[name]) if exists else 0, int(exists)])
+        elif opcode == "box_extract":
+            length, start, name = stack.pop(), stack.pop(), stack.pop()
+            stack.append(self.boxes[name][start:start + length])
+        elif opcode == "box_put":
+            value, name = stack.pop(), stack.pop()
+            if name in self.boxes and len(self.boxes[name]) != len(value):
+                raise Rejected(f"box_put size mismatch on line {instruction.line}")
+            self.boxes[name] = value
+        else:
+            raise NotImplementedError(f"{opcode} (line {instruction.line}) is not supported by TealVM")
@@ -0,0 +1,108 @@
+"""
+ARC-4 method selectors, the approval program's dispatch table and argument
+encoding, including the packed add_milestones records
+
+Run from backend/: python -m pytest app/contracts/tests
+"""
+
+import pytest
+import pyteal as pt
+from algosdk.encoding import decode_address, encode_address
+from app.contracts import methods
+from app.contracts.dispatch import MethodDispatch
+from app.contracts.fairlens_contract import ABI_ARRAY_LENGTH_SIZE, MILESTONE_RECORD_SIZE, FairLensContract
+
+# First 4 bytes of SHA-512/256 of each signature
+KNOWN_SELECTORS = {
+    "add(uint64,uint64)uint128": "8aa3b61f",  # worked example in ARC-4
+    methods.ADD_MILESTONE: "e07d8615",
+    methods.VERIFY_MILESTONE: "6593f161",
+    methods.RELEASE_PAYMENT: "3c3070cc",
+    methods.EMERGENCY_PAUSE: "3ef0fd80",
+    methods.RESUME_CONTRACT: "09df2c94",
+    methods.UPDATE_VERIFIER: "382b2a7a",
+    methods.ADD_MILESTONES: "21755b66",
+    methods.RELEASE_BATCH: "3459e55d",
+    methods.OPUP: "4c6bea72",
+}
+
+ADDRESSES = [encode_address(bytes([i]) * 32) for i in (1, 2, 3)]
+
+
+@pytest.fixture(scope="module")
+def approval_lines():
+    teal = FairLensContract(*ADDRESSES, total_amount=1_000_000).approval_program()
+    return [line.strip() for line in teal.splitlines()]
+
+
+def test_selectors_match_known_values():
+    for signature, selector in KNOWN_SELECTORS.items():
+        if signature in methods.METHODS:
+            assert methods.method_selector(signature).hex() == selector
+    # Every method the contract serves has a pinned selector
+    assert set(methods.METHOD_SIGNATURES) <= KNOWN_SELECTORS.keys()
+
+
+def test_dispatch_table_covers_every_method_in_order(approval_lines):
+    pushed = next(line for line in approval_lines if line.startswith("pushbytess "))
+    matched = next(line for line in approval_lines if line.startswith("match "))
+    selectors = pushed.split()[1:]
+    labels = matched.split()[1:]
+
+    assert selectors == [f"0x{KNOWN_SELECTORS[signature]}" for signature in methods.METHOD_SIGNATURES]
+    assert len(labels) == len(selectors)
+    for signature, label in zip(methods.METHOD_SIGNATURES, labels):
+        assert label.rsplit("_", 1)[0] == methods.METHODS[signature].name.replace("_", "")
+        assert f"{label}:" in approval_lines
+    # Unknown selectors fall through the match into err
+    assert approval_lines[approval_lines.index(matched) + 1] == "err"
+
+
+def test_dispatch_needs_argument_free_routes():
+    with pytest.raises(ValueError):
+        MethodDispatch([])
+    takes_argument = pt.Subroutine(pt.TealType.none)(lambda value: pt.Pop(value))
+    with pytest.raises(ValueError):
+        MethodDispatch([(methods.RELEASE_PAYMENT, takes_argument)])
+
+
+def test_encode_method_args():
+    args = methods.encode_method_args(methods.ADD_MILESTONE, [3, 1_500_000, 1_900_000_000])
+    assert args == [
+        bytes.fromhex(KNOWN_SELECTORS[methods.ADD_MILESTONE]),
+        (3).to_bytes(8, "big"),
+        (1_500_000).to_bytes(8, "big"),
+        (1_900_000_000).to_bytes(8, "big"),
+    ]
+
+    signature, proof = bytes(range(64)), b"\x01" * 32
+    args = methods.encode_method_args(methods.VERIFY_MILESTONE, [7, signature, proof])
+    assert args[1:] == [(7).to_bytes(8, "big"), signature, proof]
+
+    args = methods.encode_method_args(methods.UPDATE_VERIFIER, [ADDRESSES[0]])
+    assert args[1] == decode_address(ADDRESSES[0])
+
+    assert methods.encode_method_args(methods.OPUP, []) == [bytes.fromhex(KNOWN_SELECTORS[methods.OPUP])]
+    with pytest.raises(ValueError, match="takes 1 arguments, got 2"):
+        methods.encode_method_args(methods.RELEASE_PAYMENT, [1, 2])
+
+
+def test_packed_milestones_decode_back_to_the_inputs():
+    milestones = [(0, 1_500_000, 1_900_000_000), (1, 2 ** 64 - 1, 0), (9, 1, 2)]
+    selector, packed = methods.encode_method_args(methods.ADD_MILESTONES, [milestones])
+    assert selector == bytes.fromhex(KNOWN_SELECTORS[methods.ADD_MILESTONES])
+
+    # Read the way the contract does: uint16 count, then fixed-size records
+    count = int.from_bytes(packed[:ABI_ARRAY_LENGTH_SIZE], "big")
+    assert count == len(milestones)
+    assert len(packed) == ABI_ARRAY_LENGTH_SIZE + count * MILESTONE_RECORD_SIZE
+    decoded = []
+    for i in range(count):
+        offset = ABI_ARRAY_LENGTH_SIZE + i * MILESTONE_RECORD_SIZE
+        decoded.append(tuple(
+            int.from_bytes(packed[offset + field:offset + field + 8], "big") for field in (0, 8, 16)
+        ))
+    assert decoded == milestones
+
+    method_arg = methods.METHODS[methods.ADD_MILESTONES].args[0]
+    assert [tuple(record) for record in method_arg.type.decode(packed)] == milestones
@@ -0,0 +1,69 @@
+"""
+Milestone box record layout, names and minimum balance
+
+Run from backend/: python -m pytest app/contracts/tests
+"""
+
+import pytest
+from app.contracts.milestone_box import (
+    MILESTONE_BOX_MBR,
+    MILESTONE_BOX_SIZE,
+    MilestoneBox,
+    MilestoneBoxStatus,
+    milestone_box_name,
+    milestone_index_from_box_name,
+)
+
+UINT64_MAX = 2 ** 64 - 1
+
+
+def test_round_trips_the_57_byte_record():
+    box = MilestoneBox(
+        amount=1_500_000,
+        due_date=1_900_000_000,
+        status=MilestoneBoxStatus.VERIFIED,
+        proof_hash=bytes(range(32)),
+        verified_round=42,
+    )
+    data = box.encode()
+    assert len(data) == MILESTONE_BOX_SIZE == 57
+    assert MilestoneBox.decode(data) == box
+    assert box.has_proof and not MilestoneBox(1, 1).has_proof
+
+
+def test_fields_sit_at_their_documented_offsets():
+    data = MilestoneBox(
+        amount=UINT64_MAX,
+        due_date=0,
+        status=MilestoneBoxStatus.PAID,
+        proof_hash=b"\xaa" * 32,
+        verified_round=UINT64_MAX,
+    ).encode()
+    assert data[0:8] == b"\xff" * 8
+    assert data[8:16] == bytes(8)
+    assert data[16] == 2
+    assert data[17:49] == b"\xaa" * 32
+    assert data[49:57] == b"\xff" * 8
+    assert MilestoneBox.decode(data).amount == UINT64_MAX
+
+
+def test_rejects_malformed_records():
+    with pytest.raises(ValueError):
+        MilestoneBox.decode(bytes(MILESTONE_BOX_SIZE - 1))
+    with pytest.raises(ValueError):
+        MilestoneBox(1, 1, proof_hash=bytes(31)).encode()
+    unknown_status = bytearray(MilestoneBox(1, 1).encode())
+    unknown_status[16] = 3
+    with pytest.raises(ValueError):
+        MilestoneBox.decode(bytes(unknown_status))
+
+
+def test_box_names_and_minimum_balance():
+    name = milestone_box_name(258)
+    assert name == b"m_" + bytes(6) + b"\x01\x02"
+    assert milestone_index_from_box_name(name) == 258
+    with pytest.raises(ValueError):
+        milestone_index_from_box_name(b"x_" + bytes(8))
+
+    # 2500 per box plus 400 per byte of name (10) and contents (57)
+    assert MILESTONE_BOX_MBR == 2500 + 400 * (10 + 57) == 29_300
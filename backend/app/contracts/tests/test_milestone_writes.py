@@ -0,0 +1,92 @@
+"""
+add_milestone(s) against existing boxes, run through the offline TEAL
+interpreter: pending milestones can be rewritten, verified or paid ones cannot
+
+Run from backend/: python -m pytest app/contracts/tests
+"""
+
+from dataclasses import replace
+import pytest
+from algosdk.encoding import encode_address
+from app.contracts import methods
+from app.contracts.fairlens_contract import FairLensContract
+from app.contracts.milestone_box import MilestoneBox, MilestoneBoxStatus, milestone_box_name
+from app.contracts.tests.teal_vm import Rejected, TealVM
+
+OWNER, CONTRACTOR, VERIFIER = (encode_address(bytes([i]) * 32) for i in (1, 2, 3))
+PROOF = b"\xab" * 32
+
+
+@pytest.fixture(scope="module")
+def approval_program():
+    return FairLensContract(OWNER, CONTRACTOR, VERIFIER, total_amount=1_000_000).approval_program()
+
+
+@pytest.fixture
+def vm(approval_program):
+    vm = TealVM(approval_program)
+    vm.create(OWNER)
+    return vm
+
+
+def add_milestone(vm: TealVM, index: int, amount: int, due_date: int):
+    vm.call(OWNER, methods.encode_method_args(methods.ADD_MILESTONE, [index, amount, due_date]))
+
+
+def add_milestones(vm: TealVM, milestones):
+    vm.call(OWNER, methods.encode_method_args(methods.ADD_MILESTONES, [milestones]))
+
+
+def mark(vm: TealVM, index: int, status: MilestoneBoxStatus):
+    """Stand in for verify_milestone/release_payment, which need a real ledger"""
+    box = MilestoneBox.decode(vm.boxes[milestone_box_name(index)])
+    vm.boxes[milestone_box_name(index)] = replace(box, status=status, proof_hash=PROOF, verified_round=77).encode()
+
+
+def test_add_milestones_creates_pending_boxes(vm):
+    add_milestones(vm, [(0, 100, 1_900_000_000), (1, 200, 1_900_000_001)])
+    assert MilestoneBox.decode(vm.boxes[milestone_box_name(1)]) == MilestoneBox(200, 1_900_000_001)
+    assert vm.global_state[b"m_count"] == 2
+
+
+def test_add_milestones_can_rewrite_a_pending_milestone(vm):
+    add_milestones(vm, [(0, 100, 1_900_000_000)])
+    add_milestones(vm, [(0, 150, 1_900_000_005)])
+    assert MilestoneBox.decode(vm.boxes[milestone_box_name(0)]) == MilestoneBox(150, 1_900_000_005)
+
+
+@pytest.mark.parametrize("status", [MilestoneBoxStatus.VERIFIED, MilestoneBoxStatus.PAID])
+def test_add_milestones_rejects_a_milestone_that_is_no_longer_pending(vm, status):
+    add_milestones(vm, [(0, 100, 1_900_000_000), (1, 200, 1_900_000_001)])
+    mark(vm, 0, status)
+    before = dict(vm.boxes)
+
+    # The whole batch fails, including the still-pending milestone 1
+    with pytest.raises(Rejected):
+        add_milestones(vm, [(1, 250, 1_900_000_002), (0, 10 ** 9, 1_900_000_003)])
+    assert vm.boxes == before
+    assert MilestoneBox.decode(vm.boxes[milestone_box_name(0)]).proof_hash == PROOF
+
+
+def test_add_milestones_is_owner_only(vm):
+    with pytest.raises(Rejected):
+        vm.call(CONTRACTOR, methods.encode_method_args(methods.ADD_MILESTONES, [[(0, 100, 1)]]))
+    assert vm.boxes == {}
+
+
+def test_add_milestone_rewrites_a_pending_milestone_in_place(vm):
+    add_milestone(vm, 0, 100, 1_900_000_000)
+    add_milestone(vm, 0, 150, 1_900_000_005)
+    assert MilestoneBox.decode(vm.boxes[milestone_box_name(0)]) == MilestoneBox(150, 1_900_000_005)
+    assert vm.global_state[b"m_count"] == 1
+
+
+@pytest.mark.parametrize("status", [MilestoneBoxStatus.VERIFIED, MilestoneBoxStatus.PAID])
+def test_add_milestone_keeps_the_proof_of_a_milestone_that_is_no_longer_pending(vm, status):
+    add_milestone(vm, 0, 100, 1_900_000_000)
+    mark(vm, 0, status)
+
+    with pytest.raises(Rejected):
+        add_milestone(vm, 0, 10 ** 9, 1_900_000_003)
+    box = MilestoneBox.decode(vm.boxes[milestone_box_name(0)])
+    assert (box.amount, box.status, box.proof_hash, box.verified_round) == (100, status, PROOF, 77)
@@ -0,0 +1,71 @@
+"""
+Offline budget checks for the FairLens approval program
+
+Run from backend/: python -m pytest app/contracts/tests
+"""
+
+import pytest
+from algosdk.encoding import encode_address
+from app.contracts.fairlens_contract import FairLensContract
+from app.contracts.teal_analyzer import (
+    FAIRLENS_APP_CALL_LIMITS,
+    TealAnalysisError,
+    analyze_fairlens_contract,
+    analyze_teal,
+    budget_violations,
+)
+
+
+@pytest.fixture(scope="module")
+def report():
+    owner, contractor, verifier = (encode_address(bytes([i]) * 32) for i in (1, 2, 3))
+    return analyze_fairlens_contract(FairLensContract(owner, contractor, verifier, total_amount=1_000_000))
+
+
+def test_contract_fits_budget_and_size(report):
+    assert budget_violations(report, FAIRLENS_APP_CALL_LIMITS) == []
+
+
+def test_every_method_is_analyzed(report):
+    assert set(report.methods) == {
+        "add_milestone", "verify_milestone", "release_payment", "emergency_pause",
+        "resume_contract", "update_verifier", "add_milestones", "release_batch", "opup",
+    }
+    assert report.methods["release_payment"].inner_txns == 1
+    assert report.methods["add_milestones"].box_writes == 8
+    assert report.methods["release_batch"].inner_txns == 7
+
+
+LOOP_PROGRAM = """#pragma version 10
+txna ApplicationArgs 0
+match body
+err
+body:
+int 0
+store 0
+loop:
+load 0
+int 3
+<
+bz done
+load 0
+int 1
++
+store 0
+b loop
+done:
+int 1
+return
+"""
+
+
+def test_loop_needs_a_bound():
+    with pytest.raises(TealAnalysisError):
+        analyze_teal(LOOP_PROGRAM)
+
+
+def test_loop_cost_scales_with_bound():
+    one = analyze_teal(LOOP_PROGRAM, method_names=["m"], loop_bounds={"m": 1}).methods["m"]
+    four = analyze_teal(LOOP_PROGRAM, method_names=["m"], loop_bounds={"m": 4}).methods["m"]
+    # Each extra iteration re-runs the 4-op loop check and the 5-op body
+    assert four.opcode_cost - one.opcode_cost == 3 * 9
@@ -1,6 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from app.config import settings
+from app.utils.query_stats import instrument_engine
 
 # Create async engine
 engine = create_async_engine(
@@ -8,6 +9,8 @@ engine = create_async_engine(
     echo=settings.DEBUG,
     future=True
 )
+# Statement timing for metrics and per-request query counts
+instrument_engine(engine.sync_engine)
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -1,12 +1,22 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 import logging
+import os
 from contextlib import asynccontextmanager
+import asyncio
 
-from app.database import engine, Base
-from app.routes import auth, tenders, contracts, milestones, payments, nft, wallet, admin
+from app.database import engine
+from app.migrations import check_schema_version
+from app.routes import auth, tenders, contracts, milestones, payments, nft, wallet, admin, export
 from app.config import settings
+from app.services.nft_status import nft_status_cache
+from app.services.pin_outbox import pin_outbox
+from app.services.reconciliation import reconciliation_service
+from app.utils.ipfs import ipfs_service
+from app.utils.metadata_cache import metadata_cache
+from app.utils import metrics as app_metrics
+from app.utils.request_metrics import MetricsMiddleware, track_in_flight
 
 # Configure logging
 logging.basicConfig(
@@ -20,20 +30,39 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting up FairLens backend...")
-    # Create database tables
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-    logger.info("Database tables created/verified")
+    # Schema changes are applied by init-db.py; startup only checks the version
+    schema_version = await check_schema_version(engine)
+    logger.info(f"Database schema verified at version {schema_version}")
+    background_tasks = []
+    if settings.RECONCILE_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(
+            reconciliation_service.run_forever(settings.RECONCILE_INTERVAL_SECONDS)
+        ))
+    if settings.IPFS_PIN_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(
+            pin_outbox.run_forever(settings.IPFS_PIN_INTERVAL_SECONDS)
+        ))
+    if settings.NFT_STATUS_OBSERVE_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(
+            nft_status_cache.run_forever(settings.NFT_STATUS_OBSERVE_INTERVAL_SECONDS)
+        ))
     yield
     # Shutdown
     logger.info("Shutting down FairLens backend...")
+    for task in background_tasks:
+        task.cancel()
+    await ipfs_service.aclose()
+    await metadata_cache.aclose()
+    # The workers that keep serving /metrics stop counting this one's gauges
+    app_metrics.mark_worker_exited(os.getpid())
 
 
 app = FastAPI(
     title="FairLens API",
     description="Blockchain-Based Transparent Tender Management System",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    dependencies=[Depends(track_in_flight)]
 )
 
 # CORS configuration
@@ -45,6 +74,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route request metrics; added last so it is outermost and times everything
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(tenders.router, prefix="/api/tenders", tags=["Tenders"])
@@ -54,6 +86,7 @@ app.include_router(payments.router, prefix="/api/payments", tags=["Payments"])
 app.include_router(nft.router, prefix="/api/nft", tags=["NFT"])
 app.include_router(wallet.router, prefix="/api/wallet", tags=["Wallet"])
 app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
+app.include_router(export.router, prefix="/api/export", tags=["Export"])
 
 # Import blockchain router
 from app.routes import blockchain
@@ -77,6 +110,13 @@ async def health_check():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint, merged across uvicorn workers"""
+    content = await asyncio.to_thread(app_metrics.render)
+    return Response(content=content, media_type=app_metrics.CONTENT_TYPE)
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
@@ -0,0 +1,267 @@
+"""
+Versioned schema migrations
+
+Each migration runs once, in order, and is recorded in the schema_version
+table. Migrations are applied by init-db.py; application startup only checks
+that the recorded version matches SCHEMA_VERSION. A database created before
+versioning (all baseline tables, no schema_version) is recorded as the
+baseline and upgraded from there.
+"""
+
+from sqlalchemy import (
+    Boolean, Column, DateTime, Enum, ForeignKey, Integer, LargeBinary, MetaData, Numeric,
+    String, Table, Text, insert, select, text,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.sql import func
+from typing import Callable, List, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Kept outside Base.metadata so create_all on the models never touches it
+version_metadata = MetaData()
+
+schema_version_table = Table(
+    "schema_version",
+    version_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+# Tables as each migration created them. These are frozen copies, not the
+# models: changing a model must never change what an earlier migration
+# creates, so schema changes go into a new migration instead. Enums are
+# stored by member name, as the models' Enum columns do.
+frozen_metadata = MetaData()
+
+# Migration 1: baseline schema
+Table(
+    "users", frozen_metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String, nullable=False),
+    Column("email", String, unique=True, index=True, nullable=False),
+    Column("password_hash", String, nullable=False),
+    Column("role", Enum("GOVERNMENT", "CONTRACTOR", "CITIZEN", name="userrole"), nullable=False),
+    Column("wallet_address", String, nullable=True),
+    Column("is_active", Boolean),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("updated_at", DateTime(timezone=True)),
+)
+Table(
+    "tenders", frozen_metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("title", String, nullable=False),
+    Column("description", Text, nullable=False),
+    Column("location", String, nullable=False),
+    Column("category", String, nullable=False),
+    Column("budget", Numeric(15, 2), nullable=False),
+    Column("deadline", DateTime(timezone=True), nullable=False),
+    Column("start_date", DateTime(timezone=True), nullable=True),
+    Column("duration_months", Integer, nullable=True),
+    Column("technical_specs", Text, nullable=True),
+    Column("quality_standards", String, nullable=True),
+    Column("status", Enum("DRAFT", "ACTIVE", "REVIEW", "CLOSED", "COMPLETED", name="tenderstatus")),
+    Column("gov_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("blockchain_hash", String, nullable=True),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("updated_at", DateTime(timezone=True)),
+)
+Table(
+    "applications", frozen_metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("tender_id", Integer, ForeignKey("tenders.id"), nullable=False),
+    Column("contractor_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("bid_amount", Numeric(15, 2), nullable=False),
+    Column("proposal_link", String, nullable=True),
+    Column("technical_proposal", Text, nullable=True),
+    Column("timeline_months", Integer, nullable=True),
+    Column("status", Enum("PENDING", "ACCEPTED", "REJECTED", name="applicationstatus")),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("updated_at", DateTime(timezone=True)),
+)
+Table(
+    "contracts", frozen_metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("tender_id", Integer, ForeignKey("tenders.id"), nullable=False),
+    Column("contractor_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("gov_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("app_id", Integer, nullable=True),
+    Column("app_address", String, nullable=True),
+    Column("nft_id", Integer, nullable=True),
+    Column("status", Enum("ACTIVE", "COMPLETED", "TERMINATED", "SUSPENDED", name="contractstatus")),
+    Column("total_amount", Numeric(15, 2), nullable=False),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("updated_at", DateTime(timezone=True)),
+)
+Table(
+    "milestones", frozen_metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("contract_id", Integer, ForeignKey("contracts.id"), nullable=False),
+    Column("index", Integer, nullable=False),
+    Column("title", String, nullable=False),
+    Column("description", Text, nullable=True),
+    Column("amount", Numeric(15, 2), nullable=False),
+    Column("deadline", DateTime(timezone=True), nullable=False),
+    Column("status", Enum("PENDING", "IN_PROGRESS", "COMPLETED", "VERIFIED", "PAID", name="milestonestatus")),
+    Column("proof_hash", String, nullable=True),
+    Column("completed_at", DateTime(timezone=True), nullable=True),
+    Column("verified_at", DateTime(timezone=True), nullable=True),
+    Column("paid_at", DateTime(timezone=True), nullable=True),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("updated_at", DateTime(timezone=True)),
+)
+Table(
+    "transactions", frozen_metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("contract_id", Integer, ForeignKey("contracts.id"), nullable=True),
+    Column("tx_id", String, unique=True, nullable=False),
+    Column("type", Enum("PAYMENT", "NFT_MINT", "NFT_BURN", "CONTRACT_DEPLOY", name="transactiontype"), nullable=False),
+    Column("status", Enum("PENDING", "CONFIRMED", "FAILED", name="transactionstatus")),
+    Column("amount", String, nullable=True),
+    Column("note", Text, nullable=True),
+    Column("confirmed_round", Integer, nullable=True),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("updated_at", DateTime(timezone=True)),
+)
+
+# Migration 2: reconciliation watermarks
+Table(
+    "reconciliation_state", frozen_metadata,
+    Column("contract_id", Integer, ForeignKey("contracts.id"), primary_key=True),
+    Column("last_round", Integer, nullable=False),
+    Column("mismatches", Integer, nullable=False),
+    Column("checked_at", DateTime(timezone=True), nullable=True),
+)
+
+# Migration 3: IPFS pin outbox
+Table(
+    "ipfs_pins", frozen_metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("cid", String, unique=True, nullable=False),
+    Column("content", LargeBinary, nullable=False),
+    Column("status", Enum("PENDING", "PINNED", "FAILED", name="pinstatus"), nullable=False, index=True),
+    Column("attempts", Integer, nullable=False),
+    Column("next_attempt_at", DateTime(timezone=True), server_default=func.now(), nullable=False),
+    Column("last_error", Text, nullable=True),
+    Column("pinned_at", DateTime(timezone=True), nullable=True),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("updated_at", DateTime(timezone=True)),
+)
+
+# Tables every database created before versioning already has
+BASELINE_TABLES = ("users", "tenders", "applications", "contracts", "milestones", "transactions")
+
+
+def _create_tables(*table_names: str) -> Callable[[Connection], None]:
+    """Migration step that creates the named frozen tables if missing"""
+    def upgrade(conn: Connection) -> None:
+        tables = [frozen_metadata.tables[name] for name in table_names]
+        frozen_metadata.create_all(conn, tables=tables, checkfirst=True)
+    return upgrade
+
+
+def _execute(*statements: str) -> Callable[[Connection], None]:
+    """Migration step that runs literal DDL (portable across SQLite and PostgreSQL)"""
+    def upgrade(conn: Connection) -> None:
+        for statement in statements:
+            conn.execute(text(statement))
+    return upgrade
+
+
+# (version, description, upgrade) - append only, never edit an applied entry
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (
+        1,
+        "baseline schema",
+        _create_tables(*BASELINE_TABLES),
+    ),
+    (
+        2,
+        "per-contract chain reconciliation watermarks",
+        _create_tables("reconciliation_state"),
+    ),
+    (
+        3,
+        "IPFS pin outbox",
+        _create_tables("ipfs_pins"),
+    ),
+    (
+        4,
+        "index contracts.nft_id for NFT status lookups",
+        _execute("CREATE INDEX IF NOT EXISTS ix_contracts_nft_id ON contracts (nft_id)"),
+    ),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+class SchemaVersionError(RuntimeError):
+    """Raised when the database schema is behind the application"""
+
+
+def _current_version(conn: Connection) -> int:
+    if not conn.dialect.has_table(conn, schema_version_table.name):
+        return 0
+    result = conn.execute(select(func.max(schema_version_table.c.version)))
+    return result.scalar() or 0
+
+
+def _upgrade(conn: Connection) -> List[int]:
+    version_metadata.create_all(conn, checkfirst=True)
+    current = _current_version(conn)
+    applied = []
+    if current == 0 and all(conn.dialect.has_table(conn, name) for name in BASELINE_TABLES):
+        # Created by create_all before migrations were versioned: adopt it as
+        # the baseline and apply only what came after
+        logger.info("Recording existing unversioned database as the baseline schema")
+        version, description, _ = MIGRATIONS[0]
+        conn.execute(insert(schema_version_table).values(version=version, description=description))
+        current = version
+    for version, description, upgrade in MIGRATIONS:
+        if version <= current:
+            continue
+        logger.info(f"Applying migration {version}: {description}")
+        upgrade(conn)
+        conn.execute(insert(schema_version_table).values(version=version, description=description))
+        applied.append(version)
+    return applied
+
+
+async def run_migrations(engine: AsyncEngine) -> List[int]:
+    """Apply all pending migrations in one transaction and return their versions"""
+    async with engine.begin() as conn:
+        return await conn.run_sync(_upgrade)
+
+
+_verified_version: int | None = None
+
+
+async def check_schema_version(engine: AsyncEngine) -> int:
+    """
+    Verify the database is at SCHEMA_VERSION with a single read
+
+    The result is cached for the life of the process, so repeated calls (e.g.
+    from several lifespans in one process) do not hit the database again.
+    """
+    global _verified_version
+    if _verified_version is not None:
+        return _verified_version
+
+    async with engine.connect() as conn:
+        current = await conn.run_sync(_current_version)
+
+    if current < SCHEMA_VERSION:
+        raise SchemaVersionError(
+            f"Database schema is at version {current}, application requires "
+            f"{SCHEMA_VERSION}. Run `python init-db.py` to apply migrations."
+        )
+    if current > SCHEMA_VERSION:
+        logger.warning(
+            f"Database schema version {current} is newer than application version {SCHEMA_VERSION}"
+        )
+
+    _verified_version = current
+    return current
@@ -4,6 +4,8 @@ from app.models.application import Application
 from app.models.contract import Contract
 from app.models.milestone import Milestone
 from app.models.transaction import Transaction
+from app.models.reconciliation import ReconciliationState
+from app.models.ipfs_pin import IPFSPin
 
 __all__ = [
     "User",
@@ -12,6 +14,8 @@ __all__ = [
     "Contract",
     "Milestone",
     "Transaction",
+    "ReconciliationState",
+    "IPFSPin",
 ]
 
 
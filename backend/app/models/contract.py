@@ -21,7 +21,7 @@ class Contract(Base):
     gov_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     app_id = Column(Integer, nullable=True)  # Algorand application ID
     app_address = Column(String, nullable=True)  # Algorand application address
-    nft_id = Column(Integer, nullable=True)  # Algorand ASA ID for NFT
+    nft_id = Column(Integer, nullable=True, index=True)  # Algorand ASA ID for NFT
     status = Column(Enum(ContractStatus), default=ContractStatus.ACTIVE)
     total_amount = Column(Numeric(15, 2), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
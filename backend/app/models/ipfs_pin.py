@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, LargeBinary
+from sqlalchemy.sql import func
+import enum
+from app.database import Base
+
+
+class PinStatus(str, enum.Enum):
+    PENDING = "pending"
+    PINNED = "pinned"
+    FAILED = "failed"
+
+
+class IPFSPin(Base):
+    __tablename__ = "ipfs_pins"
+
+    id = Column(Integer, primary_key=True, index=True)
+    cid = Column(String, unique=True, nullable=False)  # Locally computed CIDv0 of content
+    content = Column(LargeBinary, nullable=False)  # Exact bytes to upload
+    status = Column(Enum(PinStatus), default=PinStatus.PENDING, nullable=False, index=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_error = Column(Text, nullable=True)
+    pinned_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from app.database import Base
+
+
+class ReconciliationState(Base):
+    __tablename__ = "reconciliation_state"
+
+    contract_id = Column(Integer, ForeignKey("contracts.id"), primary_key=True)
+    last_round = Column(Integer, nullable=False, default=0)  # Chain round reconciled up to (watermark)
+    mismatches = Column(Integer, nullable=False, default=0)  # Unresolved differences found on the last check
+    checked_at = Column(DateTime(timezone=True), nullable=True)  # Last time the contract was compared
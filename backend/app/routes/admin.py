@@ -7,8 +7,10 @@ from app.models.tender import Tender, TenderStatus
 from app.models.contract import Contract, ContractStatus
 from app.models.milestone import Milestone, MilestoneStatus
 from app.models.transaction import Transaction, TransactionType, TransactionStatus
-from app.schemas.admin import AdminStatsResponse
+from app.models.reconciliation import ReconciliationState
+from app.schemas.admin import AdminStatsResponse, ContractReconciliationResponse, ReconciliationStatusResponse
 from app.utils.auth import get_current_active_user
+from app.services.reconciliation import reconciliation_service
 
 router = APIRouter()
 
@@ -97,3 +99,66 @@ async def get_admin_stats(
     )
 
 
+async def _reconciliation_status(db: AsyncSession) -> ReconciliationStatusResponse:
+    # Watermarks and mismatches come from the database so every worker reports
+    # the same totals; the pass counters are those of this process
+    oldest_result = await db.execute(select(func.min(ReconciliationState.last_round)))
+    mismatch_result = await db.execute(
+        select(ReconciliationState)
+        .where(ReconciliationState.mismatches > 0)
+        .order_by(ReconciliationState.mismatches.desc())
+    )
+    flagged = mismatch_result.scalars().all()
+    
+    stats = reconciliation_service.stats.to_dict()
+    stats["mismatches"] = sum(state.mismatches for state in flagged)
+    return ReconciliationStatusResponse(
+        **stats,
+        oldest_watermark=oldest_result.scalar(),
+        contracts_with_mismatches=[
+            ContractReconciliationResponse(
+                contract_id=state.contract_id,
+                last_round=state.last_round,
+                mismatches=state.mismatches
+            )
+            for state in flagged
+        ]
+    )
+
+
+@router.get("/reconciliation", response_model=ReconciliationStatusResponse)
+async def get_reconciliation_status(
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get chain/database reconciliation lag and mismatch counts"""
+    if current_user.role != UserRole.GOVERNMENT:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only government users can access reconciliation status"
+        )
+    
+    return await _reconciliation_status(db)
+
+
+@router.post("/reconciliation/run", response_model=ReconciliationStatusResponse)
+async def run_reconciliation(
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Run one chain/database reconciliation pass now"""
+    if current_user.role != UserRole.GOVERNMENT:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only government users can run reconciliation"
+        )
+    
+    try:
+        await reconciliation_service.run_once(db)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Reconciliation failed: {str(e)}"
+        )
+    
+    return await _reconciliation_status(db)
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from app.models.user import User
 from app.schemas.wallet import WalletBalanceResponse, AssetBalance
+from app.schemas.chain_state import ChainStateResponse
 from app.utils.auth import get_current_active_user
 from app.services.blockchain import blockchain_service
+from app.services.app_state import app_state_service
 from app.utils.lora import get_account_explorer_url
 
 router = APIRouter()
@@ -94,3 +96,14 @@ async def get_application_info(app_id: int):
         )
 
 
+@router.get("/app/{app_id}/state", response_model=ChainStateResponse)
+async def get_application_state(app_id: int):
+    """Get the decoded FairLens global state of an application"""
+    try:
+        app_state = await app_state_service.get_state(app_id)
+        return app_state
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get application state: {str(e)}"
+        )
@@ -1,26 +1,52 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
+from sqlalchemy.orm import joinedload, selectinload
 from typing import List
 from app.database import get_db
 from app.models.user import User, UserRole
 from app.models.tender import Tender
 from app.models.application import Application, ApplicationStatus
 from app.models.contract import Contract, ContractStatus
-from app.models.milestone import Milestone
-from app.schemas.contract import ContractResponse, ContractCreate
+from app.models.milestone import Milestone, MilestoneStatus
+from app.contracts.milestone_box import MilestoneBoxStatus
+from app.schemas.contract import (
+    ContractResponse,
+    ContractCreate,
+    ContractDeployResponse,
+    ContractDetailResponse,
+)
+from app.schemas.preflight import PreflightResponse
+from app.schemas.chain_state import (
+    ChainMilestoneResponse,
+    ContractChainMilestonesResponse,
+    ContractChainStateResponse,
+    MilestoneComparison,
+)
+from app.schemas.milestone import MilestoneResponse
 from app.utils.auth import get_current_active_user
+from app.services.app_state import app_state_service
 from app.services.blockchain import blockchain_service
 from app.services.contract_service import create_fairlens_contract
+from app.services.preflight import preflight_service
 from app.utils.lora import get_app_explorer_url
+from app.utils.responses import model_json_response
 import algosdk
-from algosdk import transaction
+from algosdk import encoding, transaction
 import base64
 
 router = APIRouter()
 
+# Database statuses each on-chain milestone status is consistent with; work
+# before verification (in progress, completed) is only tracked off chain
+CHAIN_STATUS_MATCHES = {
+    MilestoneBoxStatus.PENDING: {MilestoneStatus.PENDING, MilestoneStatus.IN_PROGRESS, MilestoneStatus.COMPLETED},
+    MilestoneBoxStatus.VERIFIED: {MilestoneStatus.VERIFIED},
+    MilestoneBoxStatus.PAID: {MilestoneStatus.PAID},
+}
 
-@router.post("/deploy", response_model=ContractResponse, status_code=status.HTTP_201_CREATED)
+
+@router.post("/deploy", response_model=ContractDeployResponse, status_code=status.HTTP_201_CREATED)
 async def deploy_contract(
     contract_data: ContractCreate,
     current_user: User = Depends(get_current_active_user),
@@ -112,6 +138,8 @@ async def deploy_contract(
         clear_teal=compiled["clear_source"],
         sender_address=current_user.wallet_address
     )
+    unsigned_txn = deployment_result["unsigned_txn"]
+    preflight = await preflight_service.preflight(unsigned_txn)
     
     # Create contract record
     new_contract = Contract(
@@ -128,27 +156,22 @@ async def deploy_contract(
     await db.commit()
     await db.refresh(new_contract)
     
-    # Add deployment information to response
-    contract_dict = {
-        "id": new_contract.id,
-        "tender_id": new_contract.tender_id,
-        "contractor_id": new_contract.contractor_id,
-        "gov_id": new_contract.gov_id,
-        "app_id": new_contract.app_id,
-        "app_address": new_contract.app_address,
-        "status": new_contract.status,
-        "total_amount": new_contract.total_amount,
-        "created_at": new_contract.created_at,
-        "deployment_txn": deployment_result.get("txn_dict"),
-        "note": "Contract deployment transaction created. Sign and submit to deploy.",
-    }
-    
-    # Add Lora explorer URL if app_id is available
-    if new_contract.app_id:
-        contract_dict["explorer_url"] = get_app_explorer_url(new_contract.app_id)
-        contract_dict["lora_url"] = get_app_explorer_url(new_contract.app_id)
-    
-    return contract_dict
+    contract_response = ContractDeployResponse.model_construct(
+        id=new_contract.id,
+        tender_id=new_contract.tender_id,
+        contractor_id=new_contract.contractor_id,
+        gov_id=new_contract.gov_id,
+        app_id=new_contract.app_id,
+        app_address=new_contract.app_address,
+        nft_id=new_contract.nft_id,
+        status=new_contract.status,
+        total_amount=new_contract.total_amount,
+        created_at=new_contract.created_at,
+        unsigned_txn=encoding.msgpack_encode(unsigned_txn),
+        preflight=PreflightResponse.model_construct(**preflight.to_dict())
+    )
+    
+    return model_json_response(contract_response, status_code=status.HTTP_201_CREATED)
 
 
 @router.get("/", response_model=List[ContractResponse])
@@ -175,6 +198,41 @@ async def list_contracts(
     return contracts
 
 
+@router.get("/chain-state", response_model=List[ContractChainStateResponse])
+async def list_contract_chain_states(
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the on-chain state of every deployed contract of the current user"""
+    if current_user.role == UserRole.GOVERNMENT:
+        owner_filter = Contract.gov_id == current_user.id
+    elif current_user.role == UserRole.CONTRACTOR:
+        owner_filter = Contract.contractor_id == current_user.id
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Citizens cannot view contracts"
+        )
+    
+    result = await db.execute(
+        select(Contract.id, Contract.app_id)
+        .where(and_(owner_filter, Contract.app_id.is_not(None)))
+        .order_by(Contract.id)
+    )
+    rows = result.all()
+    
+    # All apps are read at the same round, concurrently
+    states = await app_state_service.get_states(app_id for _, app_id in rows)
+    return [
+        ContractChainStateResponse(
+            contract_id=contract_id,
+            app_id=app_id,
+            state=states.get(app_id)
+        )
+        for contract_id, app_id in rows
+    ]
+
+
 @router.get("/{contract_id}", response_model=ContractResponse)
 async def get_contract(
     contract_id: int,
@@ -199,3 +257,103 @@ async def get_contract(
     
     return contract
 
+
+@router.get("/{contract_id}/full", response_model=ContractDetailResponse)
+async def get_contract_full(
+    contract_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get contract details with its milestones and transactions in one response"""
+    # Milestones are joined onto the contract row; transactions load in one extra query
+    result = await db.execute(
+        select(Contract)
+        .options(joinedload(Contract.milestones), selectinload(Contract.transactions))
+        .where(Contract.id == contract_id)
+    )
+    contract = result.unique().scalar_one_or_none()
+    
+    if not contract:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Contract not found"
+        )
+    
+    # Verify access
+    if current_user.role == UserRole.GOVERNMENT and contract.gov_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+    if current_user.role == UserRole.CONTRACTOR and contract.contractor_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+    
+    contract_response = ContractDetailResponse.model_validate(contract)
+    contract_response.milestones.sort(key=lambda milestone: milestone.index)
+    contract_response.transactions.sort(key=lambda tx: tx.created_at, reverse=True)
+    
+    return model_json_response(contract_response)
+
+
+@router.get("/{contract_id}/chain-milestones", response_model=ContractChainMilestonesResponse)
+async def get_contract_chain_milestones(
+    contract_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Compare the contract's milestone rows with the milestone boxes on chain"""
+    result = await db.execute(
+        select(Contract)
+        .options(selectinload(Contract.milestones))
+        .where(Contract.id == contract_id)
+    )
+    contract = result.scalar_one_or_none()
+    
+    if not contract:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Contract not found"
+        )
+    
+    # Verify access
+    if current_user.role == UserRole.GOVERNMENT and contract.gov_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+    if current_user.role == UserRole.CONTRACTOR and contract.contractor_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+    
+    if not contract.app_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Contract is not deployed"
+        )
+    
+    try:
+        chain = await app_state_service.get_milestones(contract.app_id)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to read milestone boxes: {str(e)}"
+        )
+    
+    db_milestones = {milestone.index: milestone for milestone in contract.milestones}
+    comparisons = []
+    for index in sorted(db_milestones.keys() | chain.milestones.keys()):
+        row = db_milestones.get(index)
+        box = chain.milestones.get(index)
+        comparisons.append(MilestoneComparison(
+            index=index,
+            db=MilestoneResponse.model_validate(row) if row else None,
+            chain=ChainMilestoneResponse(
+                index=index,
+                amount=box.amount,
+                due_date=box.due_date,
+                status=box.status.name.lower(),
+                proof_hash=box.proof_hash.hex() if box.has_proof else None,
+                verified_round=box.verified_round
+            ) if box else None,
+            in_sync=bool(row and box and row.status in CHAIN_STATUS_MATCHES[box.status])
+        ))
+    
+    return model_json_response(ContractChainMilestonesResponse(
+        contract_id=contract.id,
+        app_id=contract.app_id,
+        round=chain.round,
+        milestones=comparisons
+    ))
@@ -0,0 +1,145 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+from app.database import AsyncSessionLocal
+from app.models.user import User, UserRole
+from app.models.tender import Tender
+from app.models.application import Application
+from app.models.contract import Contract
+from app.models.milestone import Milestone
+from app.models.transaction import Transaction
+from app.utils.auth import get_current_active_user
+import enum
+import csv
+import io
+import json
+
+router = APIRouter()
+
+# Rows fetched per server-side cursor round trip
+EXPORT_BATCH_SIZE = 500
+
+
+class ExportEntity(str, enum.Enum):
+    TENDERS = "tenders"
+    APPLICATIONS = "applications"
+    MILESTONES = "milestones"
+    TRANSACTIONS = "transactions"
+
+
+class ExportFormat(str, enum.Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+EXPORT_MODELS = {
+    ExportEntity.TENDERS: Tender,
+    ExportEntity.APPLICATIONS: Application,
+    ExportEntity.MILESTONES: Milestone,
+    ExportEntity.TRANSACTIONS: Transaction,
+}
+
+
+def _export_value(value):
+    """Convert a column value to a JSON/CSV friendly scalar"""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _build_export_query(
+    entity: ExportEntity,
+    contract_id: Optional[int],
+    created_from: Optional[datetime],
+    created_to: Optional[datetime]
+):
+    """Build the select statement for an export, applying date and contract filters"""
+    model = EXPORT_MODELS[entity]
+    query = select(model)
+
+    if contract_id is not None:
+        if entity == ExportEntity.TENDERS:
+            query = query.where(
+                Tender.id.in_(select(Contract.tender_id).where(Contract.id == contract_id))
+            )
+        elif entity == ExportEntity.APPLICATIONS:
+            query = query.where(
+                Application.tender_id.in_(select(Contract.tender_id).where(Contract.id == contract_id))
+            )
+        else:
+            query = query.where(model.contract_id == contract_id)
+
+    if created_from:
+        query = query.where(model.created_at >= created_from)
+    if created_to:
+        query = query.where(model.created_at < created_to)
+
+    return query.order_by(model.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+
+async def _stream_rows(query, columns, export_format: ExportFormat):
+    """
+    Stream rows from a server-side cursor, one encoded line at a time.
+
+    The session is opened inside the generator so it stays alive for the
+    whole response body instead of closing when the endpoint returns.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    if export_format == ExportFormat.CSV:
+        writer.writerow(columns)
+        yield buffer.getvalue()
+
+    async with AsyncSessionLocal() as session:
+        result = await session.stream_scalars(query)
+        async for row in result:
+            values = [_export_value(getattr(row, column)) for column in columns]
+            if export_format == ExportFormat.CSV:
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerow(values)
+                yield buffer.getvalue()
+            else:
+                yield json.dumps(dict(zip(columns, values))) + "\n"
+
+
+@router.get("/{entity}")
+async def export_entity(
+    entity: ExportEntity,
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    contract_id: Optional[int] = Query(None),
+    created_from: Optional[datetime] = Query(None, alias="from"),
+    created_to: Optional[datetime] = Query(None, alias="to"),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Stream a full export of an entity as NDJSON or CSV (Government only)"""
+    if current_user.role != UserRole.GOVERNMENT:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only government users can export data"
+        )
+
+    model = EXPORT_MODELS[entity]
+    columns = [column.name for column in model.__table__.columns]
+    query = _build_export_query(entity, contract_id, created_from, created_to)
+
+    if export_format == ExportFormat.CSV:
+        media_type = "text/csv"
+        extension = "csv"
+    else:
+        media_type = "application/x-ndjson"
+        extension = "ndjson"
+
+    return StreamingResponse(
+        _stream_rows(query, columns, export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{entity.value}.{extension}"'}
+    )
@@ -1,20 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 from app.database import get_db
 from app.models.user import User, UserRole
 from app.models.contract import Contract
+from app.models.milestone import Milestone
 from app.models.transaction import Transaction, TransactionType, TransactionStatus
-from app.schemas.nft import NFTMintRequest, NFTBurnRequest, NFTResponse
+from app.schemas.nft import (
+    NFTMintRequest,
+    NFTMintBatchRequest,
+    NFTBurnRequest,
+    NFTResponse,
+    NFTMintBatchItem,
+    NFTMintBatchResponse,
+    NFTMintGroup,
+    NFTGalleryItem,
+    NFTGalleryResponse,
+    PinStatusResponse,
+)
 from app.utils.auth import get_current_active_user
 from app.services.blockchain import blockchain_service
 from app.services.nft_service import nft_service
+from app.services.nft_status import nft_status_cache
+from app.services.pin_outbox import pin_outbox
+from app.services.preflight import preflight_service
 from app.utils.lora import get_asset_explorer_url, get_tx_explorer_url
+from app.utils.metadata_cache import cid_from_url, metadata_cache
+from app.utils.node_responses import as_dict
+from algosdk import encoding
+from typing import Optional
+import asyncio
 import json
 import hashlib
 
 router = APIRouter()
 
+# Gateway fetches in flight at once for one gallery page; asset params are
+# bounded by the NFT status cache (NFT_STATUS_MAX_CONCURRENCY)
+_GALLERY_METADATA_CONCURRENCY = 8
+
 
 @router.post("/mint", response_model=NFTResponse)
 async def mint_nft(
@@ -63,6 +87,10 @@ async def mint_nft(
             metadata_url=metadata_result["ipfs_url"],
             metadata_hash=metadata_result["metadata_hash_bytes"]
         )
+        preflight = await preflight_service.preflight(nft_result["unsigned_txn"])
+        
+        # Pinning happens in the background; the URL already uses the local CID
+        pin = await pin_outbox.enqueue(db, metadata_result["metadata_bytes"], metadata_result["ipfs_cid"])
         
         # Store transaction in database (will be updated when confirmed)
         new_transaction = Transaction(
@@ -85,9 +113,11 @@ async def mint_nft(
             "asset_name": f"FairLens-{nft_data.contract_id}",
             "metadata_url": metadata_result["ipfs_url"],
             "ipfs_cid": metadata_result["ipfs_cid"],
+            "pin_status": pin.status.value,
             "tx_id": "pending",
             "status": "pending",
-            "unsigned_txn": nft_result.get("txn_dict"),
+            "unsigned_txn": encoding.msgpack_encode(nft_result["unsigned_txn"]),
+            "preflight": preflight.to_dict(),
             "note": "Transaction must be signed by wallet. NFT ID will be returned after confirmation."
         }
     except Exception as e:
@@ -97,6 +127,132 @@ async def mint_nft(
         )
 
 
+@router.post("/mint-batch", response_model=NFTMintBatchResponse)
+async def mint_nft_batch(
+    nft_data: NFTMintBatchRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Mint one NFT per contract milestone, as atomic groups signed in one pass"""
+    # Verify contract access
+    contract_result = await db.execute(select(Contract).where(Contract.id == nft_data.contract_id))
+    contract = contract_result.scalar_one_or_none()
+    
+    if not contract:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Contract not found"
+        )
+    
+    if current_user.role == UserRole.GOVERNMENT and contract.gov_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+    if current_user.role == UserRole.CONTRACTOR and contract.contractor_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+    
+    if not current_user.wallet_address:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Wallet not connected"
+        )
+    
+    milestone_query = select(Milestone).where(Milestone.contract_id == contract.id)
+    if nft_data.milestone_indexes is not None:
+        milestone_query = milestone_query.where(Milestone.index.in_(nft_data.milestone_indexes))
+    milestone_result = await db.execute(milestone_query.order_by(Milestone.index))
+    milestones = milestone_result.scalars().all()
+    
+    if not milestones:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No milestones to mint"
+        )
+    
+    try:
+        # Metadata and CIDs are computed locally; pins are queued for the outbox worker
+        metadata_results = []
+        for milestone in milestones:
+            metadata_result = await nft_service.create_arc3_metadata(
+                name=f"FairLens Contract #{contract.id} Milestone {milestone.index}",
+                description=f"NFT representing milestone {milestone.index} of contract {contract.id}: {milestone.title}",
+                contract_id=contract.id,
+                milestone_index=milestone.index,
+                properties=nft_data.metadata
+            )
+            metadata_result["pin"] = await pin_outbox.enqueue(
+                db, metadata_result["metadata_bytes"], metadata_result["ipfs_cid"]
+            )
+            metadata_results.append(metadata_result)
+        
+        asset_names = [f"FairLens-{contract.id}-M{milestone.index}" for milestone in milestones]
+        groups = await nft_service.mint_nft_batch(
+            sender_address=current_user.wallet_address,
+            items=[
+                {
+                    "name": asset_name,
+                    "unit_name": "FLNFT",
+                    "metadata": metadata_result["metadata"],
+                    "metadata_url": metadata_result["ipfs_url"],
+                    "metadata_hash": metadata_result["metadata_hash_bytes"]
+                }
+                for asset_name, metadata_result in zip(asset_names, metadata_results)
+            ]
+        )
+        preflights = [await preflight_service.preflight(group) for group in groups]
+        
+        nfts = []
+        txns = [(group_index, txn) for group_index, group in enumerate(groups) for txn in group]
+        # A retried request in the same round rebuilds identical transactions
+        existing_result = await db.execute(
+            select(Transaction.tx_id).where(Transaction.tx_id.in_([txn.get_txid() for _, txn in txns]))
+        )
+        existing_tx_ids = set(existing_result.scalars().all())
+        for milestone, asset_name, metadata_result, (group_index, txn) in zip(
+            milestones, asset_names, metadata_results, txns
+        ):
+            tx_id = txn.get_txid()
+            # One row per asset; the txid is known before signing
+            if tx_id not in existing_tx_ids:
+                db.add(Transaction(
+                    contract_id=contract.id,
+                    tx_id=tx_id,
+                    type=TransactionType.NFT_MINT,
+                    status=TransactionStatus.PENDING,
+                    note=json.dumps({
+                        "metadata": metadata_result["metadata"],
+                        "ipfs_cid": metadata_result["ipfs_cid"],
+                        "ipfs_url": metadata_result["ipfs_url"],
+                        "milestone_index": milestone.index
+                    })
+                ))
+            nfts.append(NFTMintBatchItem(
+                milestone_index=milestone.index,
+                asset_name=asset_name,
+                metadata_url=metadata_result["ipfs_url"],
+                ipfs_cid=metadata_result["ipfs_cid"],
+                pin_status=metadata_result["pin"].status.value,
+                tx_id=tx_id,
+                group=group_index
+            ))
+        await db.commit()
+        
+        return NFTMintBatchResponse(
+            contract_id=contract.id,
+            nfts=nfts,
+            groups=[
+                NFTMintGroup(
+                    unsigned_txns=[encoding.msgpack_encode(txn) for txn in group],
+                    preflight=preflight.to_dict()
+                )
+                for group, preflight in zip(groups, preflights)
+            ]
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to mint NFTs: {str(e)}"
+        )
+
+
 @router.post("/burn", response_model=NFTResponse)
 async def burn_nft(
     nft_data: NFTBurnRequest,
@@ -125,10 +281,23 @@ async def burn_nft(
     if current_user.role == UserRole.CONTRACTOR and contract.contractor_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
     
+    if not current_user.wallet_address:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Wallet not connected"
+        )
+    
     # Get asset info
     try:
         asset_info = await blockchain_service.get_asset_info(nft_data.nft_id)
         
+        # Burn transaction (returns unsigned transaction)
+        burn_result = await nft_service.burn_nft(
+            asset_id=nft_data.nft_id,
+            sender_address=current_user.wallet_address
+        )
+        preflight = await preflight_service.preflight(burn_result["unsigned_txn"])
+        
         # Create burn transaction record
         new_transaction = Transaction(
             contract_id=nft_data.contract_id,
@@ -146,7 +315,9 @@ async def burn_nft(
             asset_name=asset_info.get("name", "Unknown"),
             metadata_url=None,
             tx_id="pending",
-            status="pending"
+            status="pending",
+            unsigned_txn=encoding.msgpack_encode(burn_result["unsigned_txn"]),
+            preflight=preflight.to_dict()
         )
     except Exception as e:
         raise HTTPException(
@@ -163,17 +334,13 @@ async def get_nft_status(
 ):
     """Get NFT status with Lora explorer URL"""
     try:
-        asset_info = await nft_service.get_nft_info(nft_id)
-        
-        # Try to find contract from database
-        contract_result = await db.execute(
-            select(Contract).where(Contract.nft_id == nft_id)
-        )
-        contract = contract_result.scalar_one_or_none()
+        # Asset params and the contract mapping are cached until the asset is reconfigured
+        nft_status = await nft_status_cache.get(db, nft_id)
+        asset_info = nft_status.asset_info
         
         return {
             "nft_id": nft_id,
-            "contract_id": contract.id if contract else 0,
+            "contract_id": nft_status.contract_id,
             "asset_name": asset_info.get("name", "Unknown"),
             "metadata_url": asset_info.get("url"),
             "tx_id": "",
@@ -189,3 +356,90 @@ async def get_nft_status(
             detail=f"NFT not found: {str(e)}"
         )
 
+
+@router.get("/pins/{cid}", response_model=PinStatusResponse)
+async def get_pin_status(cid: str, db: AsyncSession = Depends(get_db)):
+    """Get the IPFS pinning status of NFT metadata"""
+    pin = await pin_outbox.get(db, cid)
+    
+    if not pin:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No pin queued for this CID"
+        )
+    
+    return pin
+
+
+@router.get("/by-address/{address}", response_model=NFTGalleryResponse)
+async def list_nfts_by_address(
+    address: str,
+    limit: int = Query(20, ge=1, le=100),
+    next: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """List FairLens proof NFTs held by an address, with their ARC-3 metadata"""
+    if not encoding.is_valid_address(address):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid Algorand address"
+        )
+    
+    indexer_client = blockchain_service.indexer_client
+    if indexer_client is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Indexer not configured"
+        )
+    
+    try:
+        page = as_dict(await asyncio.to_thread(
+            indexer_client.lookup_account_assets, address, limit=limit, next_page=next
+        ))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Failed to read holdings: {str(e)}"
+        )
+    
+    holdings = {
+        holding["asset-id"]: holding.get("amount", 0)
+        for holding in page.get("assets", [])
+        if holding.get("amount", 0) > 0
+    }
+    # Asset params come from the NFT status cache; only FairLens unit names are kept
+    statuses = await nft_status_cache.get_many(db, holdings)
+    nft_ids = [
+        nft_id for nft_id in holdings
+        if nft_id in statuses and statuses[nft_id].asset_info.get("unit_name") == "FLNFT"
+    ]
+    
+    # Metadata by CID, from the disk cache or the gateway, a few at a time
+    semaphore = asyncio.Semaphore(_GALLERY_METADATA_CONCURRENCY)
+
+    async def resolve(cid: Optional[str]):
+        if not cid:
+            return None
+        async with semaphore:
+            return await metadata_cache.get(cid)
+    
+    cids = [cid_from_url(statuses[nft_id].asset_info.get("url")) for nft_id in nft_ids]
+    metadata = await asyncio.gather(*(resolve(cid) for cid in cids))
+    
+    return NFTGalleryResponse(
+        address=address,
+        nfts=[
+            NFTGalleryItem(
+                nft_id=nft_id,
+                asset_name=statuses[nft_id].asset_info.get("name"),
+                amount=holdings[nft_id],
+                contract_id=statuses[nft_id].contract_id,
+                metadata_url=statuses[nft_id].asset_info.get("url"),
+                ipfs_cid=cid,
+                metadata=document,
+                explorer_url=statuses[nft_id].asset_info.get("explorer_url")
+            )
+            for nft_id, cid, document in zip(nft_ids, cids, metadata)
+        ],
+        next_token=page.get("next-token")
+    )
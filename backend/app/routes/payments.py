@@ -9,6 +9,7 @@ from app.models.transaction import Transaction, TransactionType, TransactionStat
 from app.schemas.payment import PaymentResponse
 from app.utils.auth import get_current_active_user
 from app.utils.lora import get_tx_explorer_url
+from app.utils.responses import model_json_response
 from app.services.blockchain import blockchain_service
 from sqlalchemy import select, and_
 
@@ -96,19 +97,19 @@ async def get_payment(
         explorer_url = get_tx_explorer_url(tx_id)
     
     # Convert to response with explorer URL
-    payment_dict = {
-        "id": db_transaction.id,
-        "contract_id": db_transaction.contract_id,
-        "tx_id": db_transaction.tx_id,
-        "type": db_transaction.type,
-        "status": db_transaction.status,
-        "amount": db_transaction.amount,
-        "note": db_transaction.note,
-        "confirmed_round": db_transaction.confirmed_round,
-        "created_at": db_transaction.created_at,
-        "explorer_url": explorer_url,
-        "lora_url": explorer_url
-    }
+    payment_response = PaymentResponse.model_construct(
+        id=db_transaction.id,
+        contract_id=db_transaction.contract_id,
+        tx_id=db_transaction.tx_id,
+        type=db_transaction.type,
+        status=db_transaction.status,
+        amount=db_transaction.amount,
+        note=db_transaction.note,
+        confirmed_round=db_transaction.confirmed_round,
+        created_at=db_transaction.created_at,
+        explorer_url=explorer_url,
+        lora_url=explorer_url
+    )
     
-    return payment_dict
+    return model_json_response(payment_response)
 
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_
 from sqlalchemy.orm import selectinload
@@ -7,9 +7,10 @@ from app.database import get_db
 from app.models.user import User, UserRole
 from app.models.tender import Tender, TenderStatus
 from app.models.application import Application
-from app.schemas.tender import TenderCreate, TenderResponse
+from app.schemas.tender import TenderCreate, TenderResponse, TenderListAdapter
 from app.schemas.application import ApplicationCreate, ApplicationResponse
 from app.utils.auth import get_current_active_user
+from app.utils.cache import tender_cache, cached_json_response
 import hashlib
 import json
 
@@ -50,12 +51,34 @@ async def create_tender(
     db.add(new_tender)
     await db.commit()
     await db.refresh(new_tender)
+    tender_cache.clear()
     
     return new_tender
 
 
+def _tender_response(tender: Tender, app_count: int) -> TenderResponse:
+    """Build a TenderResponse from trusted ORM values without revalidating them"""
+    return TenderResponse.model_construct(
+        id=tender.id,
+        title=tender.title,
+        description=tender.description,
+        location=tender.location,
+        category=tender.category,
+        budget=tender.budget,
+        deadline=tender.deadline,
+        start_date=tender.start_date,
+        duration_months=tender.duration_months,
+        status=tender.status,
+        gov_id=tender.gov_id,
+        blockchain_hash=tender.blockchain_hash,
+        created_at=tender.created_at,
+        applications_count=app_count
+    )
+
+
 @router.get("/", response_model=List[TenderResponse])
 async def list_tenders(
+    request: Request,
     status_filter: Optional[TenderStatus] = Query(None, alias="status"),
     category: Optional[str] = Query(None),
     skip: int = Query(0, ge=0),
@@ -63,7 +86,22 @@ async def list_tenders(
     db: AsyncSession = Depends(get_db)
 ):
     """List all tenders (public endpoint)"""
-    query = select(Tender)
+    cache_key = tender_cache.make_key(
+        "tenders", status=status_filter, category=category, skip=skip, limit=limit
+    )
+    cached = tender_cache.get(cache_key)
+    if cached:
+        return cached_json_response(request, cached)
+    
+    # Applications count per tender, joined in instead of one query per row
+    app_counts = (
+        select(Application.tender_id, func.count(Application.id).label("app_count"))
+        .group_by(Application.tender_id)
+        .subquery()
+    )
+    query = select(Tender, func.coalesce(app_counts.c.app_count, 0)).outerjoin(
+        app_counts, app_counts.c.tender_id == Tender.id
+    )
     
     if status_filter:
         query = query.where(Tender.status == status_filter)
@@ -73,39 +111,22 @@ async def list_tenders(
     query = query.offset(skip).limit(limit).order_by(Tender.created_at.desc())
     
     result = await db.execute(query)
-    tenders = result.scalars().all()
+    tender_responses = [
+        _tender_response(tender, app_count) for tender, app_count in result.all()
+    ]
     
-    # Add applications count
-    tender_responses = []
-    for tender in tenders:
-        app_count_result = await db.execute(
-            select(func.count(Application.id)).where(Application.tender_id == tender.id)
-        )
-        app_count = app_count_result.scalar() or 0
-        tender_dict = {
-        "id": tender.id,
-        "title": tender.title,
-        "description": tender.description,
-        "location": tender.location,
-        "category": tender.category,
-        "budget": tender.budget,
-        "deadline": tender.deadline,
-        "start_date": tender.start_date,
-        "duration_months": tender.duration_months,
-        "status": tender.status,
-        "gov_id": tender.gov_id,
-        "blockchain_hash": tender.blockchain_hash,
-        "created_at": tender.created_at,
-        "applications_count": app_count
-    }
-    tender_responses.append(TenderResponse(**tender_dict))
-    
-    return tender_responses
+    cached = tender_cache.set(cache_key, TenderListAdapter.dump_json(tender_responses))
+    return cached_json_response(request, cached)
 
 
 @router.get("/{tender_id}", response_model=TenderResponse)
-async def get_tender(tender_id: int, db: AsyncSession = Depends(get_db)):
+async def get_tender(tender_id: int, request: Request, db: AsyncSession = Depends(get_db)):
     """Get tender details"""
+    cache_key = tender_cache.make_key("tender", tender_id=tender_id)
+    cached = tender_cache.get(cache_key)
+    if cached:
+        return cached_json_response(request, cached)
+    
     result = await db.execute(select(Tender).where(Tender.id == tender_id))
     tender = result.scalar_one_or_none()
     
@@ -121,23 +142,9 @@ async def get_tender(tender_id: int, db: AsyncSession = Depends(get_db)):
     )
     app_count = app_count_result.scalar() or 0
     
-    tender_dict = {
-        "id": tender.id,
-        "title": tender.title,
-        "description": tender.description,
-        "location": tender.location,
-        "category": tender.category,
-        "budget": tender.budget,
-        "deadline": tender.deadline,
-        "start_date": tender.start_date,
-        "duration_months": tender.duration_months,
-        "status": tender.status,
-        "gov_id": tender.gov_id,
-        "blockchain_hash": tender.blockchain_hash,
-        "created_at": tender.created_at,
-        "applications_count": app_count
-    }
-    return TenderResponse(**tender_dict)
+    tender_response = _tender_response(tender, app_count)
+    cached = tender_cache.set(cache_key, tender_response.model_dump_json().encode())
+    return cached_json_response(request, cached)
 
 
 @router.post("/{tender_id}/apply", response_model=ApplicationResponse, status_code=status.HTTP_201_CREATED)
@@ -196,6 +203,7 @@ async def apply_for_tender(
     db.add(new_application)
     await db.commit()
     await db.refresh(new_application)
+    tender_cache.clear()
     
     return new_application
 
@@ -274,6 +282,7 @@ async def select_contractor(
     
     await db.commit()
     await db.refresh(application)
+    tender_cache.clear()
     
     return application
 
@@ -1,12 +1,33 @@
 from app.schemas.user import UserCreate, UserResponse, UserLogin, Token
 from app.schemas.tender import TenderCreate, TenderResponse, TenderUpdate
 from app.schemas.application import ApplicationCreate, ApplicationResponse
-from app.schemas.contract import ContractResponse, ContractCreate
+from app.schemas.contract import (
+    ContractResponse,
+    ContractCreate,
+    ContractDeployResponse,
+    ContractDetailResponse,
+)
 from app.schemas.milestone import MilestoneCreate, MilestoneResponse, MilestoneUpdate
 from app.schemas.payment import PaymentResponse
-from app.schemas.nft import NFTMintRequest, NFTBurnRequest, NFTResponse
+from app.schemas.nft import (
+    NFTMintRequest,
+    NFTMintBatchRequest,
+    NFTBurnRequest,
+    NFTResponse,
+    NFTMintBatchResponse,
+    NFTGalleryResponse,
+    PinStatusResponse,
+)
 from app.schemas.wallet import WalletBalanceResponse
-from app.schemas.admin import AdminStatsResponse
+from app.schemas.admin import AdminStatsResponse, ReconciliationStatusResponse
+from app.schemas.preflight import PreflightResponse
+from app.schemas.chain_state import (
+    ChainStateResponse,
+    ContractChainStateResponse,
+    ChainMilestoneResponse,
+    MilestoneComparison,
+    ContractChainMilestonesResponse,
+)
 
 __all__ = [
     "UserCreate",
@@ -20,15 +41,28 @@ __all__ = [
     "ApplicationResponse",
     "ContractResponse",
     "ContractCreate",
+    "ContractDeployResponse",
+    "ContractDetailResponse",
     "MilestoneCreate",
     "MilestoneResponse",
     "MilestoneUpdate",
     "PaymentResponse",
     "NFTMintRequest",
+    "NFTMintBatchRequest",
     "NFTBurnRequest",
     "NFTResponse",
+    "NFTMintBatchResponse",
+    "NFTGalleryResponse",
+    "PinStatusResponse",
     "WalletBalanceResponse",
     "AdminStatsResponse",
+    "ReconciliationStatusResponse",
+    "PreflightResponse",
+    "ChainStateResponse",
+    "ContractChainStateResponse",
+    "ChainMilestoneResponse",
+    "MilestoneComparison",
+    "ContractChainMilestonesResponse",
 ]
 
 
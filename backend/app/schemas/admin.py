@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing import List, Optional
 
 
 class AdminStatsResponse(BaseModel):
@@ -12,3 +13,20 @@ class AdminStatsResponse(BaseModel):
     total_spent: float
 
 
+class ContractReconciliationResponse(BaseModel):
+    contract_id: int
+    last_round: int
+    mismatches: int
+
+
+class ReconciliationStatusResponse(BaseModel):
+    passes: int  # passes run by this process
+    last_pass_at: Optional[float]
+    last_round: int
+    lag_rounds: int
+    contracts_checked: int
+    corrected: int
+    mismatches: int
+    errors: int
+    oldest_watermark: Optional[int]  # lowest round any contract is reconciled up to
+    contracts_with_mismatches: List[ContractReconciliationResponse]
@@ -0,0 +1,48 @@
+from pydantic import BaseModel, ConfigDict
+from typing import List, Optional
+from app.schemas.milestone import MilestoneResponse
+
+
+class ChainStateResponse(BaseModel):
+    app_id: int
+    round: int
+    owner: str
+    contractor: str
+    verifier: str
+    total_amount: int  # microAlgos
+    milestone_count: int
+    current_milestone: int
+    paused: bool
+    verifier_update_time: int
+    verifier_timelock: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ContractChainStateResponse(BaseModel):
+    contract_id: int
+    app_id: int
+    state: Optional[ChainStateResponse] = None  # None when algod could not read the app
+
+
+class ChainMilestoneResponse(BaseModel):
+    index: int
+    amount: int  # microAlgos
+    due_date: int  # unix timestamp
+    status: str  # pending / verified / paid
+    proof_hash: Optional[str] = None  # hex, None if no proof recorded
+    verified_round: int
+
+
+class MilestoneComparison(BaseModel):
+    index: int
+    db: Optional[MilestoneResponse] = None  # None if the milestone is only on chain
+    chain: Optional[ChainMilestoneResponse] = None  # None if the box does not exist
+    in_sync: bool
+
+
+class ContractChainMilestonesResponse(BaseModel):
+    contract_id: int
+    app_id: int
+    round: int
+    milestones: List[MilestoneComparison]
@@ -1,7 +1,11 @@
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 from decimal import Decimal
+from typing import List, Optional
 from app.models.contract import ContractStatus
+from app.schemas.milestone import MilestoneResponse
+from app.schemas.payment import PaymentResponse
+from app.schemas.preflight import PreflightResponse
 
 
 class ContractCreate(BaseModel):
@@ -24,3 +28,12 @@ class ContractResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+
+class ContractDeployResponse(ContractResponse):
+    unsigned_txn: Optional[str] = None  # base64 msgpack, for the wallet to sign
+    preflight: Optional[PreflightResponse] = None
+
+
+class ContractDetailResponse(ContractResponse):
+    milestones: List[MilestoneResponse] = []
+    transactions: List[PaymentResponse] = []
@@ -1,5 +1,8 @@
-from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+from app.models.ipfs_pin import PinStatus
+from app.schemas.preflight import PreflightResponse
 
 
 class NFTMintRequest(BaseModel):
@@ -8,6 +11,12 @@ class NFTMintRequest(BaseModel):
     metadata: dict | None = None
 
 
+class NFTMintBatchRequest(BaseModel):
+    contract_id: int
+    milestone_indexes: List[int] | None = None  # default: every milestone of the contract
+    metadata: dict | None = None
+
+
 class NFTBurnRequest(BaseModel):
     nft_id: int
     contract_id: int
@@ -23,6 +32,57 @@ class NFTResponse(BaseModel):
     explorer_url: Optional[str] = None
     lora_url: Optional[str] = None
     ipfs_cid: Optional[str] = None
+    pin_status: Optional[str] = None  # pending / pinned / failed
     creator: Optional[str] = None
     total: Optional[int] = None
+    unsigned_txn: Optional[str] = None  # base64 msgpack, for the wallet to sign
+    preflight: Optional[PreflightResponse] = None
+
+
+class PinStatusResponse(BaseModel):
+    cid: str
+    status: PinStatus
+    attempts: int
+    last_error: Optional[str]
+    pinned_at: Optional[datetime]
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class NFTMintBatchItem(BaseModel):
+    milestone_index: int
+    asset_name: str
+    metadata_url: str
+    ipfs_cid: str
+    pin_status: str
+    tx_id: str  # final once signed: group ids are already assigned
+    group: int  # index into NFTMintBatchResponse.groups
+
+
+class NFTMintGroup(BaseModel):
+    unsigned_txns: List[str]  # base64 msgpack, in group order
+    preflight: Optional[PreflightResponse] = None
+
+
+class NFTMintBatchResponse(BaseModel):
+    contract_id: int
+    nfts: List[NFTMintBatchItem]
+    groups: List[NFTMintGroup]
+
+
+class NFTGalleryItem(BaseModel):
+    nft_id: int
+    asset_name: str | None
+    amount: int
+    contract_id: int  # 0 if no contract references the asset
+    metadata_url: str | None
+    ipfs_cid: str | None
+    metadata: Optional[Dict[str, Any]] = None  # None if it could not be resolved
+    explorer_url: Optional[str] = None
+
 
+class NFTGalleryResponse(BaseModel):
+    address: str
+    nfts: List[NFTGalleryItem]
+    next_token: Optional[str] = None  # pass as ?next= for the following page
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class PreflightResponse(BaseModel):
+    would_succeed: Optional[bool]
+    opcode_cost: int = 0
+    failure_reason: Optional[str] = None
+    failed_at: Optional[List[int]] = None
+    round: Optional[int] = None
+    cached: bool = False
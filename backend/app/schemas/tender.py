@@ -1,4 +1,5 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from typing import List
 from datetime import datetime
 from decimal import Decimal
 from app.models.tender import TenderStatus
@@ -43,3 +44,6 @@ class TenderResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+
+# Pre-built serializer for list responses of already-validated models
+TenderListAdapter = TypeAdapter(List[TenderResponse])
@@ -0,0 +1,158 @@
+"""
+Typed, round-cached reads of FairLens application state: global state and
+milestone boxes
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+from algosdk.v2client import algod
+import asyncio
+import base64
+import logging
+from app.config import settings
+from app.contracts.global_state import FairLensGlobalState, decode_global_state
+from app.contracts.milestone_box import MilestoneBox, MILESTONE_BOX_PREFIX, milestone_index_from_box_name
+from app.utils.node_responses import as_dict
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ChainMilestones:
+    app_id: int
+    round: int
+    milestones: Dict[int, MilestoneBox]  # keyed by milestone index
+
+
+class AppStateService:
+    """
+    Read FairLens global state and milestone boxes, cached per (app_id, round)
+
+    State cannot change within a round, so a read for an app already fetched
+    at the current round is served from memory. Each read costs one algod
+    status call to learn the round; a bulk read shares it across all apps and
+    fetches the missing ones concurrently.
+    """
+
+    def __init__(
+        self,
+        algod_client: Optional[algod.AlgodClient] = None,
+        max_concurrency: int = settings.APP_STATE_MAX_CONCURRENCY,
+        max_entries: int = 4096
+    ):
+        self._algod_client = algod_client
+        self.max_concurrency = max_concurrency
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[int, int], FairLensGlobalState]" = OrderedDict()
+        self._milestone_entries: "OrderedDict[Tuple[int, int], ChainMilestones]" = OrderedDict()
+
+    @property
+    def algod_client(self) -> algod.AlgodClient:
+        if self._algod_client is None:
+            from app.services.blockchain import blockchain_service
+            self._algod_client = blockchain_service.algod_client
+        return self._algod_client
+
+    async def current_round(self) -> int:
+        """Latest round algod has seen"""
+        status = as_dict(await asyncio.to_thread(self.algod_client.status))
+        return status.get("last-round", 0)
+
+    async def _fetch(self, app_id: int, round: int) -> FairLensGlobalState:
+        key = (app_id, round)
+        cached = self._entries.get(key)
+        if cached is not None:
+            self._entries.move_to_end(key)
+            return cached
+
+        app_info = as_dict(await asyncio.to_thread(self.algod_client.application_info, app_id))
+        state = decode_global_state(app_id, round, app_info.get("params", {}).get("global-state", []))
+
+        self._remember(self._entries, key, state)
+        return state
+
+    def _remember(self, entries: "OrderedDict[Tuple[int, int], Any]", key: Tuple[int, int], value: Any) -> None:
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    async def get_state(self, app_id: int) -> FairLensGlobalState:
+        """
+        Get the decoded global state of one application
+
+        Args:
+            app_id: Application id
+
+        Returns:
+            FairLensGlobalState at the current round
+        """
+        return await self._fetch(app_id, await self.current_round())
+
+    async def get_states(self, app_ids: Iterable[int]) -> Dict[int, Optional[FairLensGlobalState]]:
+        """
+        Get the decoded global state of many applications at one round
+
+        Args:
+            app_ids: Application ids; duplicates are fetched once
+
+        Returns:
+            State per app id, or None for apps that could not be read
+            (deleted, wrong network, algod error)
+        """
+        unique_ids = list(dict.fromkeys(app_ids))
+        if not unique_ids:
+            return {}
+
+        round = await self.current_round()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch(app_id: int) -> Optional[FairLensGlobalState]:
+            async with semaphore:
+                try:
+                    return await self._fetch(app_id, round)
+                except Exception as e:
+                    logger.warning(f"Error reading state of app {app_id}: {e}")
+                    return None
+
+        states = await asyncio.gather(*(fetch(app_id) for app_id in unique_ids))
+        return dict(zip(unique_ids, states))
+
+    async def get_milestones(self, app_id: int) -> ChainMilestones:
+        """
+        Get the decoded milestone boxes of one application
+
+        The box list is read once, then every "m_" box is fetched concurrently.
+
+        Args:
+            app_id: Application id
+
+        Returns:
+            ChainMilestones at the current round
+        """
+        round = await self.current_round()
+        key = (app_id, round)
+        cached = self._milestone_entries.get(key)
+        if cached is not None:
+            self._milestone_entries.move_to_end(key)
+            return cached
+
+        listing = as_dict(await asyncio.to_thread(self.algod_client.application_boxes, app_id))
+        names = [base64.b64decode(box["name"]) for box in listing.get("boxes", [])]
+        names = [name for name in names if name.startswith(MILESTONE_BOX_PREFIX)]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch(name: bytes) -> Tuple[int, MilestoneBox]:
+            async with semaphore:
+                box = as_dict(await asyncio.to_thread(self.algod_client.application_box_by_name, app_id, name))
+            return milestone_index_from_box_name(name), MilestoneBox.decode(base64.b64decode(box["value"]))
+
+        boxes = await asyncio.gather(*(fetch(name) for name in names))
+        milestones = ChainMilestones(app_id=app_id, round=round, milestones=dict(sorted(boxes)))
+        self._remember(self._milestone_entries, key, milestones)
+        return milestones
+
+
+# Global instance
+app_state_service = AppStateService()
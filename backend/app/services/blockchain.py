@@ -2,6 +2,7 @@ import algosdk
 from algosdk import transaction, account, mnemonic
 from algosdk.v2client import algod, indexer
 from typing import Optional, Dict, Any
+import asyncio
 import json
 import logging
 import base64
@@ -12,20 +13,22 @@ from app.utils.lora import (
     get_asset_explorer_url,
     get_account_explorer_url
 )
+from app.utils.outbound_metrics import InstrumentedClient
 
 logger = logging.getLogger(__name__)
 
 
 class BlockchainService:
     def __init__(self):
-        self.algod_client = algod.AlgodClient(
+        # Clients are wrapped so every call is timed into the outbound_* metrics
+        self.algod_client = InstrumentedClient(algod.AlgodClient(
             settings.ALGOD_API_KEY,
             settings.ALGOD_API_URL
-        )
-        self.indexer_client = indexer.IndexerClient(
+        ), "algod")
+        self.indexer_client = InstrumentedClient(indexer.IndexerClient(
             settings.ALGOD_INDEXER_KEY,
             settings.ALGOD_INDEXER_URL
-        ) if settings.ALGOD_INDEXER_KEY else None
+        ), "indexer") if settings.ALGOD_INDEXER_KEY else None
         
         # Initialize account from mnemonic if provided
         self.account = None
@@ -290,7 +293,8 @@ class BlockchainService:
     async def get_asset_info(self, asset_id: int) -> Dict[str, Any]:
         """Get asset information with Lora explorer URL"""
         try:
-            asset_info_raw = self.algod_client.asset_info(asset_id)
+            # algod's client is synchronous; keep the request off the event loop
+            asset_info_raw = await asyncio.to_thread(self.algod_client.asset_info, asset_id)
             # Convert bytes to dict if needed
             if isinstance(asset_info_raw, bytes):
                 asset_info = json.loads(asset_info_raw.decode('utf-8'))
@@ -1,14 +1,28 @@
 """
 Contract Service - Wrapper for FairLens Contract
-This service provides a simplified interface to the PyTeal contract
+This service provides a simplified interface to the PyTeal contract and
+builds the unsigned application calls it expects
 """
 
-from app.contracts.fairlens_contract import FairLensContract
-from typing import List, Dict, Any
+from algosdk import transaction
+from algosdk.v2client import algod
+from app.contracts.fairlens_contract import (
+    FairLensContract,
+    MAX_RELEASE_BATCH,
+    VERIFY_MILESTONE_APP_CALLS,
+)
+from app.contracts.milestone_box import milestone_box_name, PROOF_HASH_SIZE
+from app.contracts import methods
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Protocol limits for a single application call
+MAX_BOX_REFERENCES = 8  # MaxAppTotalTxnReferences
+MAX_GROUP_SIZE = 16  # MaxTxGroupSize
+MIN_TXN_FEE = 1000  # microAlgos, per transaction including inner ones
+
 
 def create_fairlens_contract(
     owner_address: str,
@@ -36,11 +50,107 @@ def create_fairlens_contract(
     )
 
 
+class TransactionGroupBuilder:
+    """
+    Collects unsigned transactions for one atomic group
+    
+    Suggested params are fetched from algod once, on the first transaction,
+    and shared by every transaction in the group.
+    """
+    
+    def __init__(self, algod_client: algod.AlgodClient):
+        self.algod_client = algod_client
+        self.transactions: List[transaction.Transaction] = []
+        self._suggested_params: Optional[transaction.SuggestedParams] = None
+    
+    @property
+    def suggested_params(self) -> transaction.SuggestedParams:
+        if self._suggested_params is None:
+            self._suggested_params = self.algod_client.suggested_params()
+        return self._suggested_params
+    
+    def add_app_call(
+        self,
+        sender: str,
+        app_id: int,
+        app_args: List[bytes],
+        boxes: Optional[List[bytes]] = None,
+        accounts: Optional[List[str]] = None,
+        inner_txns: int = 0,
+        note: Optional[bytes] = None
+    ) -> transaction.ApplicationNoOpTxn:
+        """
+        Append a NoOp application call
+        
+        Args:
+            sender: Address that signs the call
+            app_id: Application to call
+            app_args: Encoded application args
+            boxes: Names of this app's boxes the call reads or writes
+            accounts: Foreign accounts the call needs (e.g. inner payment receivers)
+            inner_txns: Inner transactions the call issues with fee 0; their
+                fees are added to this call's fee
+            note: Optional note, e.g. to keep otherwise identical calls distinct
+        
+        Returns:
+            The unsigned transaction
+        """
+        if len(self.transactions) >= MAX_GROUP_SIZE:
+            raise ValueError(f"An atomic group holds at most {MAX_GROUP_SIZE} transactions")
+        if len(boxes or []) + len(accounts or []) > MAX_BOX_REFERENCES:
+            raise ValueError(f"A call can carry at most {MAX_BOX_REFERENCES} references")
+        
+        params = self.suggested_params
+        txn = transaction.ApplicationNoOpTxn(
+            sender=sender,
+            sp=params,
+            index=app_id,
+            app_args=app_args,
+            accounts=accounts,
+            boxes=[(0, name) for name in boxes or []],
+            note=note
+        )
+        # Fee pooling: the outer call pays for its inner transactions
+        txn.fee += inner_txns * (params.min_fee or MIN_TXN_FEE)
+        self.transactions.append(txn)
+        return txn
+    
+    def build(self) -> List[transaction.Transaction]:
+        """Return the transactions, sharing a group id when there is more than one"""
+        if len(self.transactions) > 1:
+            return transaction.assign_group_id(self.transactions)
+        return list(self.transactions)
+
+
 class ContractService:
     """Service for contract operations"""
     
-    def __init__(self, contract: FairLensContract):
+    def __init__(
+        self,
+        contract: FairLensContract,
+        app_id: int = 0,
+        algod_client: Optional[algod.AlgodClient] = None
+    ):
         self.contract = contract
+        self.app_id = app_id
+        self._algod_client = algod_client
+    
+    @property
+    def algod_client(self) -> algod.AlgodClient:
+        if self._algod_client is None:
+            from app.services.blockchain import blockchain_service
+            self._algod_client = blockchain_service.algod_client
+        return self._algod_client
+    
+    def new_group(self) -> TransactionGroupBuilder:
+        """
+        Start an atomic group that several builders below can append to
+        
+        Every builder takes an optional `group`. Passing the same group to
+        each step of a workflow shares one suggested-params fetch; without it
+        each builder starts (and returns) its own group.
+        """
+        return TransactionGroupBuilder(self.algod_client)
     
     def compile(self) -> Dict[str, Any]:
         """
@@ -61,8 +171,9 @@ class ContractService:
         self, 
         milestone_index: int, 
         amount: int, 
-        due_date: int
-    ) -> bytes:
+        due_date: int,
+        group: Optional[TransactionGroupBuilder] = None
+    ) -> transaction.ApplicationNoOpTxn:
         """
         Create transaction to add a milestone to the contract
         
@@ -70,101 +181,257 @@ class ContractService:
             milestone_index: Index of the milestone
             amount: Amount in microAlgos
             due_date: Due date timestamp
+            group: Group to append to (a new one if omitted)
             
         Returns:
-            Transaction bytes for adding milestone
+            Unsigned application call, sent by the owner
         """
-        # Method ID 1 for add_milestone
-        method_id = 1
-        return self._create_method_call(method_id, [milestone_index, amount, due_date])
+        return self._create_method_call(
+            methods.ADD_MILESTONE,
+            [milestone_index, amount, due_date],
+            sender=self.contract.owner_address,
+            group=group,
+            boxes=[milestone_box_name(milestone_index)]
+        )
+    
+    def add_milestones(
+        self,
+        milestones: List[Tuple[int, int, int]],
+        group: Optional[TransactionGroupBuilder] = None
+    ) -> List[transaction.Transaction]:
+        """
+        Create transactions to add many milestones with the batch method
+        
+        Each call can reference at most MAX_BOX_REFERENCES boxes, so larger
+        batches are split into several calls that must be submitted together
+        as one atomic group.
+        
+        Args:
+            milestones: List of (milestone_index, amount in microAlgos, due_date timestamp)
+            group: Group to append to (a new one if omitted)
+            
+        Returns:
+            The whole group, with a shared group id when it has several calls
+        """
+        if not milestones:
+            raise ValueError("At least one milestone is required")
+        
+        chunks = [
+            milestones[i:i + MAX_BOX_REFERENCES]
+            for i in range(0, len(milestones), MAX_BOX_REFERENCES)
+        ]
+        if len(chunks) > MAX_GROUP_SIZE:
+            raise ValueError(
+                f"At most {MAX_BOX_REFERENCES * MAX_GROUP_SIZE} milestones fit in one atomic group"
+            )
+        
+        group = group or self.new_group()
+        for chunk in chunks:
+            self._create_method_call(
+                methods.ADD_MILESTONES,
+                [list(chunk)],
+                sender=self.contract.owner_address,
+                group=group,
+                boxes=[milestone_box_name(index) for index, _, _ in chunk]
+            )
+        return group.build()
     
     def verify_milestone(
         self, 
         milestone_index: int, 
         signature: bytes, 
-        message: bytes,
-        proof_hash: bytes = b""
-    ) -> bytes:
+        proof_hash: bytes = b"",
+        group: Optional[TransactionGroupBuilder] = None
+    ) -> List[transaction.Transaction]:
         """
-        Create transaction to verify a milestone
+        Create the transaction group to verify a milestone
+        
+        Ed25519Verify needs more opcode budget than one app call has, so the
+        verify call is followed by opup calls that pool their budget with it.
         
         Args:
             milestone_index: Index of the milestone
             signature: Ed25519 signature (64 bytes)
-            message: Verification message
-            proof_hash: SHA256 hash of proof document (optional)
+            proof_hash: SHA256 hash of proof document (optional, sent as zeros if omitted)
+            group: Group to append to (a new one if omitted)
             
         Returns:
-            Transaction bytes for verifying milestone
+            The whole group, sent by the verifier
         """
-        # Method ID 2 for verify_milestone
-        method_id = 2
-        args = [milestone_index, signature, message]
-        if proof_hash:
-            args.append(proof_hash)
-        return self._create_method_call(method_id, args)
+        group = group or self.new_group()
+        self._create_method_call(
+            methods.VERIFY_MILESTONE,
+            [milestone_index, signature, proof_hash or bytes(PROOF_HASH_SIZE)],
+            sender=self.contract.verifier_address,
+            group=group,
+            boxes=[milestone_box_name(milestone_index)]
+        )
+        for padding in range(1, VERIFY_MILESTONE_APP_CALLS):
+            # Notes keep the otherwise identical opup calls from sharing a txid
+            self._create_method_call(
+                methods.OPUP,
+                [],
+                sender=self.contract.verifier_address,
+                group=group,
+                note=f"opup {padding}".encode()
+            )
+        return group.build()
     
-    def release_payment(self, milestone_index: int) -> bytes:
+    def release_payment(
+        self,
+        milestone_index: int,
+        group: Optional[TransactionGroupBuilder] = None
+    ) -> transaction.ApplicationNoOpTxn:
         """
         Create transaction to release payment for a milestone
         
         Args:
             milestone_index: Index of the milestone
+            group: Group to append to (a new one if omitted)
             
         Returns:
-            Transaction bytes for releasing payment
+            Unsigned application call, sent by the owner, whose fee covers the
+            inner payment
         """
-        # Method ID 3 for release_payment
-        method_id = 3
-        return self._create_method_call(method_id, [milestone_index])
+        return self._create_method_call(
+            methods.RELEASE_PAYMENT,
+            [milestone_index],
+            sender=self.contract.owner_address,
+            group=group,
+            boxes=[milestone_box_name(milestone_index)],
+            accounts=[self.contract.contractor_address],
+            inner_txns=1
+        )
     
-    def emergency_pause(self) -> bytes:
+    def release_batch(
+        self,
+        first_index: int,
+        end_index: int,
+        group: Optional[TransactionGroupBuilder] = None
+    ) -> transaction.ApplicationNoOpTxn:
+        """
+        Create transaction to release payment for every verified milestone in a range
+        
+        The contract pays each verified milestone with its own inner payment in
+        one inner group, so the outer transaction pools the fees: one for
+        itself plus one per milestone in the range (milestones that are not
+        verified are skipped, leaving their share unused).
+        
+        Args:
+            first_index: First milestone index to pay
+            end_index: Milestone index to stop before (exclusive)
+            group: Group to append to (a new one if omitted)
+            
+        Returns:
+            Unsigned application call, sent by the owner
+        """
+        count = end_index - first_index
+        if count < 1 or count > MAX_RELEASE_BATCH:
+            raise ValueError(f"A batch must cover between 1 and {MAX_RELEASE_BATCH} milestones")
+        
+        return self._create_method_call(
+            methods.RELEASE_BATCH,
+            [first_index, end_index],
+            sender=self.contract.owner_address,
+            group=group,
+            boxes=[milestone_box_name(index) for index in range(first_index, end_index)],
+            accounts=[self.contract.contractor_address],
+            inner_txns=count
+        )
+    
+    def emergency_pause(
+        self,
+        group: Optional[TransactionGroupBuilder] = None
+    ) -> transaction.ApplicationNoOpTxn:
         """
         Create transaction to pause the contract
         
+        Args:
+            group: Group to append to (a new one if omitted)
+        
         Returns:
-            Transaction bytes for emergency pause
+            Unsigned application call, sent by the owner
         """
-        # Method ID 4 for emergency_pause
-        method_id = 4
-        return self._create_method_call(method_id, [])
+        return self._create_method_call(
+            methods.EMERGENCY_PAUSE, [], sender=self.contract.owner_address, group=group
+        )
     
-    def resume_contract(self) -> bytes:
+    def resume_contract(
+        self,
+        group: Optional[TransactionGroupBuilder] = None
+    ) -> transaction.ApplicationNoOpTxn:
         """
         Create transaction to resume the contract
         
+        Args:
+            group: Group to append to (a new one if omitted)
+        
         Returns:
-            Transaction bytes for resuming contract
+            Unsigned application call, sent by the owner
         """
-        # Method ID 5 for resume_contract
-        method_id = 5
-        return self._create_method_call(method_id, [])
+        return self._create_method_call(
+            methods.RESUME_CONTRACT, [], sender=self.contract.owner_address, group=group
+        )
     
-    def update_verifier(self, new_verifier_address: str) -> bytes:
+    def update_verifier(
+        self,
+        new_verifier_address: str,
+        group: Optional[TransactionGroupBuilder] = None
+    ) -> transaction.ApplicationNoOpTxn:
         """
         Create transaction to update the verifier address
         
         Args:
             new_verifier_address: New verifier address
+            group: Group to append to (a new one if omitted)
             
         Returns:
-            Transaction bytes for updating verifier
+            Unsigned application call, sent by the owner
         """
-        # Method ID 6 for update_verifier
-        method_id = 6
-        return self._create_method_call(method_id, [new_verifier_address.encode()])
+        return self._create_method_call(
+            methods.UPDATE_VERIFIER,
+            [new_verifier_address],
+            sender=self.contract.owner_address,
+            group=group
+        )
     
-    def _create_method_call(self, method_id: int, args: List[Any]) -> bytes:
+    def _create_method_call(
+        self,
+        signature: str,
+        args: Sequence[Any],
+        sender: str,
+        group: Optional[TransactionGroupBuilder] = None,
+        boxes: Optional[List[bytes]] = None,
+        accounts: Optional[List[str]] = None,
+        inner_txns: int = 0,
+        note: Optional[bytes] = None
+    ) -> transaction.ApplicationNoOpTxn:
         """
         Helper method to create a method call transaction
         
         Args:
-            method_id: Method identifier
-            args: List of arguments
+            signature: ARC-4 method signature from app.contracts.methods
+            args: Method arguments, ABI-encoded against the signature
+            sender: Address that signs the call
+            group: Group to append to (a new one if omitted)
+            boxes: Box names the call reads or writes
+            accounts: Foreign accounts the call needs
+            inner_txns: Inner transactions whose fees the call pays
+            note: Optional transaction note
             
         Returns:
-            Transaction bytes
+            Unsigned application call
         """
-        # This is a simplified implementation
-        # In a real implementation, this would create an actual Algorand transaction
-        return f"method_{method_id}_call".encode()
\ No newline at end of file
+        if not self.app_id:
+            raise ValueError("ContractService needs an app_id to build application calls")
+        
+        group = group or self.new_group()
+        return group.add_app_call(
+            sender=sender,
+            app_id=self.app_id,
+            app_args=methods.encode_method_args(signature, args),
+            boxes=boxes,
+            accounts=accounts,
+            inner_txns=inner_txns,
+            note=note
+        )
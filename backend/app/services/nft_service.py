@@ -6,12 +6,13 @@ Reference: https://github.com/algorandfoundation/ARCs/blob/main/ARCs/arc-0003.md
 import algosdk
 from algosdk import transaction, account, mnemonic
 from algosdk.v2client import algod
-from typing import Optional, Dict, Any
-import json
+from typing import Optional, Dict, Any, List
 import hashlib
 import logging
 from app.config import settings
 from app.services.blockchain import blockchain_service
+from app.services.contract_service import MAX_GROUP_SIZE
+from app.utils.cid import canonical_json, compute_cid
 from app.utils.ipfs import ipfs_service
 from app.utils.lora import get_asset_explorer_url, get_tx_explorer_url
 
@@ -59,25 +60,22 @@ class NFTService:
             }
         )
         
-        # Upload to IPFS
-        cid = ipfs_service.upload_json(metadata)
+        # One canonical serialization: these bytes are hashed, addressed and uploaded
+        metadata_bytes = canonical_json(metadata)
+        cid = compute_cid(metadata_bytes)
         
-        if not cid:
-            # Fallback: use placeholder URL
-            logger.warning("IPFS upload failed, using placeholder URL")
-            ipfs_url = f"https://fairlens.io/metadata/{contract_id}"
-        else:
-            # Get ARC-3 compliant URL
-            ipfs_url = ipfs_service.get_arc3_url(cid)
+        # The CID is known locally, so the URL does not wait for the upload;
+        # callers queue metadata_bytes on the pin outbox
+        ipfs_url = ipfs_service.get_arc3_url(cid)
         
-        # Calculate metadata hash (sha256 of metadata JSON)
-        metadata_json = json.dumps(metadata, sort_keys=True)
-        metadata_hash = hashlib.sha256(metadata_json.encode()).digest()
+        # ARC-3 metadata hash: sha256 of the metadata file
+        metadata_hash = hashlib.sha256(metadata_bytes).digest()
         
         return {
             "metadata": metadata,
             "ipfs_url": ipfs_url,
             "ipfs_cid": cid,
+            "metadata_bytes": metadata_bytes,
             "metadata_hash": metadata_hash.hex(),
             "metadata_hash_bytes": metadata_hash
         }
@@ -89,7 +87,8 @@ class NFTService:
         unit_name: str,
         metadata: Dict[str, Any],
         metadata_url: str,
-        metadata_hash: bytes
+        metadata_hash: bytes,
+        params: Optional[transaction.SuggestedParams] = None
     ) -> Dict[str, Any]:
         """
         Mint an ARC-3 compliant NFT
@@ -101,12 +100,13 @@ class NFTService:
             metadata: Metadata dictionary
             metadata_url: IPFS URL with #arc3 suffix
             metadata_hash: SHA-256 hash of metadata
+            params: Suggested params to reuse (fetched from algod if omitted)
         
         Returns:
             Transaction details and asset ID
         """
         try:
-            params = self.algod_client.suggested_params()
+            params = params or self.algod_client.suggested_params()
             
             # Create ASA transaction (ARC-3 NFT)
             txn = transaction.AssetCreateTxn(
@@ -136,6 +136,36 @@ class NFTService:
             logger.error(f"Error creating NFT transaction: {e}")
             raise
     
+    async def mint_nft_batch(
+        self,
+        sender_address: str,
+        items: List[Dict[str, Any]]
+    ) -> List[List[transaction.AssetCreateTxn]]:
+        """
+        Build asset-create transactions for several NFTs as atomic groups
+        
+        Suggested params are fetched once for the whole batch.
+        
+        Args:
+            sender_address: Address of the sender (will own the NFTs)
+            items: Per NFT: name, unit_name, metadata, metadata_url, metadata_hash
+        
+        Returns:
+            Unsigned transactions in groups of at most MAX_GROUP_SIZE, with
+            group ids assigned (txids are final)
+        """
+        params = self.algod_client.suggested_params()
+        txns = []
+        for item in items:
+            result = await self.mint_nft(sender_address=sender_address, params=params, **item)
+            txns.append(result["unsigned_txn"])
+        
+        groups = [txns[start:start + MAX_GROUP_SIZE] for start in range(0, len(txns), MAX_GROUP_SIZE)]
+        for group in groups:
+            if len(group) > 1:
+                transaction.assign_group_id(group)
+        return groups
+    
     async def get_nft_info(self, asset_id: int) -> Dict[str, Any]:
         """
         Get NFT information from blockchain
@@ -0,0 +1,204 @@
+"""
+Cached NFT status lookups
+
+An NFT's asset params only change through asset config (or destroy)
+transactions, so cached entries are kept until such a transaction for the
+asset is observed. An observer scans the indexer for asset config
+transactions since its round watermark and drops the entries they touch.
+Until the observer has run (no indexer, or the observer disabled) nothing is
+observed, and entries fall back to NFT_STATUS_FALLBACK_TTL_SECONDS.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
+import logging
+import time
+from app.config import settings
+from app.models.contract import Contract
+from app.utils.node_responses import as_dict
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class NFTStatusEntry:
+    asset_info: Dict[str, Any]  # as returned by NFTService.get_nft_info
+    contract_id: int  # 0 if no contract references the asset
+    cached_at: float
+
+
+class NFTStatusCache:
+    """Asset params and contract mapping per NFT, invalidated by observed reconfigurations"""
+
+    def __init__(
+        self,
+        indexer_client: Optional[Any] = None,
+        fallback_ttl_seconds: int = settings.NFT_STATUS_FALLBACK_TTL_SECONDS,
+        max_concurrency: int = settings.NFT_STATUS_MAX_CONCURRENCY,
+        max_entries: int = 4096
+    ):
+        self._indexer_client = indexer_client
+        self.fallback_ttl_seconds = fallback_ttl_seconds
+        self.max_concurrency = max_concurrency
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, NFTStatusEntry]" = OrderedDict()
+        self.watermark: Optional[int] = None  # last round scanned for asset config transactions
+
+    @property
+    def indexer_client(self) -> Optional[Any]:
+        if self._indexer_client is None:
+            from app.services.blockchain import blockchain_service
+            return blockchain_service.indexer_client
+        return self._indexer_client
+
+    async def get(self, db: AsyncSession, nft_id: int) -> NFTStatusEntry:
+        """
+        Get an NFT's asset info and contract, from cache when possible
+
+        Args:
+            db: Database session, used on a cache miss
+            nft_id: Asset id
+
+        Returns:
+            NFTStatusEntry
+        """
+        entries = await self.get_many(db, [nft_id])
+        if nft_id not in entries:
+            raise LookupError(f"Asset {nft_id} not found")
+        return entries[nft_id]
+
+    def _cached(self, nft_id: int) -> Optional[NFTStatusEntry]:
+        entry = self._entries.get(nft_id)
+        if entry is None:
+            return None
+        if self.watermark is None and time.monotonic() - entry.cached_at > self.fallback_ttl_seconds:
+            return None
+        self._entries.move_to_end(nft_id)
+        return entry
+
+    async def get_many(self, db: AsyncSession, nft_ids: Iterable[int]) -> Dict[int, NFTStatusEntry]:
+        """
+        Get several NFTs; misses are read from algod at most max_concurrency at a
+        time, with one contract query
+
+        Args:
+            db: Database session, used on cache misses
+            nft_ids: Asset ids
+
+        Returns:
+            Entry per asset id; assets algod could not return are left out
+        """
+        from app.services.nft_service import nft_service
+
+        entries: Dict[int, NFTStatusEntry] = {}
+        misses = []
+        for nft_id in dict.fromkeys(nft_ids):
+            entry = self._cached(nft_id)
+            if entry is None:
+                misses.append(nft_id)
+            else:
+                entries[nft_id] = entry
+        if not misses:
+            return entries
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch(nft_id: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await nft_service.get_nft_info(nft_id)
+
+        infos = await asyncio.gather(*(fetch(nft_id) for nft_id in misses), return_exceptions=True)
+        result = await db.execute(select(Contract.nft_id, Contract.id).where(Contract.nft_id.in_(misses)))
+        contract_ids: Dict[int, int] = {}
+        for nft_id, contract_id in result.all():
+            contract_ids.setdefault(nft_id, contract_id)
+
+        now = time.monotonic()
+        for nft_id, asset_info in zip(misses, infos):
+            if isinstance(asset_info, BaseException):
+                if len(misses) == 1:
+                    raise asset_info
+                logger.warning(f"Could not read asset {nft_id}: {asset_info}")
+                continue
+            entry = NFTStatusEntry(asset_info=asset_info, contract_id=contract_ids.get(nft_id, 0), cached_at=now)
+            self._entries[nft_id] = entry
+            entries[nft_id] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entries
+
+    def invalidate(self, nft_id: int) -> None:
+        """Drop one NFT, e.g. after a contract's nft_id is changed"""
+        self._entries.pop(nft_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def observe_once(self) -> int:
+        """
+        Scan asset config transactions since the watermark and invalidate touched NFTs
+
+        The first scan only sets the watermark and clears the cache, since
+        entries cached before it cannot be checked.
+
+        Returns:
+            Number of entries invalidated
+        """
+        indexer_client = self.indexer_client
+        if indexer_client is None:
+            return 0
+
+        health = as_dict(await asyncio.to_thread(indexer_client.health))
+        latest = health.get("round", 0)
+        if self.watermark is None:
+            self.watermark = latest
+            self.clear()
+            return 0
+        if latest <= self.watermark:
+            return 0
+
+        invalidated = 0
+        next_page = None
+        while True:
+            response = as_dict(await asyncio.to_thread(
+                indexer_client.search_transactions,
+                txn_type="acfg",
+                min_round=self.watermark + 1,
+                max_round=latest,
+                limit=1000,
+                next_page=next_page,
+            ))
+            for txn in response.get("transactions", []):
+                asset_id = txn.get("asset-config-transaction", {}).get("asset-id")
+                if asset_id in self._entries:
+                    self.invalidate(asset_id)
+                    invalidated += 1
+            next_page = response.get("next-token")
+            if not next_page or not response.get("transactions"):
+                break
+
+        self.watermark = latest
+        return invalidated
+
+    async def run_forever(self, interval_seconds: int) -> None:
+        """Observe every interval_seconds until cancelled; returns at once without an indexer"""
+        if self.indexer_client is None:
+            logger.info("No indexer configured; NFT status cache uses its fallback TTL")
+            return
+
+        while True:
+            try:
+                await self.observe_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"NFT status observer failed: {e}")
+            await asyncio.sleep(interval_seconds)
+
+
+# Global instance
+nft_status_cache = NFTStatusCache()
@@ -0,0 +1,166 @@
+"""
+Durable outbox for IPFS pinning
+
+Request handlers only enqueue content under its locally computed CID, in the
+same database transaction as the rest of their writes. A background worker
+uploads due rows with bounded concurrency and retries failures with
+exponential backoff until IPFS_PIN_MAX_ATTEMPTS is reached.
+
+Rows are claimed with a conditional UPDATE on their attempt counter, so
+several uvicorn workers can poll the same table without uploading a row twice.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
+import logging
+from app.config import settings
+from app.models.ipfs_pin import IPFSPin, PinStatus
+from app.utils.ipfs import IPFSService, ipfs_service
+from app.utils.sql import dialect_insert
+
+logger = logging.getLogger(__name__)
+
+
+class PinOutbox:
+    """Enqueue content for pinning and work the queue"""
+
+    def __init__(
+        self,
+        ipfs: IPFSService = ipfs_service,
+        concurrency: int = settings.IPFS_PIN_CONCURRENCY,
+        max_attempts: int = settings.IPFS_PIN_MAX_ATTEMPTS,
+        batch_size: int = 20,
+        backoff_seconds: float = 5.0,
+        lease_seconds: float = 120.0
+    ):
+        self.ipfs = ipfs
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.batch_size = batch_size
+        self.backoff_seconds = backoff_seconds
+        self.lease_seconds = lease_seconds  # a claimed row is retried after this if its worker died
+
+    async def enqueue(self, db: AsyncSession, content: bytes, cid: str) -> IPFSPin:
+        """
+        Queue content for pinning unless its CID is already queued or pinned
+
+        The caller commits. A CID that previously failed is queued again.
+
+        Args:
+            db: Database session
+            content: Exact bytes to pin
+            cid: Locally computed CID of content
+
+        Returns:
+            The IPFSPin row for the CID
+        """
+        pin = await self.get(db, cid)
+        if pin is None:
+            # Another request may insert the same CID between the read and the
+            # insert; its row is used instead of failing on the unique constraint
+            await db.execute(
+                dialect_insert(db, IPFSPin)
+                .values(cid=cid, content=content, status=PinStatus.PENDING, attempts=0)
+                .on_conflict_do_nothing(index_elements=[IPFSPin.cid])
+            )
+            pin = await self.get(db, cid)
+        elif pin.status == PinStatus.FAILED:
+            pin.status = PinStatus.PENDING
+            pin.attempts = 0
+            pin.next_attempt_at = datetime.now(timezone.utc)
+        return pin
+
+    async def get(self, db: AsyncSession, cid: str) -> Optional[IPFSPin]:
+        result = await db.execute(select(IPFSPin).where(IPFSPin.cid == cid))
+        return result.scalar_one_or_none()
+
+    async def _claim(self, db: AsyncSession) -> List[IPFSPin]:
+        now = datetime.now(timezone.utc)
+        result = await db.execute(
+            select(IPFSPin)
+            .where(IPFSPin.status == PinStatus.PENDING, IPFSPin.next_attempt_at <= now)
+            .order_by(IPFSPin.next_attempt_at)
+            .limit(self.batch_size)
+        )
+        claimed = []
+        for pin in result.scalars().all():
+            # Only one worker can move the attempt counter from the value it read
+            attempts = pin.attempts
+            claim = await db.execute(
+                update(IPFSPin)
+                .where(IPFSPin.id == pin.id, IPFSPin.attempts == attempts)
+                .values(attempts=attempts + 1, next_attempt_at=now + timedelta(seconds=self.lease_seconds))
+                .execution_options(synchronize_session=False)
+            )
+            if claim.rowcount == 1:
+                claimed.append(pin)
+        await db.commit()
+        for pin in claimed:
+            await db.refresh(pin)
+        return claimed
+
+    async def process_once(self, db: AsyncSession) -> int:
+        """
+        Upload one batch of due pins
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of rows pinned
+        """
+        claimed = await self._claim(db)
+        if not claimed:
+            return 0
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def pin_one(pin: IPFSPin) -> bool:
+            async with semaphore:
+                try:
+                    return await self.ipfs.ensure_pinned(pin.content, pin.cid)
+                except Exception as e:
+                    logger.warning(f"Pinning {pin.cid} raised: {e}")
+                    return False
+
+        outcomes = await asyncio.gather(*(pin_one(pin) for pin in claimed))
+        now = datetime.now(timezone.utc)
+        pinned = 0
+        for pin, ok in zip(claimed, outcomes):
+            if ok:
+                pin.status = PinStatus.PINNED
+                pin.pinned_at = now
+                pin.last_error = None
+                pinned += 1
+            elif pin.attempts >= self.max_attempts:
+                pin.status = PinStatus.FAILED
+                pin.last_error = f"Gave up after {pin.attempts} attempts"
+                logger.error(f"Pinning {pin.cid} failed permanently")
+            else:
+                pin.next_attempt_at = now + timedelta(seconds=self.backoff_seconds * 2 ** (pin.attempts - 1))
+                pin.last_error = f"Attempt {pin.attempts} failed"
+        await db.commit()
+        return pinned
+
+    async def run_forever(self, interval_seconds: int) -> None:
+        """Poll for due pins every interval_seconds until cancelled"""
+        from app.database import AsyncSessionLocal
+
+        while True:
+            try:
+                async with AsyncSessionLocal() as db:
+                    # Keep draining while full batches are due
+                    while await self.process_once(db) >= self.batch_size:
+                        pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Pin outbox pass failed: {e}")
+            await asyncio.sleep(interval_seconds)
+
+
+# Global instance
+pin_outbox = PinOutbox()
@@ -0,0 +1,145 @@
+"""
+Preflight for unsigned transactions using algod simulate
+
+Transactions built by the backend are simulated with empty signatures before
+they are handed to a wallet, so a call that would fail is reported (with its
+reason and opcode cost) before the user spends a signing round trip and a fee.
+
+Reference: https://dev.algorand.co/concepts/transactions/simulate/
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from algosdk import transaction
+from algosdk.v2client import algod
+from algosdk.v2client.models import SimulateRequest, SimulateRequestTransactionGroup
+import asyncio
+import logging
+import time
+from app.config import settings
+from app.utils.node_responses import as_dict
+
+logger = logging.getLogger(__name__)
+
+# Average block time, used to estimate the current round between simulations
+AVERAGE_ROUND_SECONDS = 2.8
+
+
+@dataclass
+class PreflightResult:
+    would_succeed: Optional[bool]  # None when simulate itself could not run
+    opcode_cost: int = 0  # app budget consumed across the group
+    failure_reason: Optional[str] = None
+    failed_at: Optional[List[int]] = None  # path to the failing (inner) transaction
+    round: Optional[int] = None
+    cached: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class PreflightService:
+    """
+    Simulate transaction groups and cache the outcome
+
+    Results are cached per (group txids, round window): the same unsigned
+    group asked about again within PREFLIGHT_ROUND_WINDOW rounds reuses the
+    earlier simulation. The current round is the last one algod reported,
+    advanced by the time elapsed since.
+    """
+
+    def __init__(
+        self,
+        algod_client: Optional[algod.AlgodClient] = None,
+        round_window: int = settings.PREFLIGHT_ROUND_WINDOW,
+        max_entries: int = 1024
+    ):
+        self._algod_client = algod_client
+        self.round_window = round_window
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Tuple[str, ...], int], PreflightResult]" = OrderedDict()
+        self._latest_round = 0
+        self._latest_round_at = 0.0
+
+    @property
+    def algod_client(self) -> algod.AlgodClient:
+        if self._algod_client is None:
+            from app.services.blockchain import blockchain_service
+            self._algod_client = blockchain_service.algod_client
+        return self._algod_client
+
+    def _current_round(self) -> int:
+        elapsed = time.monotonic() - self._latest_round_at
+        return self._latest_round + int(elapsed / AVERAGE_ROUND_SECONDS)
+
+    def _cache_key(self, txids: Tuple[str, ...], round_number: int) -> Tuple[Tuple[str, ...], int]:
+        return txids, round_number // self.round_window
+
+    async def preflight(
+        self,
+        txns: Union[transaction.Transaction, Sequence[transaction.Transaction]]
+    ) -> PreflightResult:
+        """
+        Simulate an unsigned transaction or atomic group
+
+        Args:
+            txns: One transaction, or the transactions of one group in order
+
+        Returns:
+            PreflightResult; would_succeed is None if algod could not simulate
+        """
+        group = [txns] if isinstance(txns, transaction.Transaction) else list(txns)
+        txids = tuple(txn.get_txid() for txn in group)
+
+        if self._latest_round:
+            key = self._cache_key(txids, self._current_round())
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                return PreflightResult(**{**cached.to_dict(), "cached": True})
+
+        request = SimulateRequest(
+            txn_groups=[SimulateRequestTransactionGroup(
+                txns=[transaction.SignedTransaction(txn, None) for txn in group]
+            )],
+            allow_empty_signatures=True,
+        )
+        try:
+            response = as_dict(await asyncio.to_thread(self.algod_client.simulate_transactions, request))
+            result = self._parse(response)
+        except Exception as e:
+            # Preflight is advisory: a failed call or an unexpected response is
+            # reported, never raised to the caller
+            logger.warning(f"Preflight simulate failed: {e!r}")
+            return PreflightResult(would_succeed=None, failure_reason=f"simulate unavailable: {e!r}")
+
+        if result.round is not None and result.round >= self._latest_round:
+            self._latest_round = result.round
+            self._latest_round_at = time.monotonic()
+
+        key = self._cache_key(txids, result.round or 0)
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return result
+
+    @staticmethod
+    def _parse(response: Dict[str, Any]) -> PreflightResult:
+        group = response["txn-groups"][0]
+        failure = group.get("failure-message") or None
+        return PreflightResult(
+            would_succeed=failure is None,
+            opcode_cost=group.get("app-budget-consumed", 0),
+            failure_reason=failure,
+            failed_at=group.get("failed-at"),
+            round=response.get("last-round"),
+        )
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Global instance
+preflight_service = PreflightService()
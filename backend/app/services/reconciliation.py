@@ -0,0 +1,410 @@
+"""
+Incremental chain/database reconciliation for milestones and payments
+
+The milestone routes only record status changes in the database; the chain is
+the source of truth. Each pass compares Milestone rows with the contract's
+milestone boxes and records confirmed payments, but only for contracts that
+can have changed since the last pass:
+
+- contracts never reconciled
+- contracts whose app was called since their round watermark (one indexer
+  query per app, filtered by application id on the indexer)
+- contracts whose milestones were edited since they were last checked
+- contracts with unresolved mismatches
+
+Every other contract just has its watermark advanced, so the cost of a pass
+follows activity rather than the number of contracts. A watermark only moves
+over rounds whose app calls were scanned: a new contract is scanned from its
+app's creation round, each pass scans at most max_scan_rounds per app (a
+contract further behind catches up over the following passes), and without
+an indexer watermarks stay put and every contract is compared. Passes in one process
+(the background worker and the admin trigger) run one at a time, and the
+state row of a newly reconciled contract is upserted, so passes in other
+workers cannot collide on it.
+"""
+
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import func, select, update, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
+import logging
+import time
+from app.config import settings
+from app.contracts.milestone_box import MilestoneBox, MilestoneBoxStatus
+from app.models.contract import Contract
+from app.models.milestone import Milestone, MilestoneStatus
+from app.models.reconciliation import ReconciliationState
+from app.models.transaction import Transaction, TransactionType, TransactionStatus
+from app.services.app_state import AppStateService, app_state_service
+from app.utils.node_responses import as_dict
+from app.utils.sql import dialect_insert
+
+logger = logging.getLogger(__name__)
+
+# Database statuses that are behind a verified on-chain milestone
+_BEFORE_VERIFIED = {MilestoneStatus.PENDING, MilestoneStatus.IN_PROGRESS, MilestoneStatus.COMPLETED}
+
+# Indexer queries in flight at once while scanning app calls
+_INDEXER_CONCURRENCY = 8
+
+
+@dataclass
+class ReconciliationStats:
+    passes: int = 0
+    last_pass_at: Optional[float] = None  # unix timestamp
+    last_round: int = 0  # chain round at the last pass
+    lag_rounds: int = 0  # rounds between the oldest watermark and the chain after the last pass
+    contracts_checked: int = 0  # contracts compared on the last pass
+    corrected: int = 0  # rows fixed since startup
+    mismatches: int = 0  # unresolved differences after the last pass
+    errors: int = 0  # contracts that could not be read since startup
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _inner_payment_total(txn: Dict[str, Any]) -> int:
+    return sum(
+        inner.get("payment-transaction", {}).get("amount", 0)
+        for inner in txn.get("inner-txns", [])
+        if inner.get("tx-type") == "pay"
+    )
+
+
+class ReconciliationService:
+    """
+    Compare contract milestones and payments on chain with the database
+
+    Chain state that is ahead of the database (verified or paid on chain,
+    payment not recorded) is written to the database. Anything else that
+    differs is counted as a mismatch and rechecked on every pass until it
+    resolves; the database is never moved backwards.
+    """
+
+    def __init__(
+        self,
+        app_state: AppStateService = app_state_service,
+        indexer_client: Optional[Any] = None,
+        max_scan_rounds: int = settings.RECONCILE_MAX_SCAN_ROUNDS
+    ):
+        self.app_state = app_state
+        self._indexer_client = indexer_client
+        self.max_scan_rounds = max_scan_rounds
+        self.stats = ReconciliationStats()
+        self._lock = asyncio.Lock()
+        self._created_rounds: Dict[int, int] = {}
+
+    @property
+    def indexer_client(self) -> Optional[Any]:
+        if self._indexer_client is None:
+            from app.services.blockchain import blockchain_service
+            return blockchain_service.indexer_client
+        return self._indexer_client
+
+    async def _app_calls(self, app_id: int, min_round: int, max_round: int) -> List[Dict[str, Any]]:
+        """Application calls to app_id in [min_round, max_round]"""
+        calls: List[Dict[str, Any]] = []
+        next_page = None
+        while True:
+            response = as_dict(await asyncio.to_thread(
+                self.indexer_client.search_transactions,
+                txn_type="appl",
+                application_id=app_id,
+                min_round=min_round,
+                max_round=max_round,
+                limit=1000,
+                next_page=next_page,
+            ))
+            calls.extend(response.get("transactions", []))
+            next_page = response.get("next-token")
+            if not next_page or not response.get("transactions"):
+                return calls
+
+    async def _created_round(self, app_id: int) -> Optional[int]:
+        """Round app_id was created in, or None if the indexer cannot tell"""
+        if app_id not in self._created_rounds:
+            try:
+                response = as_dict(await asyncio.to_thread(
+                    self.indexer_client.applications, app_id, include_all=True
+                ))
+                self._created_rounds[app_id] = response["application"]["created-at-round"]
+            except Exception as e:
+                logger.warning(f"Reconciliation could not find the creation round of app {app_id}: {e}")
+                return None
+        return self._created_rounds[app_id]
+
+    async def _scan_starts(self, watermarks: Dict[int, int], app_ids: Dict[int, int]) -> Dict[int, int]:
+        """
+        Last round already covered for each contract, by contract id
+
+        A watermark of 0 means the contract's calls were never scanned, so its
+        scan starts at the app's creation. Contracts whose creation round is
+        unknown are left out and not scanned this pass.
+        """
+        semaphore = asyncio.Semaphore(_INDEXER_CONCURRENCY)
+
+        async def created(app_id: int) -> Optional[int]:
+            async with semaphore:
+                return await self._created_round(app_id)
+
+        unscanned = sorted({app_ids[contract_id] for contract_id, last_round in watermarks.items() if not last_round})
+        creations = dict(zip(unscanned, await asyncio.gather(*(created(app_id) for app_id in unscanned))))
+        starts: Dict[int, int] = {}
+        for contract_id, last_round in watermarks.items():
+            if last_round:
+                starts[contract_id] = last_round
+            elif creations[app_ids[contract_id]] is not None:
+                starts[contract_id] = max(creations[app_ids[contract_id]] - 1, 0)
+        return starts
+
+    async def _calls_in(self, windows: Dict[int, Tuple[int, int]]) -> Dict[int, List[Dict[str, Any]]]:
+        """Calls to each app in its (after, up_to] round window, by app id"""
+        semaphore = asyncio.Semaphore(_INDEXER_CONCURRENCY)
+
+        async def fetch(app_id: int) -> List[Dict[str, Any]]:
+            after, up_to = windows[app_id]
+            async with semaphore:
+                return await self._app_calls(app_id, after + 1, up_to)
+
+        ordered = sorted(windows)
+        results = await asyncio.gather(*(fetch(app_id) for app_id in ordered))
+        return {app_id: calls for app_id, calls in zip(ordered, results) if calls}
+
+    async def run_once(self, db: AsyncSession) -> ReconciliationStats:
+        """
+        Run one reconciliation pass and commit its corrections
+
+        Args:
+            db: Database session
+
+        Returns:
+            Updated stats
+        """
+        async with self._lock:
+            return await self._run_once(db)
+
+    async def _run_once(self, db: AsyncSession) -> ReconciliationStats:
+        current_round = await self.app_state.current_round()
+        result = await db.execute(
+            select(Contract.id, Contract.app_id, ReconciliationState)
+            .outerjoin(ReconciliationState, ReconciliationState.contract_id == Contract.id)
+            .where(Contract.app_id.is_not(None))
+        )
+        rows = result.all()
+        app_ids = {contract_id: app_id for contract_id, app_id, _ in rows}
+        states = {contract_id: state for contract_id, _, state in rows if state is not None}
+
+        candidates = {contract_id for contract_id in app_ids if contract_id not in states}
+        candidates |= {contract_id for contract_id, state in states.items() if state.mismatches}
+
+        # Contracts whose milestones were edited since they were last checked
+        edited = await db.execute(
+            select(Milestone.contract_id)
+            .join(ReconciliationState, ReconciliationState.contract_id == Milestone.contract_id)
+            .where(or_(
+                ReconciliationState.checked_at.is_(None),
+                Milestone.updated_at > ReconciliationState.checked_at,
+                Milestone.created_at > ReconciliationState.checked_at,
+            ))
+            .distinct()
+        )
+        candidates |= set(edited.scalars().all())
+
+        # Contracts whose app was called since their watermark. Each contract
+        # ends the pass reconciled up to scanned[contract_id], the last round
+        # whose calls were actually looked at
+        watermarks = {
+            contract_id: states[contract_id].last_round if contract_id in states else 0
+            for contract_id in app_ids
+        }
+        scanned = dict(watermarks)
+        calls: Dict[int, List[Dict[str, Any]]] = {}
+        stale = {contract_id for contract_id, last_round in watermarks.items() if last_round < current_round}
+        if stale and self.indexer_client is None:
+            candidates |= stale
+        elif stale:
+            starts = await self._scan_starts({contract_id: watermarks[contract_id] for contract_id in stale}, app_ids)
+            candidates |= stale - starts.keys()
+            windows: Dict[int, Tuple[int, int]] = {}
+            for contract_id, after in starts.items():
+                app_id = app_ids[contract_id]
+                after = min(windows[app_id][0], after) if app_id in windows else after
+                windows[app_id] = (after, min(after + self.max_scan_rounds, current_round))
+            calls = await self._calls_in({app_id: window for app_id, window in windows.items() if window[0] < window[1]})
+            for contract_id, after in starts.items():
+                up_to = max(after, windows[app_ids[contract_id]][1])
+                scanned[contract_id] = up_to
+                if any(after < txn.get("confirmed-round", 0) <= up_to for txn in calls.get(app_ids[contract_id], [])):
+                    candidates.add(contract_id)
+
+        candidates &= app_ids.keys()
+        corrected, mismatches = await self._reconcile(db, candidates, app_ids, calls)
+        for contract_id in candidates - mismatches.keys():
+            scanned[contract_id] = watermarks[contract_id]  # unreadable this pass; keep the old watermark
+        for contract_id in mismatches:
+            # Database clock, so it compares with the milestones' updated_at;
+            # corrections made in this transaction share the timestamp and do
+            # not trigger a recheck
+            values = {"last_round": scanned[contract_id], "mismatches": mismatches[contract_id], "checked_at": func.now()}
+            state = states.get(contract_id)
+            if state is None:
+                # Another worker's pass may insert the row first
+                insert = dialect_insert(db, ReconciliationState).values(contract_id=contract_id, **values)
+                await db.execute(insert.on_conflict_do_update(
+                    index_elements=[ReconciliationState.contract_id],
+                    set_={name: insert.excluded[name] for name in values}
+                ))
+                continue
+            state.last_round = values["last_round"]
+            state.mismatches = values["mismatches"]
+            state.checked_at = values["checked_at"]
+
+        # No activity in the scanned rounds: the contract is reconciled up to them
+        idle: Dict[int, List[int]] = {}
+        for contract_id in set(states) - candidates:
+            if scanned[contract_id] != watermarks[contract_id]:
+                idle.setdefault(scanned[contract_id], []).append(contract_id)
+        for last_round, contract_ids in idle.items():
+            await db.execute(
+                update(ReconciliationState)
+                .where(ReconciliationState.contract_id.in_(contract_ids))
+                .values(last_round=last_round)
+            )
+        await db.commit()
+
+        reconciled_to = [scanned[contract_id] for contract_id in app_ids if contract_id in states or contract_id in mismatches]
+        total = await db.execute(select(ReconciliationState.mismatches))
+        self.stats.passes += 1
+        self.stats.last_pass_at = time.time()
+        self.stats.last_round = current_round
+        self.stats.lag_rounds = current_round - min(reconciled_to, default=current_round)
+        self.stats.contracts_checked = len(candidates)
+        self.stats.corrected += corrected
+        self.stats.mismatches = sum(total.scalars().all())
+        self.stats.errors += len(candidates) - len(mismatches)
+        return self.stats
+
+    async def _reconcile(
+        self,
+        db: AsyncSession,
+        contract_ids: Set[int],
+        app_ids: Dict[int, int],
+        calls: Dict[int, List[Dict[str, Any]]]
+    ) -> Tuple[int, Dict[int, int]]:
+        """Compare and correct candidates; returns (rows corrected, mismatches per readable contract)"""
+        if not contract_ids:
+            return 0, {}
+
+        async def read(contract_id: int) -> Optional[Dict[int, MilestoneBox]]:
+            try:
+                chain = await self.app_state.get_milestones(app_ids[contract_id])
+                return chain.milestones
+            except Exception as e:
+                logger.warning(f"Reconciliation could not read contract {contract_id}: {e}")
+                return None
+
+        ordered = sorted(contract_ids)
+        boxes = dict(zip(ordered, await asyncio.gather(*(read(contract_id) for contract_id in ordered))))
+
+        result = await db.execute(select(Milestone).where(Milestone.contract_id.in_(ordered)))
+        rows: Dict[int, Dict[int, Milestone]] = {}
+        for milestone in result.scalars().all():
+            rows.setdefault(milestone.contract_id, {})[milestone.index] = milestone
+
+        corrected = 0
+        mismatches: Dict[int, int] = {}
+        now = datetime.now(timezone.utc)
+        for contract_id in ordered:
+            chain = boxes[contract_id]
+            if chain is None:
+                continue
+            db_rows = rows.get(contract_id, {})
+            count = 0
+            for index in db_rows.keys() | chain.keys():
+                milestone, box = db_rows.get(index), chain.get(index)
+                if milestone is None or box is None:
+                    count += 1
+                    continue
+                if box.has_proof and not milestone.proof_hash:
+                    milestone.proof_hash = box.proof_hash.hex()
+                    corrected += 1
+                if box.status == MilestoneBoxStatus.PAID and milestone.status != MilestoneStatus.PAID:
+                    milestone.status = MilestoneStatus.PAID
+                    milestone.verified_at = milestone.verified_at or now
+                    milestone.paid_at = milestone.paid_at or now
+                    corrected += 1
+                elif box.status == MilestoneBoxStatus.VERIFIED and milestone.status in _BEFORE_VERIFIED:
+                    milestone.status = MilestoneStatus.VERIFIED
+                    milestone.verified_at = milestone.verified_at or now
+                    corrected += 1
+                elif box.status == MilestoneBoxStatus.PENDING and milestone.status not in _BEFORE_VERIFIED:
+                    count += 1  # database claims progress the chain has not seen
+                elif box.status == MilestoneBoxStatus.VERIFIED and milestone.status == MilestoneStatus.PAID:
+                    count += 1
+            mismatches[contract_id] = count
+
+        corrected += await self._record_payments(db, mismatches.keys(), app_ids, calls)
+        return corrected, mismatches
+
+    async def _record_payments(
+        self,
+        db: AsyncSession,
+        contract_ids: Iterable[int],
+        app_ids: Dict[int, int],
+        calls: Dict[int, List[Dict[str, Any]]]
+    ) -> int:
+        """Confirm or insert Transaction rows for app calls that paid out"""
+        payments = {
+            txn["id"]: (contract_id, txn)
+            for contract_id in contract_ids
+            for txn in calls.get(app_ids[contract_id], [])
+            if _inner_payment_total(txn)
+        }
+        if not payments:
+            return 0
+
+        result = await db.execute(select(Transaction).where(Transaction.tx_id.in_(payments)))
+        existing = {transaction.tx_id: transaction for transaction in result.scalars().all()}
+        corrected = 0
+        for tx_id, (contract_id, txn) in payments.items():
+            recorded = existing.get(tx_id)
+            if recorded is None:
+                db.add(Transaction(
+                    contract_id=contract_id,
+                    tx_id=tx_id,
+                    type=TransactionType.PAYMENT,
+                    status=TransactionStatus.CONFIRMED,
+                    amount=str(_inner_payment_total(txn)),
+                    confirmed_round=txn.get("confirmed-round"),
+                    note="Recorded by chain reconciliation"
+                ))
+                corrected += 1
+            elif recorded.status != TransactionStatus.CONFIRMED:
+                recorded.status = TransactionStatus.CONFIRMED
+                recorded.confirmed_round = txn.get("confirmed-round")
+                corrected += 1
+        return corrected
+
+    async def run_forever(self, interval_seconds: int) -> None:
+        """Run passes every interval_seconds until cancelled"""
+        from app.database import AsyncSessionLocal
+
+        while True:
+            try:
+                async with AsyncSessionLocal() as db:
+                    stats = await self.run_once(db)
+                logger.info(
+                    f"Reconciled {stats.contracts_checked} contracts up to round {stats.last_round}, "
+                    f"{stats.mismatches} mismatches"
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Reconciliation pass failed: {e}")
+            await asyncio.sleep(interval_seconds)
+
+
+# Global instance
+reconciliation_service = ReconciliationService()
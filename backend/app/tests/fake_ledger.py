@@ -0,0 +1,144 @@
+"""
+In-memory stand-in for the algod endpoints the backend uses to build and
+preflight transactions
+
+It evaluates just enough of the ledger rules for the transactions the backend
+produces (fees, validity window, balances and minimum balance, asset
+holdings, pooled app budget) and answers simulate requests in algod's
+response shape.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from algosdk import transaction
+from algosdk.v2client.models import SimulateRequest
+import base64
+
+MIN_FEE = 1000
+MIN_BALANCE = 100_000
+APP_CALL_BUDGET = 700
+GENESIS_HASH = "SGO1GKSzyE7IEPItTxCByw9x8FmnrCDexi9/cOUJOiI="
+
+
+@dataclass
+class FakeAccount:
+    amount: int
+    assets: Dict[int, int] = field(default_factory=dict)
+
+
+class FakeLedger:
+    def __init__(self, round: int = 1000):
+        self.round = round
+        self.accounts: Dict[str, FakeAccount] = {}
+        self.asset_creators: Dict[int, str] = {}
+        self.app_costs: Dict[int, int] = {}  # opcode cost of one call, per app
+        self.app_global_state: Dict[int, List[Dict[str, Any]]] = {}  # raw algod global-state, per app
+        self.app_boxes: Dict[int, Dict[bytes, bytes]] = {}  # box name -> contents, per app
+        self.application_info_calls = 0
+        self.box_reads = 0
+        self.simulate_calls = 0
+        self.suggested_params_calls = 0
+
+    def fund(self, address: str, amount: int) -> None:
+        self.accounts.setdefault(address, FakeAccount(0)).amount += amount
+
+    def advance(self, rounds: int) -> None:
+        self.round += rounds
+
+    # algod client surface ---------------------------------------------------
+
+    def suggested_params(self) -> transaction.SuggestedParams:
+        self.suggested_params_calls += 1
+        return transaction.SuggestedParams(
+            fee=0,
+            first=self.round,
+            last=self.round + 1000,
+            gh=GENESIS_HASH,
+            gen="fake-v1.0",
+            flat_fee=False,
+            min_fee=MIN_FEE,
+        )
+
+    def status(self) -> Dict[str, Any]:
+        return {"last-round": self.round}
+
+    def application_info(self, app_id: int) -> Dict[str, Any]:
+        self.application_info_calls += 1
+        if app_id not in self.app_global_state:
+            raise Exception(f"application does not exist: {app_id}")
+        return {"id": app_id, "params": {"global-state": self.app_global_state[app_id]}}
+
+    def application_boxes(self, app_id: int, limit: int = 0) -> Dict[str, Any]:
+        names = list(self.app_boxes.get(app_id, {}))
+        return {"boxes": [{"name": base64.b64encode(name).decode()} for name in names]}
+
+    def application_box_by_name(self, app_id: int, box_name: bytes) -> Dict[str, Any]:
+        self.box_reads += 1
+        value = self.app_boxes.get(app_id, {}).get(box_name)
+        if value is None:
+            raise Exception(f"box not found: {box_name!r}")
+        return {
+            "name": base64.b64encode(box_name).decode(),
+            "round": self.round,
+            "value": base64.b64encode(value).decode(),
+        }
+
+    def simulate_transactions(self, request: SimulateRequest) -> Dict[str, Any]:
+        self.simulate_calls += 1
+        if not request.allow_empty_signatures:
+            raise ValueError("fake ledger only simulates with allow_empty_signatures")
+
+        txns = [signed.transaction for signed in request.txn_groups[0].txns]
+        budget = APP_CALL_BUDGET * sum(isinstance(txn, transaction.ApplicationCallTxn) for txn in txns)
+        consumed = 0
+        results = []
+        failure: Optional[str] = None
+        failed_at = None
+        for index, txn in enumerate(txns):
+            cost = 0
+            failure = self._check(txn)
+            if failure is None and isinstance(txn, transaction.ApplicationCallTxn):
+                cost = self.app_costs.get(txn.index, 1)
+                consumed += cost
+                if consumed > budget:
+                    failure = f"dynamic cost budget exceeded, executing pushint: local program cost was {consumed}"
+            results.append({"txn-result": {"txn": {"txn": txn.dictify()}}, "app-budget-consumed": cost})
+            if failure is not None:
+                failed_at = [index]
+                break
+
+        group: Dict[str, Any] = {
+            "txn-results": results,
+            "app-budget-added": budget,
+            "app-budget-consumed": consumed,
+        }
+        if failure is not None:
+            group["failure-message"] = f"transaction {txns[failed_at[0]].get_txid()}: {failure}"
+            group["failed-at"] = failed_at
+        return {"version": 2, "last-round": self.round, "txn-groups": [group]}
+
+    # evaluation ---------------------------------------------------------------
+
+    def _check(self, txn: transaction.Transaction) -> Optional[str]:
+        if not txn.first_valid_round <= self.round + 1 <= txn.last_valid_round:
+            return f"txn dead: round {self.round + 1} outside of {txn.first_valid_round}--{txn.last_valid_round}"
+        if txn.fee < MIN_FEE:
+            return f"transaction had fee {txn.fee}, which is less than the minimum {MIN_FEE}"
+
+        sender = self.accounts.get(txn.sender)
+        spend = txn.fee
+        if isinstance(txn, transaction.PaymentTxn):
+            spend += txn.amt
+        if isinstance(txn, transaction.AssetCreateTxn):
+            spend += MIN_BALANCE
+        if sender is None or sender.amount - spend < MIN_BALANCE:
+            balance = sender.amount if sender else 0
+            return f"account {txn.sender} balance {balance} below min {MIN_BALANCE + spend}"
+
+        if isinstance(txn, transaction.AssetTransferTxn) and txn.amount:
+            if sender.assets.get(txn.index, 0) < txn.amount:
+                return f"asset {txn.index} missing from {txn.sender}"
+            receiver = self.accounts.get(txn.receiver)
+            if receiver is None or txn.index not in receiver.assets:
+                return f"receiver {txn.receiver} is not opted in to asset {txn.index}"
+        return None
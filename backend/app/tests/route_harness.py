@@ -0,0 +1,85 @@
+"""
+A FastAPI app over a SQLite database for route behavior tests
+
+Routers are mounted at their production prefixes, get_db yields sessions on
+the test database, and requests are made as whichever user the test sets.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+import asyncio
+from app.database import get_db
+from app.migrations import run_migrations
+from app.models import Application, Contract, Milestone, Tender, Transaction, User
+from app.models.tender import TenderStatus
+from app.models.transaction import TransactionType
+from app.models.user import UserRole
+from app.utils.auth import get_current_active_user
+
+
+class RouteHarness:
+    def __init__(self, tmp_path, **routers: APIRouter):
+        # No pooling: setup and the test client run on different event loops
+        self.engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'api.db'}", poolclass=NullPool)
+        self.sessions = async_sessionmaker(self.engine, expire_on_commit=False)
+        self.user: Optional[User] = None
+        self.app = FastAPI()
+        for prefix, router in routers.items():
+            self.app.include_router(router, prefix=f"/api/{prefix}")
+        self.app.dependency_overrides[get_db] = self._get_db
+        self.app.dependency_overrides[get_current_active_user] = lambda: self.user
+        asyncio.run(run_migrations(self.engine))
+
+    async def _get_db(self):
+        async with self.sessions() as session:
+            yield session
+            await session.commit()
+
+    def run(self, setup):
+        """Run setup(session) against the test database and return its result"""
+        async def scenario():
+            async with self.sessions() as session:
+                return await setup(session)
+
+        return asyncio.run(scenario())
+
+    def client(self) -> TestClient:
+        return TestClient(self.app)
+
+
+@dataclass
+class Seeded:
+    gov: User
+    contractor: User
+    tender: Tender
+    contract: Contract
+
+
+async def seed_contract(session: AsyncSession, milestones: int = 3) -> Seeded:
+    """One government user, contractor, tender with an application, and contract with milestones and a payment"""
+    gov = User(name="g", email="g@x.com", password_hash="x", role=UserRole.GOVERNMENT)
+    contractor = User(name="c", email="c@x.com", password_hash="x", role=UserRole.CONTRACTOR)
+    session.add_all([gov, contractor])
+    await session.flush()
+    tender = Tender(title="Road", description="d", location="l", category="roads", budget=Decimal("100.50"),
+                    deadline=datetime(2026, 1, 1), status=TenderStatus.ACTIVE, gov_id=gov.id)
+    session.add(tender)
+    await session.flush()
+    session.add(Application(tender_id=tender.id, contractor_id=contractor.id, bid_amount=Decimal("90")))
+    contract = Contract(tender_id=tender.id, contractor_id=contractor.id, gov_id=gov.id,
+                        total_amount=Decimal("10"), app_id=1234)
+    session.add(contract)
+    await session.flush()
+    # Inserted out of index order, so ordering has to come from the query or the route
+    for index in reversed(range(milestones)):
+        session.add(Milestone(contract_id=contract.id, index=index, title=f"m{index}",
+                              amount=Decimal("1"), deadline=datetime(2026, 1, 1)))
+    session.add(Transaction(contract_id=contract.id, tx_id="TX1", type=TransactionType.PAYMENT, amount="1000"))
+    await session.commit()
+    return Seeded(gov, contractor, tender, contract)
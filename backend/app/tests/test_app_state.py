@@ -0,0 +1,103 @@
+"""
+Global state decoding and round caching against the in-memory ledger
+
+Run from backend/: python -m pytest app/tests
+"""
+
+import asyncio
+import base64
+from algosdk.encoding import decode_address, encode_address
+from app.contracts import global_state
+from app.contracts.milestone_box import MilestoneBox, MilestoneBoxStatus, milestone_box_name
+from app.services.app_state import AppStateService
+from app.tests.fake_ledger import FakeLedger
+
+OWNER = encode_address(bytes([1]) * 32)
+CONTRACTOR = encode_address(bytes([2]) * 32)
+VERIFIER = encode_address(bytes([3]) * 32)
+
+
+def _b64(value: bytes) -> str:
+    return base64.b64encode(value).decode()
+
+
+def raw_state(milestones: int, current: int, paused: int):
+    def bytes_entry(key, value):
+        return {"key": _b64(key.encode()), "value": {"type": 1, "bytes": _b64(value), "uint": 0}}
+
+    def uint_entry(key, value):
+        return {"key": _b64(key.encode()), "value": {"type": 2, "bytes": "", "uint": value}}
+
+    return [
+        bytes_entry(global_state.OWNER_KEY, decode_address(OWNER)),
+        bytes_entry(global_state.CONTRACTOR_KEY, decode_address(CONTRACTOR)),
+        bytes_entry(global_state.VERIFIER_KEY, decode_address(VERIFIER)),
+        uint_entry(global_state.TOTAL_AMOUNT_KEY, 5_000_000),
+        uint_entry(global_state.MILESTONE_COUNT_KEY, milestones),
+        uint_entry(global_state.CURRENT_MILESTONE_KEY, current),
+        uint_entry(global_state.PAUSED_KEY, paused),
+        uint_entry(global_state.VERIFIER_TIMELOCK_KEY, 86400),
+    ]
+
+
+def test_decodes_fairlens_global_state():
+    state = global_state.decode_global_state(7, 1000, raw_state(4, 2, 1))
+    assert state.owner == OWNER
+    assert state.contractor == CONTRACTOR
+    assert state.verifier == VERIFIER
+    assert (state.total_amount, state.milestone_count, state.current_milestone) == (5_000_000, 4, 2)
+    assert state.paused is True
+    assert state.verifier_update_time == 0
+
+
+def test_caches_per_app_and_round():
+    ledger = FakeLedger()
+    ledger.app_global_state[7] = raw_state(4, 2, 0)
+    service = AppStateService(algod_client=ledger)
+
+    asyncio.run(service.get_state(7))
+    cached = asyncio.run(service.get_state(7))
+    assert cached.round == ledger.round
+    assert ledger.application_info_calls == 1
+
+    ledger.app_global_state[7] = raw_state(4, 3, 0)
+    ledger.advance(1)
+    fresh = asyncio.run(service.get_state(7))
+    assert fresh.current_milestone == 3
+    assert ledger.application_info_calls == 2
+
+
+def test_bulk_read_shares_round_and_isolates_failures():
+    ledger = FakeLedger()
+    ledger.app_global_state[7] = raw_state(4, 2, 0)
+    ledger.app_global_state[8] = raw_state(3, 0, 1)
+    service = AppStateService(algod_client=ledger, max_concurrency=2)
+
+    states = asyncio.run(service.get_states([7, 8, 9, 7]))
+    assert list(states) == [7, 8, 9]
+    assert states[8].paused is True
+    assert states[9] is None
+    assert states[7].round == states[8].round == ledger.round
+    assert ledger.application_info_calls == 3
+
+
+def test_reads_milestone_boxes_per_round():
+    ledger = FakeLedger()
+    ledger.app_boxes[7] = {
+        milestone_box_name(1): MilestoneBox(2_000_000, 1_700_000_000, MilestoneBoxStatus.PAID).encode(),
+        milestone_box_name(0): MilestoneBox(1_000_000, 1_600_000_000).encode(),
+        b"other": b"ignored",
+    }
+    service = AppStateService(algod_client=ledger)
+
+    chain = asyncio.run(service.get_milestones(7))
+    assert list(chain.milestones) == [0, 1]
+    assert chain.milestones[1].status == MilestoneBoxStatus.PAID
+    assert chain.round == ledger.round
+
+    asyncio.run(service.get_milestones(7))
+    assert ledger.box_reads == 2
+
+    ledger.advance(1)
+    asyncio.run(service.get_milestones(7))
+    assert ledger.box_reads == 4
@@ -0,0 +1,45 @@
+"""
+Tender response cache: ETag comparison and 304 revalidation
+
+Run from backend/: python -m pytest app/tests
+"""
+
+from app.routes import tenders
+from app.tests.route_harness import RouteHarness, seed_contract
+from app.utils.cache import etag_matches, tender_cache
+
+ETAG = '"abc"'
+
+
+def test_if_none_match_uses_weak_comparison():
+    assert etag_matches('"abc"', ETAG)
+    assert etag_matches('W/"abc"', ETAG)
+    assert etag_matches('"abc"', 'W/"abc"')
+    assert etag_matches('"x", W/"abc" , "y"', ETAG)
+    assert etag_matches("*", ETAG)
+    assert not etag_matches('"abcd", W/"ab"', ETAG)
+    assert not etag_matches("", ETAG)
+    assert not etag_matches(None, ETAG)
+
+
+def test_revalidation_returns_304_without_a_body(tmp_path):
+    harness = RouteHarness(tmp_path, tenders=tenders.router)
+    seeded = harness.run(seed_contract)
+    tender_cache.clear()
+
+    with harness.client() as client:
+        first = client.get(f"/api/tenders/{seeded.tender.id}")
+        assert first.status_code == 200
+        assert first.json()["title"] == "Road"
+        etag = first.headers["etag"]
+
+        for if_none_match in (etag, f"W/{etag}", f'"stale", {etag}', "*"):
+            revalidated = client.get(f"/api/tenders/{seeded.tender.id}", headers={"If-None-Match": if_none_match})
+            assert revalidated.status_code == 304
+            assert revalidated.content == b""
+            assert revalidated.headers["etag"] == etag
+
+        changed = client.get(f"/api/tenders/{seeded.tender.id}", headers={"If-None-Match": '"stale"'})
+        assert changed.status_code == 200
+        assert changed.content == first.content
+    tender_cache.clear()
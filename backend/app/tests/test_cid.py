@@ -0,0 +1,23 @@
+"""
+Local CIDs must match what `ipfs add --cid-version=0` returns
+
+Run from backend/: python -m pytest app/tests
+"""
+
+import pytest
+from app.utils.cid import CHUNK_SIZE, canonical_json, compute_cid
+
+
+def test_matches_known_ipfs_add_cids():
+    assert compute_cid(b"") == "QmbFMke1KXqnYyBBWxB74N4c5SBnJMVAiMNRcGu6x1AwQH"
+    assert compute_cid(b"hello world") == "Qmf412jQZiuVUtdgnB36FXFX7xg5V6KEbSJ4dpQuhkLyfD"
+    assert compute_cid(b"hello world\n") == "QmT78zSuBmuS4z925WZfrqQ1qHaJ56DQaTfyMUF7F8ff5o"
+
+
+def test_canonical_json_ignores_key_order():
+    assert canonical_json({"b": 1, "a": "é"}) == canonical_json({"a": "é", "b": 1}) == '{"a":"é","b":1}'.encode()
+
+
+def test_rejects_multi_chunk_content():
+    with pytest.raises(ValueError):
+        compute_cid(bytes(CHUNK_SIZE + 1))
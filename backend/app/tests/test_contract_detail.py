@@ -0,0 +1,31 @@
+"""
+Contract detail with milestones and transactions in one response
+
+Run from backend/: python -m pytest app/tests
+"""
+
+from sqlalchemy import event
+from app.routes import contracts
+from app.tests.route_harness import RouteHarness, seed_contract
+
+
+def test_returns_children_in_order_with_two_statements(tmp_path):
+    harness = RouteHarness(tmp_path, contracts=contracts.router)
+    seeded = harness.run(seed_contract)
+    harness.user = seeded.contractor
+    statements = []
+    event.listen(harness.engine.sync_engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+
+    with harness.client() as client:
+        response = client.get(f"/api/contracts/{seeded.contract.id}/full")
+        assert response.status_code == 200
+        body = response.json()
+        assert [milestone["index"] for milestone in body["milestones"]] == [0, 1, 2]
+        assert [transaction["tx_id"] for transaction in body["transactions"]] == ["TX1"]
+        # Contract joined with milestones, then one query for its transactions
+        assert len([statement for statement in statements if statement.lstrip().startswith("SELECT")]) == 2
+
+        assert client.get(f"/api/contracts/{seeded.contract.id + 1}/full").status_code == 404
+        harness.user = seeded.gov
+        assert client.get(f"/api/contracts/{seeded.contract.id}/full").status_code == 200
@@ -0,0 +1,99 @@
+"""
+Unsigned application calls built by ContractService and TransactionGroupBuilder:
+reference limits, fee pooling and atomic groups
+
+Run from backend/: python -m pytest app/tests
+"""
+
+import pytest
+from algosdk.encoding import encode_address
+from app.contracts.fairlens_contract import MAX_RELEASE_BATCH, VERIFY_MILESTONE_APP_CALLS
+from app.contracts.milestone_box import milestone_box_name
+from app.services.contract_service import (
+    MAX_BOX_REFERENCES,
+    MAX_GROUP_SIZE,
+    ContractService,
+    create_fairlens_contract,
+)
+from app.tests.fake_ledger import MIN_FEE, FakeLedger
+
+OWNER, CONTRACTOR, VERIFIER = (encode_address(bytes([i]) * 32) for i in (1, 2, 3))
+APP_ID = 1234
+
+
+def make_service(ledger=None):
+    contract = create_fairlens_contract(OWNER, CONTRACTOR, VERIFIER, total_amount=1_000_000)
+    return ContractService(contract, app_id=APP_ID, algod_client=ledger or FakeLedger())
+
+
+def references(txn):
+    return len(txn.boxes or []) + len(txn.accounts or []) + len(txn.foreign_apps or []) + len(txn.foreign_assets or [])
+
+
+def test_largest_release_batch_fits_the_reference_limit():
+    txn = make_service().release_batch(0, MAX_RELEASE_BATCH)
+    assert len(txn.boxes) == MAX_RELEASE_BATCH
+    assert txn.accounts == [CONTRACTOR]
+    assert references(txn) <= MAX_BOX_REFERENCES
+
+    with pytest.raises(ValueError):
+        make_service().release_batch(0, MAX_RELEASE_BATCH + 1)
+
+
+def test_outer_call_pools_the_fees_of_its_inner_transactions():
+    service = make_service()
+    assert service.release_payment(0).fee == 2 * MIN_FEE
+    assert service.release_batch(0, 3).fee == 4 * MIN_FEE
+    assert service.emergency_pause().fee == MIN_FEE
+
+    # The contract leaves inner fees at 0, so the pooled fee is all they get
+    teal = [line.strip() for line in service.compile()["approval_source"].splitlines()]
+    inner_fees = [teal[i - 1] for i, line in enumerate(teal) if line == "itxn_field Fee"]
+    assert inner_fees and all(value in ("int 0", "pushint 0") for value in inner_fees)
+
+
+def test_group_fetches_suggested_params_once_and_shares_a_group_id():
+    ledger = FakeLedger()
+    service = make_service(ledger)
+    group = service.new_group()
+    service.add_milestone(0, 1_000_000, 1_900_000_000, group=group)
+    service.release_payment(0, group=group)
+    txns = service.verify_milestone(0, bytes(64), group=group)
+
+    assert ledger.suggested_params_calls == 1
+    assert len(txns) == 2 + VERIFY_MILESTONE_APP_CALLS
+    assert len({txn.group for txn in txns}) == 1 and txns[0].group is not None
+    # Identical opup calls are kept apart by their notes
+    assert len({txn.get_txid() for txn in txns}) == len(txns)
+
+    single = service.emergency_pause()
+    assert single.group is None
+
+
+def test_group_size_and_reference_limits_are_enforced():
+    service = make_service()
+    group = service.new_group()
+    for _ in range(MAX_GROUP_SIZE):
+        service.emergency_pause(group=group)
+    with pytest.raises(ValueError, match="at most 16 transactions"):
+        service.emergency_pause(group=group)
+
+    group = service.new_group()
+    with pytest.raises(ValueError, match="references"):
+        group.add_app_call(OWNER, APP_ID, [b""], boxes=[b"m"] * MAX_BOX_REFERENCES, accounts=[CONTRACTOR])
+
+
+def test_add_milestones_splits_into_calls_of_at_most_eight_boxes():
+    ledger = FakeLedger()
+    service = make_service(ledger)
+    milestones = [(index, 1_000_000, 1_900_000_000) for index in range(2 * MAX_BOX_REFERENCES + 3)]
+    txns = service.add_milestones(milestones)
+
+    assert [len(txn.boxes) for txn in txns] == [MAX_BOX_REFERENCES, MAX_BOX_REFERENCES, 3]
+    assert ledger.suggested_params_calls == 1
+    assert len({txn.group for txn in txns}) == 1
+    boxes = [reference.name for txn in txns for reference in txn.boxes]
+    assert boxes == [milestone_box_name(index) for index, _, _ in milestones]
+
+    with pytest.raises(ValueError):
+        service.add_milestones([(index, 1, 1) for index in range(MAX_BOX_REFERENCES * MAX_GROUP_SIZE + 1)])
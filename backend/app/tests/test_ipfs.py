@@ -0,0 +1,119 @@
+"""
+IPFS backends: retries and connection reuse against an httpx mock transport,
+and the local blockstore
+
+Run from backend/: python -m pytest app/tests
+"""
+
+import asyncio
+import httpx
+import os
+import pytest
+from app.utils.cid import compute_cid
+from app.utils.ipfs import IPFSService
+from app.utils.ipfs_backends import HTTPBackend, LocalBlockstoreBackend, PinataBackend
+
+
+def make_service(responses):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        outcome = responses.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    service = IPFSService(max_retries=2, backoff_seconds=0, transport=httpx.MockTransport(handler))
+    return service, requests
+
+
+def test_retries_transient_failures():
+    service, requests = make_service([
+        httpx.ConnectError("refused"),
+        httpx.Response(503),
+        httpx.Response(200, json={"Hash": "bafycid"}),
+    ])
+
+    async def upload():
+        cid = await service.upload_json({"name": "proof"})
+        await service.aclose()
+        return cid
+
+    cid = asyncio.run(upload())
+    assert cid == "bafycid"
+    assert len(requests) == 3
+    assert requests[-1].url.path == "/api/v0/add"
+
+
+def test_gives_up_on_client_errors_and_after_retries():
+    service, requests = make_service([httpx.Response(400)])
+    assert asyncio.run(service.upload_json({})) is None
+    assert len(requests) == 1
+
+    service, requests = make_service([httpx.Response(502)] * 3)
+    assert asyncio.run(service.upload_json({})) is None
+    assert len(requests) == 3
+
+
+def test_reuses_one_client_per_event_loop():
+    service, _ = make_service([httpx.Response(200, json={"Hash": "a"})] * 2)
+
+    async def upload_twice():
+        await service.upload_json({"n": 1})
+        first = service.backend._client.get()
+        await service.upload_json({"n": 2})
+        return first is service.backend._client.get()
+
+    assert asyncio.run(upload_twice()) is True
+
+
+def test_skips_upload_for_pinned_cid():
+    content = b'{"name":"proof"}'
+    cid = compute_cid(content)
+    service, requests = make_service([httpx.Response(200, json={"Hash": cid})])
+
+    assert asyncio.run(service.ensure_pinned(content, cid)) is True
+    assert asyncio.run(service.ensure_pinned(content, cid)) is True
+    assert len(requests) == 1
+
+
+def test_cid_mismatch_is_not_marked_pinned():
+    service, _ = make_service([httpx.Response(200, json={"Hash": "bafkreiother"})])
+    content = b"{}"
+    assert asyncio.run(service.ensure_pinned(content)) is False
+    assert not service.is_pinned(compute_cid(content))
+
+
+def test_pinata_backend_posts_file_and_reads_ipfs_hash():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"IpfsHash": "QmPinata"})
+
+    backend = PinataBackend(api_url="https://pinata.test", jwt="token", transport=httpx.MockTransport(handler))
+    assert asyncio.run(IPFSService(backend=backend).upload_json({})) == "QmPinata"
+    assert requests[0].url.path == "/pinning/pinFileToIPFS"
+    assert requests[0].headers["Authorization"] == "Bearer token"
+
+
+def test_local_blockstore_stores_content_under_its_real_cid(tmp_path):
+    backend = LocalBlockstoreBackend(directory=str(tmp_path))
+    service = IPFSService(backend=backend)
+    content = b'{"name":"proof"}'
+
+    assert asyncio.run(service.ensure_pinned(content)) is True
+    assert service.is_pinned(compute_cid(content))
+    assert backend.get(compute_cid(content)) == content
+    assert backend.get("QmMissing") is None
+    # Stored atomically, with no temporary files left behind
+    assert os.listdir(tmp_path) == [compute_cid(content)]
+
+
+def test_backend_without_upload_methods_cannot_be_built():
+    class Incomplete(HTTPBackend):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete("http://ipfs.test", {})
@@ -0,0 +1,65 @@
+"""
+Metadata cache: verified against the CID, then served from disk
+
+Run from backend/: python -m pytest app/tests
+"""
+
+import asyncio
+import httpx
+from app.utils.cid import compute_cid
+from app.utils.metadata_cache import MetadataCache, cid_from_url
+
+DOCUMENT = b'{"name":"FairLens Contract #1","standard":"ARC3"}'
+CID = compute_cid(DOCUMENT)
+
+
+def make_cache(directory, body, max_bytes=1024):
+    fetches = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        fetches.append(request.url)
+        return httpx.Response(200, content=body)
+
+    cache = MetadataCache(directory=str(directory), gateway="https://gw.test/ipfs/", max_bytes=max_bytes,
+                          transport=httpx.MockTransport(handler))
+    return cache, fetches
+
+
+def test_extracts_cid_from_arc3_urls():
+    assert cid_from_url(f"ipfs://{CID}#arc3") == CID
+    assert cid_from_url(f"https://ipfs.io/ipfs/{CID}#arc3") == CID
+    assert cid_from_url("https://fairlens.io/metadata/1") is None
+
+
+def test_fetches_once_then_reads_disk(tmp_path):
+    cache, fetches = make_cache(tmp_path, DOCUMENT)
+    assert asyncio.run(cache.get(CID))["standard"] == "ARC3"
+
+    # A new process (empty memory) reads the file instead of the gateway
+    fresh, fresh_fetches = make_cache(tmp_path, DOCUMENT)
+    assert asyncio.run(fresh.get(CID))["name"] == "FairLens Contract #1"
+    assert len(fetches) == 1 and fresh_fetches == []
+
+
+def test_rejects_content_not_matching_cid(tmp_path):
+    cache, _ = make_cache(tmp_path, b'{"name":"tampered"}')
+    assert asyncio.run(cache.get(CID)) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_rejects_oversized_unverifiable_and_non_object_content(tmp_path):
+    # Over the byte cap, even though it would hash to the CID
+    big = b'{"pad":"' + b"x" * 2000 + b'"}'
+    cache, _ = make_cache(tmp_path, big)
+    assert asyncio.run(cache.get(compute_cid(big))) is None
+
+    # CIDv1 cannot be recomputed locally, so it is never fetched
+    cache, fetches = make_cache(tmp_path, DOCUMENT)
+    assert asyncio.run(cache.get("bafkreigh2akiscaildcqabsyg3dfr6chu3fgpregiymsck7e7aqa4s52zy")) is None
+    assert fetches == []
+
+    # Verified bytes that are not a JSON object
+    array = b"[1,2,3]"
+    cache, _ = make_cache(tmp_path, array)
+    assert asyncio.run(cache.get(compute_cid(array))) is None
+    assert list(tmp_path.iterdir()) == []
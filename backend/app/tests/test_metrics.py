@@ -0,0 +1,124 @@
+"""
+Metrics: Prometheus text output, merging worker processes, and outbound call
+instrumentation
+
+Run from backend/: python -m pytest app/tests
+"""
+
+import asyncio
+import httpx
+import os
+import subprocess
+import sys
+from prometheus_client import REGISTRY
+from prometheus_client.parser import text_string_to_metric_families
+from app.utils import metrics
+from app.utils.ipfs_backends import InfuraBackend
+from app.utils.outbound_metrics import InstrumentedClient, record_call
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# One uvicorn worker: records a call and a request in flight, then either
+# shuts down cleanly, exits abruptly, or stays up and renders /metrics
+WORKER = """
+import os, sys
+pid, ending = int(sys.argv[1]), sys.argv[2]
+if pid:
+    os.getpid = lambda: pid  # stand-in for the OS reusing an exited worker's PID
+from app.utils import metrics
+from app.utils.outbound_metrics import record_call
+from app.utils.request_metrics import http_requests_in_progress
+record_call("algod", "status", 0.5, ok=True)
+http_requests_in_progress.labels(method="GET", route="/api/tenders").inc()
+if ending == "shutdown":
+    metrics.mark_worker_exited(os.getpid())
+elif ending == "render":
+    sys.stdout.write(metrics.render().decode())
+"""
+
+
+def run_worker(directory, ending, pid=0):
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(directory)}
+    result = subprocess.run([sys.executable, "-c", WORKER, str(pid), ending],
+                            cwd=BACKEND, env=env, capture_output=True, text=True, check=True)
+    return result.stdout
+
+
+def outbound_count(service, endpoint, outcome):
+    labels = {"service": service, "endpoint": endpoint, "outcome": outcome}
+    return REGISTRY.get_sample_value("outbound_requests_total", labels) or 0
+
+
+def sample(text, name, **labels):
+    """Value of one sample in Prometheus text output"""
+    return next(
+        found.value
+        for family in text_string_to_metric_families(text)
+        for found in family.samples
+        if found.name == name and found.labels == labels
+    )
+
+
+def test_renders_counters_and_cumulative_histograms():
+    for seconds in (0.02, 0.5, 3.0):
+        record_call("algod-render", "status", seconds, ok=True)
+
+    text = metrics.render(multiproc_dir="").decode()
+    assert "# TYPE outbound_requests_total counter" in text
+    labels = {"service": "algod-render", "endpoint": "status"}
+    assert sample(text, "outbound_requests_total", outcome="ok", **labels) == 3
+    histogram = "outbound_request_duration_seconds"
+    assert sample(text, f"{histogram}_bucket", le="0.025", **labels) == 1
+    assert sample(text, f"{histogram}_bucket", le="1.0", **labels) == 2
+    assert sample(text, f"{histogram}_bucket", le="+Inf", **labels) == 3
+    assert sample(text, f"{histogram}_sum", **labels) == 3.52
+    assert sample(text, f"{histogram}_count", **labels) == 3
+
+
+def test_merges_workers_and_keeps_counts_across_exits_and_pid_reuse(tmp_path):
+    run_worker(tmp_path, "shutdown")
+    run_worker(tmp_path, "crash")
+    # Two workers in turn under one PID: the second continues the first's counts
+    run_worker(tmp_path, "crash", pid=4_000_000)
+    run_worker(tmp_path, "shutdown", pid=4_000_000)
+
+    text = run_worker(tmp_path, "render")
+    labels = {"service": "algod", "endpoint": "status"}
+    assert sample(text, "outbound_requests_total", outcome="ok", **labels) == 5
+    assert sample(text, "outbound_request_duration_seconds_count", **labels) == 5
+    # Only the rendering worker is still running
+    assert sample(text, "http_requests_in_progress", method="GET", route="/api/tenders") == 1
+
+
+def test_instrumented_client_records_each_sdk_method_and_its_outcome():
+    class Algod:
+        algod_address = "http://node"
+
+        def suggested_params(self):
+            return "params"
+
+        def account_info(self, address):
+            raise RuntimeError("account not found")
+
+    client = InstrumentedClient(Algod(), "algod-test")
+    assert client.algod_address == "http://node"
+    assert client.suggested_params() == "params"
+    try:
+        client.account_info("ADDR")
+    except RuntimeError:
+        pass
+    assert outbound_count("algod-test", "suggested_params", "ok") == 1
+    assert outbound_count("algod-test", "account_info", "error") == 1
+
+
+def test_ipfs_upload_attempts_are_recorded():
+    responses = [httpx.Response(503), httpx.Response(200, json={"Hash": "Qm"})]
+    backend = InfuraBackend(
+        backoff_seconds=0, max_retries=1,
+        transport=httpx.MockTransport(lambda request: responses.pop(0))
+    )
+    before = {outcome: outbound_count("ipfs", "/api/v0/add", outcome) for outcome in ("ok", "error")}
+
+    assert asyncio.run(backend.add(b"{}")) == "Qm"
+    for outcome in ("ok", "error"):
+        assert outbound_count("ipfs", "/api/v0/add", outcome) == before[outcome] + 1
@@ -0,0 +1,88 @@
+"""
+Schema migrations: fresh, unversioned and out-of-date databases
+
+Run from backend/: python -m pytest app/tests
+"""
+
+import asyncio
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from app import migrations
+from app.database import Base
+from app.migrations import (
+    BASELINE_TABLES, MIGRATIONS, SCHEMA_VERSION, SchemaVersionError,
+    check_schema_version, frozen_metadata, run_migrations,
+)
+
+
+@pytest.fixture(autouse=True)
+def forget_verified_version(monkeypatch):
+    monkeypatch.setattr(migrations, "_verified_version", None)
+
+
+def make_engine(tmp_path):
+    return create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'm.db'}")
+
+
+def schema(engine):
+    async def read():
+        async with engine.connect() as conn:
+            return await conn.run_sync(lambda sync: {
+                name: {column["name"] for column in inspect(sync).get_columns(name)}
+                for name in inspect(sync).get_table_names()
+            })
+    return asyncio.run(read())
+
+
+def test_fresh_database_is_migrated_to_the_models(tmp_path):
+    engine = make_engine(tmp_path)
+    with pytest.raises(SchemaVersionError):
+        asyncio.run(check_schema_version(engine))
+
+    assert asyncio.run(run_migrations(engine)) == [version for version, _, _ in MIGRATIONS]
+    assert asyncio.run(run_migrations(engine)) == []
+    assert asyncio.run(check_schema_version(engine)) == SCHEMA_VERSION
+
+    # Frozen migrations and models must agree; a model change needs a new migration
+    tables = schema(engine)
+    for table in Base.metadata.sorted_tables:
+        assert tables[table.name] == {column.name for column in table.columns}, table.name
+
+
+def test_unversioned_database_is_adopted_as_baseline(tmp_path):
+    engine = make_engine(tmp_path)
+
+    async def create_unversioned():
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                frozen_metadata.create_all,
+                tables=[frozen_metadata.tables[name] for name in BASELINE_TABLES]
+            )
+            await conn.execute(text("INSERT INTO users (name, email, password_hash, role) VALUES ('a', 'a@x', 'h', 'CITIZEN')"))
+
+    asyncio.run(create_unversioned())
+    with pytest.raises(SchemaVersionError, match="version 0"):
+        asyncio.run(check_schema_version(engine))
+
+    assert asyncio.run(run_migrations(engine)) == [version for version, _, _ in MIGRATIONS[1:]]
+    assert asyncio.run(check_schema_version(engine)) == SCHEMA_VERSION
+
+    async def count_users():
+        async with engine.connect() as conn:
+            return (await conn.execute(text("SELECT count(*) FROM users"))).scalar()
+
+    assert asyncio.run(count_users()) == 1
+
+
+def test_out_of_date_database_is_refused_until_migrated(tmp_path, monkeypatch):
+    engine = make_engine(tmp_path)
+    monkeypatch.setattr(migrations, "MIGRATIONS", MIGRATIONS[:2])
+    assert asyncio.run(run_migrations(engine)) == [1, 2]
+    monkeypatch.undo()
+    migrations._verified_version = None
+
+    with pytest.raises(SchemaVersionError, match=f"version 2, application requires {SCHEMA_VERSION}"):
+        asyncio.run(check_schema_version(engine))
+    assert asyncio.run(run_migrations(engine)) == [version for version, _, _ in MIGRATIONS[2:]]
+    assert asyncio.run(check_schema_version(engine)) == SCHEMA_VERSION
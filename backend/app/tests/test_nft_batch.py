@@ -0,0 +1,37 @@
+"""
+Batch NFT minting builds atomic groups from one set of suggested params
+
+Run from backend/: python -m pytest app/tests
+"""
+
+import asyncio
+from algosdk.encoding import encode_address
+from app.services.nft_service import NFTService
+from app.tests.fake_ledger import FakeLedger
+
+CREATOR = encode_address(bytes([1]) * 32)
+
+
+def test_groups_of_sixteen_share_params_and_group_ids():
+    ledger = FakeLedger()
+    service = NFTService()
+    service.algod_client = ledger
+    items = [
+        {
+            "name": f"FairLens-1-M{index}",
+            "unit_name": "FLNFT",
+            "metadata": {},
+            "metadata_url": f"ipfs://cid{index}#arc3",
+            "metadata_hash": bytes(32),
+        }
+        for index in range(20)
+    ]
+
+    groups = asyncio.run(service.mint_nft_batch(CREATOR, items))
+
+    assert [len(group) for group in groups] == [16, 4]
+    assert ledger.suggested_params_calls == 1
+    for group in groups:
+        assert len({txn.group for txn in group}) == 1
+    assert groups[0][0].group != groups[1][0].group
+    assert len({txn.get_txid() for group in groups for txn in group}) == 20
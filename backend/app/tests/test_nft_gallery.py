@@ -0,0 +1,75 @@
+"""
+NFT gallery page latency on a cold cache: asset params and metadata are
+fetched with bounded concurrency instead of one at a time
+
+Run from backend/: python -m pytest app/tests
+"""
+
+import asyncio
+import time
+import httpx
+from algosdk import account
+from app.routes import nft
+from app.services.blockchain import blockchain_service
+from app.services.nft_status import NFTStatusCache
+from app.tests.route_harness import RouteHarness
+from app.tests.test_nft_status import SlowAlgod
+from app.utils.cid import compute_cid
+from app.utils.metadata_cache import MetadataCache
+
+PAGE = 40
+DELAY = 0.05
+
+
+class FakeIndexer:
+    def lookup_account_assets(self, address, limit=None, next_page=None):
+        return {"assets": [{"asset-id": asset_id, "amount": 1} for asset_id in range(1, PAGE + 1)]}
+
+
+class SlowAssets(SlowAlgod):
+    """FairLens NFTs, each pointing at its own metadata document"""
+
+    def asset_info(self, asset_id):
+        info = super().asset_info(asset_id)
+        info["params"].update({"unit-name": "FLNFT", "url": f"ipfs://{compute_cid(document(asset_id))}#arc3"})
+        return info
+
+
+def document(asset_id: int) -> bytes:
+    return f'{{"name":"FairLens Contract #{asset_id}"}}'.encode()
+
+
+def test_cold_page_fans_out_with_bounded_concurrency(tmp_path, monkeypatch):
+    algod = SlowAssets(delay=DELAY)
+    documents = {compute_cid(document(asset_id)): document(asset_id) for asset_id in range(1, PAGE + 1)}
+    gateway = {"in_flight": 0, "peak": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        gateway["in_flight"] += 1
+        gateway["peak"] = max(gateway["peak"], gateway["in_flight"])
+        await asyncio.sleep(DELAY)
+        gateway["in_flight"] -= 1
+        return httpx.Response(200, content=documents[request.url.path.rsplit("/", 1)[-1]])
+
+    monkeypatch.setattr(blockchain_service, "algod_client", algod)
+    monkeypatch.setattr(blockchain_service, "indexer_client", FakeIndexer())
+    monkeypatch.setattr(nft, "nft_status_cache", NFTStatusCache(indexer_client=FakeIndexer(), max_concurrency=8))
+    monkeypatch.setattr(nft, "metadata_cache", MetadataCache(
+        directory=str(tmp_path / "metadata"), gateway="https://gw.test/ipfs/",
+        transport=httpx.MockTransport(handler)
+    ))
+    harness = RouteHarness(tmp_path, nft=nft.router)
+
+    with harness.client() as client:
+        started = time.monotonic()
+        response = client.get(f"/api/nft/by-address/{account.generate_account()[1]}?limit={PAGE}")
+        elapsed = time.monotonic() - started
+
+    assert response.status_code == 200
+    items = response.json()["nfts"]
+    assert [item["nft_id"] for item in items] == list(range(1, PAGE + 1))
+    assert items[4]["metadata"] == {"name": "FairLens Contract #5"}
+    assert 1 < algod.peak <= 8  # the default thread pool may allow fewer
+    assert gateway["peak"] == nft._GALLERY_METADATA_CONCURRENCY
+    # Five waves of algod reads and five of gateway fetches, not 2 * PAGE in a row
+    assert elapsed < PAGE * DELAY
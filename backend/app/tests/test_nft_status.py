@@ -0,0 +1,125 @@
+"""
+NFT status entries live until an asset config transaction is observed
+
+Run from backend/: python -m pytest app/tests
+"""
+
+import asyncio
+import threading
+import time
+from app.services.nft_status import NFTStatusCache
+
+
+class FakeIndexer:
+    def __init__(self):
+        self.round = 100
+        self.transactions = []
+
+    def health(self):
+        return {"round": self.round}
+
+    def search_transactions(self, txn_type=None, min_round=None, max_round=None, limit=None, next_page=None):
+        return {"transactions": [
+            txn for txn in self.transactions
+            if txn["tx-type"] == txn_type and min_round <= txn["confirmed-round"] <= max_round
+        ]}
+
+
+class SlowAlgod:
+    """Blocking asset_info, like algosdk's client; records how many run at once"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def asset_info(self, asset_id):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        return {"index": asset_id, "params": {"name": f"asset-{asset_id}", "total": 1}}
+
+
+class FakeSession:
+    def __init__(self):
+        self.queries = 0
+
+    async def execute(self, statement):
+        self.queries += 1
+
+        class Result:
+            def all(self):
+                return [(1, 7)]  # asset 1 belongs to contract 7
+
+        return Result()
+
+
+def test_invalidates_only_reconfigured_assets(monkeypatch):
+    from app.services import nft_service as nft_service_module
+
+    lookups = []
+
+    async def get_nft_info(asset_id):
+        lookups.append(asset_id)
+        return {"asset_id": asset_id, "name": f"asset-{asset_id}"}
+
+    monkeypatch.setattr(nft_service_module.nft_service, "get_nft_info", get_nft_info)
+    indexer, db = FakeIndexer(), FakeSession()
+    cache = NFTStatusCache(indexer_client=indexer)
+
+    async def scenario():
+        await cache.observe_once()  # sets the watermark
+        first = await cache.get(db, 1)
+        await cache.get(db, 1)
+        await cache.get(db, 2)
+        assert first.contract_id == 7
+        assert (lookups, db.queries) == ([1, 2], 2)
+
+        indexer.round = 105
+        indexer.transactions.append({"tx-type": "acfg", "confirmed-round": 103,
+                                     "asset-config-transaction": {"asset-id": 2}})
+        assert await cache.observe_once() == 1
+        await cache.get(db, 1)
+        await cache.get(db, 2)
+        assert lookups == [1, 2, 2]
+
+        # Already scanned rounds are not reported again
+        indexer.round = 110
+        assert await cache.observe_once() == 0
+
+    asyncio.run(scenario())
+
+
+def test_misses_are_read_off_the_event_loop_with_bounded_concurrency(monkeypatch):
+    from app.services.blockchain import blockchain_service
+
+    algod = SlowAlgod(delay=0.05)
+    monkeypatch.setattr(blockchain_service, "algod_client", algod)
+    cache = NFTStatusCache(indexer_client=FakeIndexer(), max_concurrency=4)
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.create_task(ticker())
+        started = time.monotonic()
+        entries = await cache.get_many(FakeSession(), range(8))
+        elapsed = time.monotonic() - started
+        ticking.cancel()
+
+        assert sorted(entries) == list(range(8))
+        assert entries[3].asset_info["name"] == "asset-3"
+        assert algod.peak == 4
+        assert elapsed < 8 * algod.delay / 2  # two rounds of four, not eight in a row
+        assert ticks >= 5  # the loop kept running while algod was read
+
+    asyncio.run(scenario())
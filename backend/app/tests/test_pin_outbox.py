@@ -0,0 +1,138 @@
+"""
+Pin outbox retries and single delivery, against a SQLite database
+
+Run from backend/: python -m pytest app/tests
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from app.migrations import run_migrations
+from app.models.ipfs_pin import PinStatus
+from app.services.pin_outbox import PinOutbox
+from app.utils.cid import compute_cid
+
+
+class FlakyIPFS:
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.uploads = []
+
+    async def ensure_pinned(self, content: bytes, cid: str) -> bool:
+        self.uploads.append(cid)
+        if self.failures:
+            self.failures -= 1
+            return False
+        return True
+
+
+def make_due(pin):
+    pin.next_attempt_at = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+
+def test_retries_until_pinned_and_dedupes_by_cid(tmp_path):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'p.db'}")
+        await run_migrations(engine)
+        ipfs = FlakyIPFS(failures=1)
+        outbox = PinOutbox(ipfs=ipfs, max_attempts=3, backoff_seconds=60)
+        content = b'{"name":"proof"}'
+        cid = compute_cid(content)
+
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            pin = await outbox.enqueue(session, content, cid)
+            assert (await outbox.enqueue(session, content, cid)).id == pin.id
+            await session.commit()
+
+            assert await outbox.process_once(session) == 0
+            assert pin.status == PinStatus.PENDING and pin.attempts == 1
+
+            # Backed off: not due yet
+            assert await outbox.process_once(session) == 0
+            assert len(ipfs.uploads) == 1
+
+            make_due(pin)
+            await session.commit()
+            assert await outbox.process_once(session) == 1
+            assert pin.status == PinStatus.PINNED
+            assert ipfs.uploads == [cid, cid]
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_marks_failed_after_max_attempts_and_requeues(tmp_path):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'p.db'}")
+        await run_migrations(engine)
+        outbox = PinOutbox(ipfs=FlakyIPFS(failures=5), max_attempts=2, backoff_seconds=0)
+
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            pin = await outbox.enqueue(session, b"{}", compute_cid(b"{}"))
+            await session.commit()
+            for _ in range(2):
+                make_due(pin)
+                await session.commit()
+                await outbox.process_once(session)
+            assert pin.status == PinStatus.FAILED
+
+            await outbox.enqueue(session, b"{}", pin.cid)
+            assert (pin.status, pin.attempts) == (PinStatus.PENDING, 0)
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_workers_claim_a_row_once(tmp_path):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'p.db'}")
+        await run_migrations(engine)
+        ipfs = FlakyIPFS(failures=0)
+        outbox = PinOutbox(ipfs=ipfs)
+
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            await outbox.enqueue(session, b"{}", compute_cid(b"{}"))
+            await session.commit()
+
+        async def worker():
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                return await outbox.process_once(session)
+
+        assert sorted(await asyncio.gather(worker(), worker())) == [0, 1]
+        assert len(ipfs.uploads) == 1
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_enqueue_of_one_cid_returns_the_existing_row(tmp_path):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'p.db'}")
+        await run_migrations(engine)
+        outbox = PinOutbox(ipfs=FlakyIPFS(failures=0))
+        content = b'{"name":"proof"}'
+        cid = compute_cid(content)
+
+        async with AsyncSession(engine, expire_on_commit=False) as first, \
+                AsyncSession(engine, expire_on_commit=False) as second:
+            # The second request reads before the first one commits its row
+            read = outbox.get
+            misses = []
+
+            async def stale_get(db, wanted):
+                if db is second and not misses:
+                    misses.append(wanted)
+                    return None
+                return await read(db, wanted)
+
+            outbox.get = stale_get
+            pin = await outbox.enqueue(first, content, cid)
+            await first.commit()
+
+            duplicate = await outbox.enqueue(second, content, cid)
+            await second.commit()
+            assert misses == [cid]
+            assert duplicate.id == pin.id
+        await engine.dispose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,78 @@
+"""
+Preflight against the in-memory ledger
+
+Run from backend/: python -m pytest app/tests
+"""
+
+import asyncio
+from algosdk import transaction
+from algosdk.encoding import encode_address
+from app.services.preflight import PreflightService
+from app.tests.fake_ledger import FakeLedger
+
+ALICE = encode_address(bytes([1]) * 32)
+BOB = encode_address(bytes([2]) * 32)
+
+
+def make_service():
+    ledger = FakeLedger()
+    ledger.fund(ALICE, 1_000_000)
+    return ledger, PreflightService(algod_client=ledger, round_window=10)
+
+
+def payment(ledger, amount):
+    return transaction.PaymentTxn(ALICE, ledger.suggested_params(), BOB, amount)
+
+
+def test_reports_success_and_failure_reason():
+    ledger, service = make_service()
+
+    ok = asyncio.run(service.preflight(payment(ledger, 100_000)))
+    assert ok.would_succeed is True
+    assert ok.round == ledger.round
+
+    overdraft = asyncio.run(service.preflight(payment(ledger, 5_000_000)))
+    assert overdraft.would_succeed is False
+    assert "below min" in overdraft.failure_reason
+    assert overdraft.failed_at == [0]
+
+
+def test_caches_per_group_within_round_window():
+    ledger, service = make_service()
+    txn = payment(ledger, 100_000)
+
+    asyncio.run(service.preflight(txn))
+    again = asyncio.run(service.preflight(txn))
+    assert again.cached is True
+    assert ledger.simulate_calls == 1
+
+    # A later simulation moves the known round into the next window
+    ledger.advance(10)
+    asyncio.run(service.preflight(payment(ledger, 1)))
+    fresh = asyncio.run(service.preflight(txn))
+    assert fresh.cached is False
+    assert ledger.simulate_calls == 3
+
+
+def test_simulate_errors_are_not_fatal():
+    class Offline:
+        def simulate_transactions(self, request):
+            raise ConnectionError("algod down")
+
+    ledger = FakeLedger()
+    result = asyncio.run(PreflightService(algod_client=Offline()).preflight(payment(ledger, 1)))
+    assert result.would_succeed is None
+    assert "algod down" in result.failure_reason
+
+
+def test_unexpected_simulate_responses_are_not_fatal():
+    class Malformed:
+        def simulate_transactions(self, request):
+            return {"last-round": 5}  # no txn-groups
+
+    ledger = FakeLedger()
+    service = PreflightService(algod_client=Malformed())
+    result = asyncio.run(service.preflight(payment(ledger, 1)))
+    assert result.would_succeed is None
+    assert "txn-groups" in result.failure_reason
+    assert not service._entries
@@ -0,0 +1,70 @@
+"""
+Per-request SQL statement counting, the repeated-statement warning and the
+DEBUG X-DB headers
+
+Run from backend/: python -m pytest app/tests
+"""
+
+import asyncio
+import logging
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.config import settings
+from app.utils.query_stats import QueryStats, current_query_stats, finish_request, instrument_engine
+from app.utils.request_metrics import MetricsMiddleware
+
+
+def test_counts_statements_of_the_current_request_and_warns_on_repeats(tmp_path, caplog):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'q.db'}")
+        instrument_engine(engine.sync_engine)
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 0"))  # outside any request
+
+            stats = QueryStats()
+            token = current_query_stats.set(stats)
+            try:
+                for tender_id in range(3):
+                    await conn.execute(text("SELECT :id"), {"id": tender_id})
+                await conn.execute(text("SELECT 1 + 1"))
+            finally:
+                current_query_stats.reset(token)
+        await engine.dispose()
+        return stats
+
+    stats = asyncio.run(scenario())
+    assert stats.statements == 4
+    assert stats.shapes["SELECT ?"] == 3
+    assert stats.seconds > 0
+
+    with caplog.at_level(logging.WARNING, logger="app.utils.query_stats"):
+        finish_request(stats, "GET", "/api/tenders", threshold=3)
+        assert not caplog.records
+        finish_request(stats, "GET", "/api/tenders", threshold=2)
+    assert "ran the same statement 3 times" in caplog.records[0].getMessage()
+
+
+def test_db_headers_are_left_off_streamed_responses(monkeypatch):
+    monkeypatch.setattr(settings, "DEBUG", True)
+
+    def make_app(headers):
+        async def app(scope, receive, send):
+            current_query_stats.get().record("SELECT 1", 0.001)
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": b"{}"})
+        return MetricsMiddleware(app)
+
+    def response_headers(app):
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": "/"}
+        asyncio.run(app(scope, None, send))
+        return dict(sent[0]["headers"])
+
+    fixed = response_headers(make_app([(b"content-length", b"2")]))
+    assert fixed[b"x-db-queries"] == b"1"
+    streamed = response_headers(make_app([(b"content-type", b"text/csv")]))
+    assert b"x-db-queries" not in streamed
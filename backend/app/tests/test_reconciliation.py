@@ -0,0 +1,225 @@
+"""
+Incremental reconciliation against the in-memory ledger and a SQLite database
+
+Run from backend/: python -m pytest app/tests
+"""
+
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from app.contracts.milestone_box import MilestoneBox, MilestoneBoxStatus, milestone_box_name
+from app.migrations import run_migrations
+from app.models import Contract, Milestone, Tender, Transaction, User
+from app.models.milestone import MilestoneStatus
+from app.models.reconciliation import ReconciliationState
+from app.models.user import UserRole
+from app.services.app_state import AppStateService
+from app.services.reconciliation import ReconciliationService
+from app.tests.fake_ledger import FakeLedger
+
+APP_ID = 1234
+
+
+class FakeIndexer:
+    def __init__(self, created_round: int = 990):
+        self.transactions = []
+        self.searches = 0
+        self.created_round = created_round
+
+    def applications(self, application_id, include_all=False):
+        return {"application": {"id": application_id, "created-at-round": self.created_round}}
+
+    def search_transactions(self, txn_type=None, application_id=None, min_round=None, max_round=None,
+                            limit=None, next_page=None):
+        self.searches += 1
+        return {"transactions": [
+            txn for txn in self.transactions
+            if txn["application-transaction"]["application-id"] == application_id
+            and min_round <= txn["confirmed-round"] <= max_round
+        ]}
+
+
+def release_call(tx_id: str, confirmed_round: int, app_id: int = APP_ID):
+    return {
+        "id": tx_id, "confirmed-round": confirmed_round,
+        "application-transaction": {"application-id": app_id},
+        "inner-txns": [{"tx-type": "pay", "payment-transaction": {"amount": 1_000_000}}],
+    }
+
+
+async def seed(session: AsyncSession) -> int:
+    gov = User(name="g", email="g@x.com", password_hash="x", role=UserRole.GOVERNMENT)
+    session.add(gov)
+    await session.flush()
+    tender = Tender(title="t", description="d", location="l", category="roads",
+                    budget=Decimal("10"), deadline=datetime(2026, 1, 1), gov_id=gov.id)
+    session.add(tender)
+    await session.flush()
+    contract = Contract(tender_id=tender.id, contractor_id=gov.id, gov_id=gov.id,
+                        total_amount=Decimal("3"), app_id=APP_ID)
+    session.add(contract)
+    await session.flush()
+    for index in range(2):
+        session.add(Milestone(contract_id=contract.id, index=index, title=f"m{index}",
+                              amount=Decimal("1"), deadline=datetime(2026, 1, 1)))
+    await session.commit()
+    return contract.id
+
+
+def test_corrects_lagging_rows_and_only_rechecks_active_apps(tmp_path):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'r.db'}")
+        await run_migrations(engine)
+        ledger, indexer = FakeLedger(), FakeIndexer()
+        boxes = ledger.app_boxes.setdefault(APP_ID, {})
+        boxes[milestone_box_name(0)] = MilestoneBox(1, 1, MilestoneBoxStatus.VERIFIED).encode()
+        boxes[milestone_box_name(1)] = MilestoneBox(1, 1).encode()
+        service = ReconciliationService(AppStateService(algod_client=ledger), indexer_client=indexer)
+
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            contract_id = await seed(session)
+
+            # First pass compares every contract and sets its watermark
+            stats = await service.run_once(session)
+            assert (stats.contracts_checked, stats.corrected, stats.mismatches) == (1, 1, 0)
+            milestone = (await session.execute(select(Milestone).where(Milestone.index == 0))).scalar_one()
+            assert milestone.status == MilestoneStatus.VERIFIED
+
+            # No calls since the watermark: nothing is read
+            ledger.advance(5)
+            reads = ledger.box_reads
+            stats = await service.run_once(session)
+            assert stats.contracts_checked == 0
+            assert ledger.box_reads == reads
+            state = await session.get(ReconciliationState, contract_id)
+            assert state.last_round == ledger.round
+
+            # A release call pays milestone 0 on chain
+            ledger.advance(2)
+            boxes[milestone_box_name(0)] = MilestoneBox(1, 1, MilestoneBoxStatus.PAID).encode()
+            indexer.transactions.append(release_call("PAYTX", ledger.round))
+            stats = await service.run_once(session)
+            assert stats.contracts_checked == 1
+            await session.refresh(milestone)
+            assert milestone.status == MilestoneStatus.PAID
+            payment = (await session.execute(select(Transaction).where(Transaction.tx_id == "PAYTX"))).scalar_one()
+            assert payment.amount == "1000000"
+
+            # The database claims progress the chain has not seen: flagged, not reverted
+            other = (await session.execute(select(Milestone).where(Milestone.index == 1))).scalar_one()
+            other.status = MilestoneStatus.PAID
+            state.checked_at = datetime(2000, 1, 1)  # edit lands after the last check
+            await session.commit()
+            ledger.advance(1)
+            stats = await service.run_once(session)
+            assert stats.mismatches == 1
+            await session.refresh(other)
+            assert other.status == MilestoneStatus.PAID
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_overlapping_passes_insert_one_state_row_and_query_per_app(tmp_path):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'r.db'}")
+        await run_migrations(engine)
+        ledger, indexer = FakeLedger(), FakeIndexer()
+        boxes = ledger.app_boxes.setdefault(APP_ID, {})
+        for index in range(2):
+            boxes[milestone_box_name(index)] = MilestoneBox(1, 1).encode()
+        service = ReconciliationService(AppStateService(algod_client=ledger), indexer_client=indexer)
+
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            contract_id = await seed(session)
+
+        # The background worker and the admin trigger start a pass at once
+        async with AsyncSession(engine) as worker, AsyncSession(engine) as admin:
+            await asyncio.gather(service.run_once(worker), service.run_once(admin))
+
+        async with AsyncSession(engine) as session:
+            states = (await session.execute(select(ReconciliationState))).scalars().all()
+            assert [state.contract_id for state in states] == [contract_id]
+
+            ledger.advance(3)
+            indexer.transactions.append({
+                "id": "OTHER", "confirmed-round": ledger.round,
+                "application-transaction": {"application-id": APP_ID + 1},
+            })
+            searches = indexer.searches
+            stats = await service.run_once(session)
+            assert stats.contracts_checked == 0
+            assert indexer.searches == searches + 1
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_first_pass_records_payments_made_before_the_contract_was_reconciled(tmp_path):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'r.db'}")
+        await run_migrations(engine)
+        ledger, indexer = FakeLedger(), FakeIndexer(created_round=100)
+        boxes = ledger.app_boxes.setdefault(APP_ID, {})
+        boxes[milestone_box_name(0)] = MilestoneBox(1, 1, MilestoneBoxStatus.PAID).encode()
+        boxes[milestone_box_name(1)] = MilestoneBox(1, 1).encode()
+        indexer.transactions.append(release_call("PAYTX", 150))
+        indexer.transactions.append(release_call("LATETX", 800))
+        service = ReconciliationService(
+            AppStateService(algod_client=ledger), indexer_client=indexer, max_scan_rounds=500
+        )
+
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            contract_id = await seed(session)
+
+            # Scanned from the app's creation, one window per pass
+            stats = await service.run_once(session)
+            recorded = (await session.execute(select(Transaction.tx_id))).scalars().all()
+            assert recorded == ["PAYTX"]
+            state = await session.get(ReconciliationState, contract_id)
+            assert state.last_round == 599
+            assert stats.lag_rounds == ledger.round - 599
+
+            stats = await service.run_once(session)
+            recorded = (await session.execute(select(Transaction.tx_id))).scalars().all()
+            assert sorted(recorded) == ["LATETX", "PAYTX"]
+            await session.refresh(state)
+            assert state.last_round == ledger.round
+            assert stats.lag_rounds == 0
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_without_an_indexer_watermarks_do_not_pass_unscanned_rounds(tmp_path, monkeypatch):
+    from app.services.blockchain import blockchain_service
+    monkeypatch.setattr(blockchain_service, "indexer_client", None)
+
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'r.db'}")
+        await run_migrations(engine)
+        ledger, indexer = FakeLedger(), FakeIndexer()
+        boxes = ledger.app_boxes.setdefault(APP_ID, {})
+        for index in range(2):
+            boxes[milestone_box_name(index)] = MilestoneBox(1, 1).encode()
+        service = ReconciliationService(AppStateService(algod_client=ledger))
+
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            contract_id = await seed(session)
+            ledger.advance(5)
+            stats = await service.run_once(session)
+            assert stats.contracts_checked == 1
+            state = await session.get(ReconciliationState, contract_id)
+            assert state.last_round == 0
+
+            # Once an indexer is back, the unscanned rounds are scanned
+            service._indexer_client = indexer
+            indexer.transactions.append(release_call("PAYTX", ledger.round))
+            await service.run_once(session)
+            payment = (await session.execute(select(Transaction).where(Transaction.tx_id == "PAYTX"))).scalar_one()
+            assert payment.contract_id == contract_id
+        await engine.dispose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,104 @@
+"""
+In-process response cache with strong ETags for read-heavy public endpoints
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+from fastapi import Request, Response
+import hashlib
+import time
+from app.config import settings
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    created_at: float
+
+
+class ResponseCache:
+    """
+    LRU cache of pre-rendered JSON bodies keyed by normalized parameters
+
+    Entries are dropped explicitly by write endpoints via clear(). The TTL is a
+    safety net for other uvicorn workers, whose caches are not notified.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+
+    @staticmethod
+    def make_key(namespace: str, **params: Any) -> str:
+        """Build a cache key that does not depend on query string ordering"""
+        normalized = "&".join(
+            f"{name}={'' if value is None else getattr(value, 'value', value)}"
+            for name, value in sorted(params.items())
+        )
+        return f"{namespace}?{normalized}"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.created_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, body: bytes) -> CachedResponse:
+        """Store a pre-rendered JSON body and compute its strong ETag"""
+        entry = CachedResponse(
+            body=body,
+            etag=f'"{hashlib.sha256(body).hexdigest()}"',
+            created_at=time.monotonic()
+        )
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def _opaque_tag(entity_tag: str) -> str:
+    # Weak comparison ignores the W/ prefix (RFC 9110, section 8.8.3.2)
+    entity_tag = entity_tag.strip()
+    return entity_tag[2:] if entity_tag.startswith("W/") else entity_tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header value against an ETag
+
+    If-None-Match uses weak comparison, so W/"x" matches "x" and a client
+    that received a weakened tag (e.g. through a compressing proxy) still
+    revalidates.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {_opaque_tag(value) for value in if_none_match.split(",")}
+    return _opaque_tag(etag) in candidates
+
+
+def cached_json_response(request: Request, entry: CachedResponse) -> Response:
+    """Return 304 when the client already holds this ETag, otherwise the cached body"""
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": "public, no-cache",
+    }
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+# Global instance for public tender reads
+tender_cache = ResponseCache(ttl_seconds=settings.TENDER_CACHE_TTL_SECONDS)
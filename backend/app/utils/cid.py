@@ -0,0 +1,75 @@
+"""
+Canonical JSON serialization and local IPFS CID computation
+
+A metadata document is serialized once by canonical_json; those exact bytes
+are hashed for the ARC-3 metadata hash, addressed by compute_cid, and uploaded.
+compute_cid reproduces what `ipfs add --cid-version=0` returns for a file
+that fits in one chunk: a dag-pb node wrapping a UnixFS file, hashed with
+SHA-256 and encoded as base58btc.
+
+Reference: https://github.com/ipfs/specs/blob/main/UNIXFS.md
+"""
+
+from typing import Any, Dict
+import hashlib
+import json
+
+# Default chunk size of `ipfs add`; larger files become a tree of nodes
+CHUNK_SIZE = 262144
+
+_UNIXFS_FILE = 2
+_SHA2_256 = 0x12
+_BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+
+def canonical_json(data: Dict[str, Any]) -> bytes:
+    """Serialize a document deterministically: sorted keys, no whitespace, UTF-8"""
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _length_delimited(field: int, payload: bytes) -> bytes:
+    return _varint(field << 3 | 2) + _varint(len(payload)) + payload
+
+
+def _base58(data: bytes) -> str:
+    number = int.from_bytes(data, "big")
+    encoded = ""
+    while number:
+        number, remainder = divmod(number, 58)
+        encoded = _BASE58_ALPHABET[remainder] + encoded
+    leading_zeros = len(data) - len(data.lstrip(b"\0"))
+    return _BASE58_ALPHABET[0] * leading_zeros + encoded
+
+
+def compute_cid(content: bytes) -> str:
+    """
+    Compute the CIDv0 IPFS assigns to a single-chunk file
+
+    Args:
+        content: File bytes, at most CHUNK_SIZE
+
+    Returns:
+        CIDv0 string ("Qm...")
+    """
+    if len(content) > CHUNK_SIZE:
+        raise ValueError(f"Content larger than one {CHUNK_SIZE}-byte chunk")
+
+    # UnixFS Data: Type = File, Data = content (omitted when empty), filesize
+    unixfs = _varint(1 << 3) + _varint(_UNIXFS_FILE)
+    if content:
+        unixfs += _length_delimited(2, content)
+    unixfs += _varint(3 << 3) + _varint(len(content))
+
+    # dag-pb PBNode with only the Data field (no links)
+    node = _length_delimited(1, unixfs)
+    multihash = bytes([_SHA2_256, 32]) + hashlib.sha256(node).digest()
+    return _base58(multihash)
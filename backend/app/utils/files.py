@@ -0,0 +1,25 @@
+"""
+File helpers
+"""
+
+import os
+import tempfile
+
+
+def atomic_write(path: str, content: bytes) -> None:
+    """
+    Write content to path so readers never see a partial file
+
+    The bytes go to a temporary file in the same directory, which is then
+    renamed over path. The directory is created if missing.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as temp_file:
+            temp_file.write(content)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
@@ -0,0 +1,36 @@
+"""
+Pooled httpx client bound to the running event loop
+"""
+
+from typing import Any, Optional
+import asyncio
+import httpx
+
+
+class LoopBoundClient:
+    """
+    One keep-alive httpx.AsyncClient per event loop
+
+    An AsyncClient cannot be shared across event loops (each asyncio.run in
+    scripts and tests starts a new one), so a new client is built whenever
+    the running loop changes.
+    """
+
+    def __init__(self, **client_kwargs: Any):
+        self._client_kwargs = client_kwargs
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def get(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(**self._client_kwargs)
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
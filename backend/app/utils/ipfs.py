@@ -1,13 +1,15 @@
 """
 IPFS integration for NFT metadata storage
-Supports Infura IPFS and Pinata
+Supports Infura IPFS, Pinata and a local blockstore (see app.utils.ipfs_backends)
 """
 
-import json
-import requests
+import httpx
 import logging
+from collections import OrderedDict
 from typing import Dict, Any, Optional
 from app.config import settings
+from app.utils.cid import canonical_json, compute_cid
+from app.utils.ipfs_backends import IPFSBackend, create_backend
 
 logger = logging.getLogger(__name__)
 
@@ -15,60 +17,96 @@ logger = logging.getLogger(__name__)
 class IPFSService:
     """IPFS service for storing metadata"""
     
-    def __init__(self):
-        self.ipfs_api_url = getattr(settings, 'IPFS_API_URL', 'https://ipfs.infura.io:5001')
-        self.ipfs_project_id = getattr(settings, 'IPFS_PROJECT_ID', '')
-        self.ipfs_project_secret = getattr(settings, 'IPFS_PROJECT_SECRET', '')
+    def __init__(
+        self,
+        backend: Optional[IPFSBackend] = None,
+        timeout_seconds: float = settings.IPFS_TIMEOUT_SECONDS,
+        max_retries: int = settings.IPFS_MAX_RETRIES,
+        backoff_seconds: float = 0.5,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        # Without an explicit backend, the one named by IPFS_BACKEND
+        if backend is None:
+            backend = create_backend(
+                settings.IPFS_BACKEND,
+                timeout_seconds=timeout_seconds,
+                max_retries=max_retries,
+                backoff_seconds=backoff_seconds,
+                transport=transport
+            )
+        self.backend = backend
         self.ipfs_gateway = getattr(settings, 'IPFS_GATEWAY', 'https://ipfs.io/ipfs/')
+        
+        # Content-addressed: a CID confirmed pinned never needs uploading again
+        self.max_pinned_entries = 4096
+        self._pinned: "OrderedDict[str, None]" = OrderedDict()
+    
+    async def aclose(self) -> None:
+        """Close the backend's pooled connections"""
+        await self.backend.aclose()
+    
+    async def upload_bytes(self, content: bytes, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Upload a file to IPFS and return CID
+        
+        HTTP backends retry transport errors and retryable responses up to
+        max_retries times with exponential backoff.
+        
+        Args:
+            content: File bytes, uploaded as-is
+            timeout: Seconds allowed per attempt (default: the backend's timeout)
+        
+        Returns:
+            IPFS CID (Content Identifier) or None
+        """
+        return await self.backend.add(content, timeout=timeout)
     
-    def upload_json(self, data: Dict[str, Any]) -> Optional[str]:
+    async def upload_json(self, data: Dict[str, Any], timeout: Optional[float] = None) -> Optional[str]:
         """
         Upload JSON data to IPFS and return CID
         
         Args:
-            data: Dictionary to upload as JSON
+            data: Dictionary to upload, serialized with canonical_json
+            timeout: Seconds allowed per attempt (default: timeout_seconds)
         
         Returns:
             IPFS CID (Content Identifier) or None
         """
-        try:
-            # Convert to JSON string
-            json_data = json.dumps(data, sort_keys=True)
-            
-            # Prepare request
-            files = {
-                'file': ('metadata.json', json_data, 'application/json')
-            }
-            
-            headers = {}
-            if self.ipfs_project_id and self.ipfs_project_secret:
-                # Infura IPFS authentication
-                import base64
-                auth = base64.b64encode(
-                    f"{self.ipfs_project_id}:{self.ipfs_project_secret}".encode()
-                ).decode()
-                headers['Authorization'] = f'Basic {auth}'
-            
-            # Upload to IPFS
-            response = requests.post(
-                f"{self.ipfs_api_url}/api/v0/add",
-                files=files,
-                headers=headers,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                cid = result.get('Hash')
-                logger.info(f"Uploaded to IPFS with CID: {cid}")
-                return cid
-            else:
-                logger.error(f"IPFS upload failed: {response.status_code} - {response.text}")
-                return None
-                
-        except Exception as e:
-            logger.error(f"Error uploading to IPFS: {e}")
-            return None
+        return await self.upload_bytes(canonical_json(data), timeout=timeout)
+    
+    def is_pinned(self, cid: str) -> bool:
+        return cid in self._pinned
+    
+    def mark_pinned(self, cid: str) -> None:
+        self._pinned[cid] = None
+        self._pinned.move_to_end(cid)
+        while len(self._pinned) > self.max_pinned_entries:
+            self._pinned.popitem(last=False)
+    
+    async def ensure_pinned(self, content: bytes, cid: Optional[str] = None) -> bool:
+        """
+        Upload content unless its CID is already pinned
+        
+        Args:
+            content: File bytes
+            cid: Locally computed CID of content (computed if omitted)
+        
+        Returns:
+            True if the content is pinned under that CID
+        """
+        cid = cid or compute_cid(content)
+        if self.is_pinned(cid):
+            return True
+        
+        uploaded = await self.upload_bytes(content)
+        if uploaded is None:
+            return False
+        if uploaded != cid:
+            # The provider chunked or encoded differently; the local CID is unresolvable
+            logger.error(f"IPFS returned CID {uploaded}, expected {cid}")
+            return False
+        self.mark_pinned(cid)
+        return True
     
     def get_ipfs_url(self, cid: str) -> str:
         """
@@ -0,0 +1,236 @@
+"""
+Storage backends behind IPFSService
+
+- InfuraBackend: Kubo-compatible `/api/v0/add` HTTP API (Infura, or a local node)
+- PinataBackend: Pinata pinning API
+- LocalBlockstoreBackend: content files on disk under their locally computed
+  CID, for offline development, tests and mint-path benchmarks
+
+Selected by settings.IPFS_BACKEND via create_backend().
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+import asyncio
+import base64
+import httpx
+import json
+import logging
+import os
+import time
+from app.config import settings
+from app.utils.cid import compute_cid
+from app.utils.files import atomic_write
+from app.utils.http_client import LoopBoundClient
+from app.utils.outbound_metrics import record_call
+
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying: rate limiting and provider-side failures
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class IPFSBackend(ABC):
+    """Adds content to IPFS and returns the CID the provider assigned"""
+
+    name = "base"
+
+    @abstractmethod
+    async def add(self, content: bytes, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Store and pin content
+
+        Args:
+            content: File bytes, stored as-is
+            timeout: Seconds allowed per attempt, for backends that make requests
+
+        Returns:
+            CIDv0 of the content, or None if it could not be stored
+        """
+
+    async def aclose(self) -> None:
+        """Release connections or other resources"""
+
+
+class HTTPBackend(IPFSBackend):
+    """Shared connection pooling, retries and call metrics for HTTP pinning APIs"""
+
+    endpoint = ""  # upload path, also the metrics endpoint label
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: Dict[str, str],
+        timeout_seconds: float = settings.IPFS_TIMEOUT_SECONDS,
+        max_retries: int = settings.IPFS_MAX_RETRIES,
+        backoff_seconds: float = 0.5,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.base_url = base_url
+        self.timeout_seconds = timeout_seconds
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self._client = LoopBoundClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout_seconds,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            transport=transport
+        )
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    @abstractmethod
+    async def _post(self, client: httpx.AsyncClient, content: bytes, timeout: float) -> httpx.Response:
+        """Send one upload request"""
+
+    @abstractmethod
+    def _cid(self, body: Dict[str, Any]) -> Optional[str]:
+        """CID from a successful upload response body"""
+
+    async def add(self, content: bytes, timeout: Optional[float] = None) -> Optional[str]:
+        # Transport errors and retryable responses are retried with exponential backoff
+        client = self._client.get()
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                await asyncio.sleep(self.backoff_seconds * 2 ** (attempt - 1))
+            started = time.perf_counter()
+            try:
+                response = await self._post(client, content, timeout or self.timeout_seconds)
+            except httpx.HTTPError as e:
+                record_call("ipfs", self.endpoint, time.perf_counter() - started, ok=False)
+                logger.warning(f"IPFS upload attempt {attempt + 1} failed: {e}")
+                continue
+            record_call("ipfs", self.endpoint, time.perf_counter() - started, ok=response.status_code == 200)
+
+            if response.status_code == 200:
+                cid = self._cid(response.json())
+                logger.info(f"Uploaded to IPFS ({self.name}) with CID: {cid}")
+                return cid
+            if response.status_code not in RETRY_STATUS_CODES:
+                logger.error(f"IPFS upload failed: {response.status_code} - {response.text}")
+                return None
+            logger.warning(f"IPFS upload attempt {attempt + 1} failed: {response.status_code}")
+
+        logger.error(f"IPFS upload failed after {self.max_retries + 1} attempts")
+        return None
+
+
+class InfuraBackend(HTTPBackend):
+    """Kubo `/api/v0/add`, with Infura project credentials when configured"""
+
+    name = "infura"
+    endpoint = "/api/v0/add"
+
+    def __init__(
+        self,
+        api_url: str = settings.IPFS_API_URL,
+        project_id: str = settings.IPFS_PROJECT_ID,
+        project_secret: str = settings.IPFS_PROJECT_SECRET,
+        **kwargs
+    ):
+        headers: Dict[str, str] = {}
+        if project_id and project_secret:
+            auth = base64.b64encode(f"{project_id}:{project_secret}".encode()).decode()
+            headers["Authorization"] = f"Basic {auth}"
+        super().__init__(api_url, headers, **kwargs)
+
+    async def _post(self, client: httpx.AsyncClient, content: bytes, timeout: float) -> httpx.Response:
+        return await client.post(
+            self.endpoint,
+            params={"cid-version": "0", "pin": "true"},
+            files={"file": ("metadata.json", content, "application/json")},
+            timeout=timeout
+        )
+
+    def _cid(self, body: Dict[str, Any]) -> Optional[str]:
+        return body.get("Hash")
+
+
+class PinataBackend(HTTPBackend):
+    """Pinata `pinFileToIPFS`, authenticated with a JWT"""
+
+    name = "pinata"
+    endpoint = "/pinning/pinFileToIPFS"
+
+    def __init__(
+        self,
+        api_url: str = settings.PINATA_API_URL,
+        jwt: str = settings.PINATA_JWT,
+        **kwargs
+    ):
+        headers = {"Authorization": f"Bearer {jwt}"} if jwt else {}
+        super().__init__(api_url, headers, **kwargs)
+
+    async def _post(self, client: httpx.AsyncClient, content: bytes, timeout: float) -> httpx.Response:
+        return await client.post(
+            self.endpoint,
+            files={"file": ("metadata.json", content, "application/json")},
+            # CIDv0, so the result matches compute_cid
+            data={"pinataOptions": json.dumps({"cidVersion": 0})},
+            timeout=timeout
+        )
+
+    def _cid(self, body: Dict[str, Any]) -> Optional[str]:
+        return body.get("IpfsHash")
+
+
+class LocalBlockstoreBackend(IPFSBackend):
+    """
+    Files on disk named by their CID
+
+    CIDs are computed with compute_cid, so they are the ones a real node
+    would return, and URLs minted against this backend stay valid once the
+    same content is pinned elsewhere. Limited to single-chunk content.
+    """
+
+    name = "local"
+
+    def __init__(self, directory: str = settings.IPFS_LOCAL_BLOCKSTORE_DIR):
+        self.directory = directory
+
+    def _path(self, cid: str) -> str:
+        return os.path.join(self.directory, cid)
+
+    def _write(self, cid: str, content: bytes) -> None:
+        # Content under a CID never changes, so an existing file is kept
+        if not os.path.exists(self._path(cid)):
+            atomic_write(self._path(cid), content)
+
+    async def add(self, content: bytes, timeout: Optional[float] = None) -> Optional[str]:
+        try:
+            cid = compute_cid(content)
+        except ValueError as e:
+            logger.error(f"Local blockstore cannot store content: {e}")
+            return None
+        await asyncio.to_thread(self._write, cid, content)
+        return cid
+
+    def get(self, cid: str) -> Optional[bytes]:
+        """Read stored content back, or None if the CID is not stored"""
+        try:
+            with open(self._path(cid), "rb") as stored:
+                return stored.read()
+        except FileNotFoundError:
+            return None
+
+
+def create_backend(name: str = settings.IPFS_BACKEND, **kwargs) -> IPFSBackend:
+    """
+    Build the backend named by settings.IPFS_BACKEND
+
+    Args:
+        name: "infura", "pinata" or "local"
+        **kwargs: Passed to HTTP backends (timeout_seconds, max_retries, ...)
+
+    Returns:
+        IPFSBackend instance
+    """
+    if name == "infura":
+        return InfuraBackend(**kwargs)
+    if name == "pinata":
+        return PinataBackend(**kwargs)
+    if name == "local":
+        return LocalBlockstoreBackend()
+    raise ValueError(f"Unknown IPFS backend: {name}")
@@ -0,0 +1,148 @@
+"""
+Disk-backed cache of NFT metadata fetched from an IPFS gateway, keyed by CID
+
+Content at a CID never changes, so entries never expire. The gallery endpoint
+is public and asset URLs are chosen by whoever minted the asset, so fetches
+are capped at IPFS_METADATA_MAX_BYTES, only CIDv0 single-chunk content is
+accepted, and a document is only stored after its bytes hash back to the
+CID and parse as a JSON object.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+import asyncio
+import httpx
+import json
+import logging
+import os
+import re
+import time
+from app.config import settings
+from app.utils.cid import CHUNK_SIZE, compute_cid
+from app.utils.files import atomic_write
+from app.utils.http_client import LoopBoundClient
+from app.utils.outbound_metrics import record_call
+
+logger = logging.getLogger(__name__)
+
+# ipfs://<cid>... or <gateway>/ipfs/<cid>...
+_CID_PATTERN = re.compile(r"(?:ipfs://|/ipfs/)([A-Za-z0-9]+)")
+# CIDv0: base58btc SHA-256 multihash, the only form compute_cid can check
+_CIDV0_PATTERN = re.compile(r"Qm[1-9A-HJ-NP-Za-km-z]{44}")
+
+
+def cid_from_url(url: Optional[str]) -> Optional[str]:
+    """Extract the CID from an ipfs:// or gateway URL (ARC-3 #arc3 suffix allowed)"""
+    if not url:
+        return None
+    match = _CID_PATTERN.search(url)
+    return match.group(1) if match else None
+
+
+class MetadataCache:
+    """JSON metadata by CID: memory, then disk, then the gateway"""
+
+    def __init__(
+        self,
+        directory: str = settings.IPFS_METADATA_CACHE_DIR,
+        gateway: str = settings.IPFS_GATEWAY,
+        timeout_seconds: float = settings.IPFS_TIMEOUT_SECONDS,
+        max_bytes: int = settings.IPFS_METADATA_MAX_BYTES,
+        max_memory_entries: int = 1024,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.directory = directory
+        self.gateway = gateway
+        # Larger content could not be verified against a CIDv0 anyway
+        self.max_bytes = min(max_bytes, CHUNK_SIZE)
+        self.max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._client = LoopBoundClient(timeout=timeout_seconds, transport=transport)
+
+    async def aclose(self) -> None:
+        """Close the pooled connections"""
+        await self._client.aclose()
+
+    def _path(self, cid: str) -> str:
+        return os.path.join(self.directory, f"{cid}.json")
+
+    def _read(self, cid: str) -> Optional[bytes]:
+        try:
+            with open(self._path(cid), "rb") as cached_file:
+                return cached_file.read()
+        except FileNotFoundError:
+            return None
+
+    def _remember(self, cid: str, metadata: Dict[str, Any]) -> None:
+        self._memory[cid] = metadata
+        self._memory.move_to_end(cid)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    async def _fetch(self, cid: str) -> Optional[bytes]:
+        """Download at most max_bytes from the gateway; None if larger or failed"""
+        async with self._client.get().stream("GET", f"{self.gateway}{cid}") as response:
+            response.raise_for_status()
+            declared = response.headers.get("content-length")
+            if declared and declared.isdigit() and int(declared) > self.max_bytes:
+                logger.warning(f"Metadata {cid} is {declared} bytes, over the {self.max_bytes}-byte limit")
+                return None
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body += chunk
+                if len(body) > self.max_bytes:
+                    logger.warning(f"Metadata {cid} exceeds the {self.max_bytes}-byte limit")
+                    return None
+            return bytes(body)
+
+    async def get(self, cid: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the JSON document stored at a CID
+
+        Only CIDv0 content is accepted: its CID can be recomputed from the
+        bytes, so nothing is cached that the CID does not identify.
+
+        Args:
+            cid: IPFS Content Identifier
+
+        Returns:
+            Parsed JSON object, or None if it could not be fetched or verified
+        """
+        if not _CIDV0_PATTERN.fullmatch(cid):
+            return None
+        if cid in self._memory:
+            self._memory.move_to_end(cid)
+            return self._memory[cid]
+
+        # Files on disk were verified before they were written
+        content = await asyncio.to_thread(self._read, cid)
+        verified = content is not None
+        if content is None:
+            started = time.perf_counter()
+            try:
+                content = await self._fetch(cid)
+            except httpx.HTTPError as e:
+                logger.warning(f"Could not fetch metadata {cid}: {e}")
+                content = None
+            record_call("ipfs_gateway", "/ipfs/{cid}", time.perf_counter() - started, ok=content is not None)
+            if content is None:
+                return None
+            if compute_cid(content) != cid:
+                logger.warning(f"Gateway returned content that does not match {cid}")
+                return None
+
+        try:
+            metadata = json.loads(content)
+        except ValueError:
+            metadata = None
+        if not isinstance(metadata, dict):
+            logger.warning(f"Metadata at {cid} is not a JSON object")
+            return None
+        if not verified:
+            await asyncio.to_thread(atomic_write, self._path(cid), content)
+        self._remember(cid, metadata)
+        return metadata
+
+
+# Global instance
+metadata_cache = MetadataCache()
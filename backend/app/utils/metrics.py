@@ -0,0 +1,90 @@
+"""
+Prometheus metrics for the app, backed by prometheus_client
+
+Metrics are defined with the helpers below on prometheus_client's default
+registry. With several uvicorn workers, set PROMETHEUS_MULTIPROC_DIR to a
+directory shared by the workers and emptied before the server starts:
+prometheus_client then keeps each process's values in its own files there, and
+/metrics merges them with MultiProcessCollector. Counters and histograms are
+summed across every process that has written (a worker that exits keeps its
+counts, and a new worker that reuses its PID carries on from them); gauges
+are summed across live workers only.
+
+Reference: https://prometheus.github.io/client_python/multiprocess/
+"""
+
+from typing import Sequence
+import glob
+import logging
+import os
+import re
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client import multiprocess
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Seconds; suited to API requests and node/gateway calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# Live gauge files are named <type>_<mode>_<pid>.db
+_LIVE_GAUGE_FILE = re.compile(r"gauge_live\w*_(\d+)\.db$")
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return Counter(name, documentation, labelnames)
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    # livesum: only workers that are still running count towards the total
+    return Gauge(name, documentation, labelnames, multiprocess_mode="livesum")
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    buckets: Sequence[float] = DEFAULT_BUCKETS
+) -> Histogram:
+    return Histogram(name, documentation, labelnames, buckets=buckets)
+
+
+def render(multiproc_dir: str = settings.PROMETHEUS_MULTIPROC_DIR) -> bytes:
+    """All workers' metrics merged, in Prometheus text format"""
+    if not multiproc_dir:
+        return generate_latest(REGISTRY)
+    forget_exited_workers(multiproc_dir)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=multiproc_dir)
+    return generate_latest(registry)
+
+
+def mark_worker_exited(pid: int, multiproc_dir: str = settings.PROMETHEUS_MULTIPROC_DIR) -> None:
+    """Drop a worker's live gauges (its counters and histograms are kept)"""
+    if multiproc_dir:
+        multiprocess.mark_process_dead(pid, multiproc_dir)
+
+
+def forget_exited_workers(multiproc_dir: str) -> None:
+    """Drop live gauges of workers that exited without shutting down cleanly"""
+    pids = set()
+    for path in glob.glob(os.path.join(multiproc_dir, "gauge_live*.db")):
+        match = _LIVE_GAUGE_FILE.search(os.path.basename(path))
+        if match:
+            pids.add(int(match.group(1)))
+    for pid in pids - {os.getpid()}:
+        if not _pid_alive(pid):
+            logger.info(f"Dropping live metrics of exited worker {pid}")
+            mark_worker_exited(pid, multiproc_dir)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
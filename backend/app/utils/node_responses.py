@@ -0,0 +1,13 @@
+"""
+Helpers for algod and indexer client responses
+"""
+
+from typing import Any, Dict, Union
+import json
+
+
+def as_dict(raw: Union[bytes, Dict[str, Any]]) -> Dict[str, Any]:
+    """Decode a response the SDK returned as raw JSON bytes; dicts pass through"""
+    if isinstance(raw, bytes):
+        return json.loads(raw.decode("utf-8"))
+    return raw
@@ -0,0 +1,65 @@
+"""
+Latency and outcome metrics for calls to the Algorand node, indexer and IPFS
+
+Every outbound call is timed into outbound_request_duration_seconds and
+counted in outbound_requests_total with its outcome, labelled by service
+(algod, indexer, ipfs, ipfs_gateway) and endpoint: the SDK method name for
+algod and indexer (account_info, suggested_params, ...), the API path for
+IPFS (/api/v0/add). Compared with http_request_db_seconds, this tells
+whether a slow page is waiting on the database or on the node.
+"""
+
+from typing import Any, Callable, Dict
+import functools
+import time
+from app.utils import metrics
+
+outbound_request_duration_seconds = metrics.histogram(
+    "outbound_request_duration_seconds", "Outbound call latency by service and endpoint", ("service", "endpoint")
+)
+outbound_requests_total = metrics.counter(
+    "outbound_requests_total", "Outbound calls by service, endpoint and outcome (ok, error)",
+    ("service", "endpoint", "outcome")
+)
+
+
+def record_call(service: str, endpoint: str, seconds: float, ok: bool) -> None:
+    """Record one finished outbound call"""
+    outbound_request_duration_seconds.labels(service=service, endpoint=endpoint).observe(seconds)
+    outbound_requests_total.labels(service=service, endpoint=endpoint, outcome="ok" if ok else "error").inc()
+
+
+class InstrumentedClient:
+    """
+    Wraps an algosdk AlgodClient or IndexerClient and records every public method call
+
+    Attributes that are not methods are passed through unchanged, so the
+    wrapper can be handed to anything that takes the client.
+    """
+
+    def __init__(self, client: Any, service: str):
+        self._client = client
+        self._service = service
+        self._methods: Dict[str, Callable] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        method = self._methods.get(name)
+        if method is not None:
+            return method
+        attribute = getattr(self._client, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            ok = False
+            try:
+                result = attribute(*args, **kwargs)
+                ok = True
+                return result
+            finally:
+                record_call(self._service, name, time.perf_counter() - started, ok)
+
+        self._methods[name] = timed
+        return timed
@@ -0,0 +1,117 @@
+"""
+SQL statement counting per request, with an N+1 warning
+
+Engine event hooks time every statement. Statements run while handling a
+request are also added to that request's QueryStats, held in a context
+variable set by MetricsMiddleware, so the totals cover the endpoint, its
+dependencies and any threads they start. Statements are grouped by their
+SQL text with bound parameters left as placeholders; the same shape run
+many times in one request is the signature of an N+1 query.
+
+Reference: https://docs.sqlalchemy.org/en/20/faq/performance.html#query-profiling
+"""
+
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import logging
+import time
+from app.config import settings
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+db_statement_duration_seconds = metrics.histogram(
+    "db_statement_duration_seconds", "SQL statement latency by operation", ("operation",)
+)
+http_request_db_statements = metrics.histogram(
+    "http_request_db_statements", "SQL statements per HTTP request by route template", ("route",),
+    buckets=(1, 2, 5, 10, 20, 50, 100, 250)
+)
+http_request_db_seconds = metrics.histogram(
+    "http_request_db_seconds", "Time spent in SQL statements per HTTP request by route template", ("route",)
+)
+db_repeated_statements_total = metrics.counter(
+    "db_repeated_statements_total",
+    "Requests that ran one statement shape more than DB_REPEATED_STATEMENT_THRESHOLD times",
+    ("route",)
+)
+
+
+@dataclass
+class QueryStats:
+    statements: int = 0
+    seconds: float = 0.0
+    shapes: Counter = field(default_factory=Counter)  # SQL text -> executions
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.statements += 1
+        self.seconds += seconds
+        self.shapes[statement] += 1
+
+
+# Stats of the request being handled, if any (background workers have none)
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def _operation(statement: str) -> str:
+    words = statement.lstrip().split(None, 1)
+    return words[0].upper() if words else "UNKNOWN"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    db_statement_duration_seconds.labels(operation=_operation(statement)).observe(elapsed)
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every statement run on engine (pass AsyncEngine.sync_engine for async engines)"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def finish_request(
+    stats: QueryStats,
+    method: str,
+    route: str,
+    threshold: int = settings.DB_REPEATED_STATEMENT_THRESHOLD
+) -> None:
+    """
+    Record a finished request's totals and warn about repeated statement shapes
+
+    Args:
+        stats: The request's QueryStats
+        method: HTTP method
+        route: Route template
+        threshold: Executions of one shape above which to warn (0 disables)
+    """
+    http_request_db_statements.labels(route=route).observe(stats.statements)
+    http_request_db_seconds.labels(route=route).observe(stats.seconds)
+    if not threshold or not stats.shapes:
+        return
+
+    statement, executions = stats.shapes.most_common(1)[0]
+    if executions > threshold:
+        db_repeated_statements_total.labels(route=route).inc()
+        logger.warning(
+            f"Possible N+1 query: {method} {route} ran the same statement {executions} times "
+            f"({stats.statements} statements in total): {' '.join(statement.split())[:300]}"
+        )
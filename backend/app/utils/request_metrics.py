@@ -0,0 +1,99 @@
+"""
+Per-route HTTP metrics
+
+A plain ASGI middleware (no per-request Request object or extra task) records
+latency and counts by status code; an app-wide dependency, which runs once the
+route is known, counts requests in flight. Routes are labelled by their
+template, e.g. /api/tenders/{tender_id}, so label cardinality stays bounded;
+requests that match no route share one label.
+
+The middleware also collects the request's SQL statements (see
+app.utils.query_stats) and, with DEBUG, reports them in X-DB-Queries and
+X-DB-Time response headers. Headers are sent before a streamed body
+(StreamingResponse, which has no Content-Length), so statements run while
+streaming could not be counted in them; streamed responses get no X-DB
+headers, and their full totals are only in the http_request_db_* metrics.
+"""
+
+from typing import Any, Dict
+from fastapi import Request
+import time
+from app.config import settings
+from app.utils import metrics
+from app.utils.query_stats import QueryStats, current_query_stats, finish_request
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Scope key holding the label the in-flight gauge was raised under
+_IN_FLIGHT_KEY = "metrics.in_flight_route"
+
+http_requests_total = metrics.counter(
+    "http_requests_total", "HTTP requests by route template and status code", ("method", "route", "status")
+)
+http_request_duration_seconds = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route")
+)
+http_requests_in_progress = metrics.gauge(
+    "http_requests_in_progress", "HTTP requests being handled by route template", ("method", "route")
+)
+
+
+def route_template(scope: Dict[str, Any]) -> str:
+    """Full path template of the route the request was dispatched to"""
+    # Newer FastAPI composes included routers lazily: scope["route"] is the
+    # route as declared on its router, and the prefixed path is kept on the
+    # effective route context
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    route = context or scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+async def track_in_flight(request: Request) -> None:
+    """App-wide dependency: count the request in flight under its route"""
+    route = route_template(request.scope)
+    request.scope[_IN_FLIGHT_KEY] = route
+    http_requests_in_progress.labels(method=request.method, route=route).inc()
+
+
+class MetricsMiddleware:
+    """Records http_* metrics for every HTTP request"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        query_stats = QueryStats()
+        token = current_query_stats.set(query_stats)
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                streamed = not any(name.lower() == b"content-length" for name, _ in headers)
+                if settings.DEBUG and not streamed:
+                    message["headers"] = headers + [
+                        (b"x-db-queries", str(query_stats.statements).encode()),
+                        (b"x-db-time", f"{query_stats.seconds * 1000:.2f}ms".encode()),
+                    ]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_query_stats.reset(token)
+            method = scope["method"]
+            route = route_template(scope)
+            finish_request(query_stats, method, route)
+            http_request_duration_seconds.labels(method=method, route=route).observe(elapsed)
+            http_requests_total.labels(method=method, route=route, status=status_code).inc()
+            in_flight_route = scope.get(_IN_FLIGHT_KEY)
+            if in_flight_route is not None:
+                http_requests_in_progress.labels(method=method, route=in_flight_route).dec()
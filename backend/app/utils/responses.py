@@ -0,0 +1,21 @@
+"""
+Response helpers that serialize already-validated models straight to JSON bytes
+"""
+
+from fastapi import Response
+from pydantic import BaseModel
+
+
+def model_json_response(model: BaseModel, status_code: int = 200) -> Response:
+    """
+    Serialize a model with its compiled pydantic-core serializer
+
+    Returning a Response directly skips FastAPI's response_model revalidation and
+    the jsonable_encoder pass, so build the model with model_construct() when its
+    values come from trusted ORM columns.
+    """
+    return Response(
+        content=model.model_dump_json(),
+        status_code=status_code,
+        media_type="application/json"
+    )
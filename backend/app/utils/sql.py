@@ -0,0 +1,15 @@
+"""
+SQL helpers for statements that differ between database dialects
+"""
+
+from typing import Any
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# PostgreSQL in deployments, SQLite in tests
+_INSERT_BY_DIALECT = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def dialect_insert(db: AsyncSession, table: Any):
+    """INSERT for the session's dialect, with on_conflict_do_nothing / on_conflict_do_update"""
+    return _INSERT_BY_DIALECT[db.get_bind().dialect.name](table)
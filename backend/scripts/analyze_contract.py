@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Script to report opcode cost, box I/O and program size of the FairLens contract
+
+Runs offline (no algod). Exits non-zero when a method no longer fits its
+opcode budget, the program outgrows its size limit, or, with --baseline, when
+any number grew compared to a previously saved --json report.
+
+    python scripts/analyze_contract.py --json > contract_budget.json
+    python scripts/analyze_contract.py --baseline contract_budget.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from algosdk.encoding import encode_address
+from app.contracts.fairlens_contract import FairLensContract
+from app.contracts.teal_analyzer import (
+    APP_CALL_BUDGET,
+    FAIRLENS_APP_CALL_LIMITS,
+    analyze_fairlens_contract,
+    budget_violations,
+)
+
+# Placeholder roles; addresses do not change cost or size
+SAMPLE_ADDRESSES = [encode_address(bytes([i]) * 32) for i in (1, 2, 3)]
+COMPARED_FIELDS = ["opcode_cost", "box_bytes_read", "box_bytes_written", "inner_txns"]
+
+
+def regressions(report: dict, baseline: dict) -> list:
+    """Numbers that grew compared to the baseline report"""
+    found = []
+    if report["bytecode_size"] > baseline["bytecode_size"]:
+        found.append(f"bytecode_size {baseline['bytecode_size']} -> {report['bytecode_size']}")
+    for name, method in report["methods"].items():
+        previous = baseline["methods"].get(name)
+        if previous is None:
+            continue
+        for field in COMPARED_FIELDS:
+            if method[field] > previous[field]:
+                found.append(f"{name}.{field} {previous[field]} -> {method[field]}")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--baseline", type=Path, help="fail if anything grew compared to this JSON report")
+    args = parser.parse_args()
+
+    owner, contractor, verifier = SAMPLE_ADDRESSES
+    report = analyze_fairlens_contract(FairLensContract(owner, contractor, verifier, total_amount=1_000_000))
+    data = report.to_dict()
+
+    if args.json:
+        print(json.dumps(data, indent=2))
+    else:
+        print(f"Bytecode size: {report.bytecode_size} bytes")
+        print(f"Dispatch cost: {report.dispatch_cost}")
+        print(f"{'method':<18} {'cost':>6} {'calls':>5} {'box rd':>7} {'box wr':>7} {'itxns':>5}")
+        for name, method in report.methods.items():
+            print(
+                f"{name:<18} {method.opcode_cost:>6} {method.app_calls_needed:>5} "
+                f"{method.box_bytes_read:>7} {method.box_bytes_written:>7} {method.inner_txns:>5}"
+            )
+        print(f"(budget is {APP_CALL_BUDGET} per app call; box bytes are upper bounds)")
+
+    problems = budget_violations(report, FAIRLENS_APP_CALL_LIMITS)
+    if args.baseline:
+        problems += regressions(data, json.loads(args.baseline.read_text()))
+
+    for problem in problems:
+        print(f"FAIL: {problem}", file=sys.stderr)
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
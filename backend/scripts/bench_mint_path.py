@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Script to benchmark the NFT mint path offline
+
+Per NFT: build ARC-3 metadata, pin it through IPFSService on the local
+blockstore backend (real CIDs, no network), and build the unsigned
+asset-create transaction with fixed suggested params (no algod).
+"""
+
+import sys
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from algosdk import account, transaction
+from app.services.nft_service import nft_service
+from app.utils.ipfs import IPFSService
+from app.utils.ipfs_backends import LocalBlockstoreBackend
+
+COUNT = 500
+
+
+async def mint_path(ipfs: IPFSService, sender: str, params: transaction.SuggestedParams) -> None:
+    for index in range(COUNT):
+        arc3 = await nft_service.create_arc3_metadata(
+            name=f"FairLens Contract #1 Milestone {index}",
+            description="Proof of completed milestone",
+            contract_id=1,
+            milestone_index=index
+        )
+        assert await ipfs.ensure_pinned(arc3["metadata_bytes"], arc3["ipfs_cid"])
+        await nft_service.mint_nft(
+            sender_address=sender,
+            name=f"FL Milestone {index}",
+            unit_name="FLNFT",
+            metadata=arc3["metadata"],
+            metadata_url=arc3["ipfs_url"],
+            metadata_hash=arc3["metadata_hash_bytes"],
+            params=params
+        )
+
+
+def main():
+    sender = account.generate_account()[1]
+    params = transaction.SuggestedParams(
+        fee=1000, first=1, last=1001,
+        gh="SGO1GKSzyE7IEPItTxCByw9x8FmnrCDexi9/cOUJOiI=", flat_fee=True
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        ipfs = IPFSService(backend=LocalBlockstoreBackend(directory=directory))
+        started = time.perf_counter()
+        asyncio.run(mint_path(ipfs, sender, params))
+        elapsed = time.perf_counter() - started
+
+    print(f"Mint path (metadata + local pin + unsigned txn), {COUNT} NFTs")
+    print(f"  total:      {elapsed * 1000:.1f} ms")
+    print(f"  per NFT:    {elapsed / COUNT * 1000:.3f} ms")
+    print(f"  throughput: {COUNT / elapsed:.0f} NFTs/s")
+
+
+if __name__ == "__main__":
+    main()
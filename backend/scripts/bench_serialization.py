@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Script to benchmark tender list serialization (100-item page)
+
+Compares the previous path (construct + validate each TenderResponse, let
+FastAPI revalidate against response_model, encode with the stdlib json module)
+with the pre-built TypeAdapter path used by the tender routes.
+"""
+
+import sys
+import json
+import timeit
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from typing import List
+from app.models.tender import TenderStatus
+from app.schemas.tender import TenderResponse, TenderListAdapter
+
+PAGE_SIZE = 100
+ROUNDS = 200
+
+
+def sample_rows() -> List[dict]:
+    """Build a page of tender rows shaped like the ORM values"""
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": i,
+            "title": f"Road repair package {i}",
+            "description": "Resurfacing and drainage works " * 4,
+            "location": "Pune, Maharashtra",
+            "category": "infrastructure",
+            "budget": Decimal("2500000.00"),
+            "deadline": now,
+            "start_date": now,
+            "duration_months": 12,
+            "status": TenderStatus.ACTIVE,
+            "gov_id": 1,
+            "blockchain_hash": "0x" + "ab" * 32,
+            "created_at": now,
+            "applications_count": i % 7,
+        }
+        for i in range(PAGE_SIZE)
+    ]
+
+
+def previous_path(rows: List[dict], response_adapter: TypeAdapter) -> bytes:
+    responses = [TenderResponse(**row) for row in rows]
+    validated = response_adapter.validate_python(jsonable_encoder(responses))
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+
+def optimized_path(rows: List[dict]) -> bytes:
+    responses = [TenderResponse.model_construct(**row) for row in rows]
+    return TenderListAdapter.dump_json(responses)
+
+
+def main():
+    rows = sample_rows()
+    response_adapter = TypeAdapter(List[TenderResponse])
+
+    assert json.loads(previous_path(rows, response_adapter)) == json.loads(optimized_path(rows))
+
+    previous = timeit.timeit(lambda: previous_path(rows, response_adapter), number=ROUNDS)
+    optimized = timeit.timeit(lambda: optimized_path(rows), number=ROUNDS)
+
+    print(f"Tender list serialization, {PAGE_SIZE} items x {ROUNDS} rounds")
+    print(f"  previous:  {previous / ROUNDS * 1000:.3f} ms/page")
+    print(f"  optimized: {optimized / ROUNDS * 1000:.3f} ms/page")
+    print(f"  speedup:   {previous / optimized:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from app.services.blockchain import BlockchainService
 from app.services.nft_service import nft_service
 from app.contracts.fairlens_contract import FairLensContract
+from app.contracts import methods
 from app.config import settings
 import algosdk
 from algosdk import transaction, mnemonic, account, util
@@ -175,18 +176,11 @@ async def demo_workflow():
         # Step 3: Add Milestone
         print("\n=== Step 3: Adding Milestone ===")
         
-        # Create milestone addition transaction
-        # Method ID 1 for add_milestone
-        milestone_args = [
-            1,  # Method ID
-            DEMO_MILESTONE_INDEX,
-            DEMO_MILESTONE_AMOUNT,
-            DEMO_MILESTONE_DUE_DATE
-        ]
-        
-        # Convert args to bytes
-        app_args = [arg.to_bytes(8, 'big') if isinstance(arg, int) else arg.encode() for arg in milestone_args]
-        app_args[0] = (1).to_bytes(1, 'big')  # Method ID as single byte
+        # Create milestone addition transaction (ARC-4 selector + encoded args)
+        app_args = methods.encode_method_args(
+            methods.ADD_MILESTONE,
+            [DEMO_MILESTONE_INDEX, DEMO_MILESTONE_AMOUNT, DEMO_MILESTONE_DUE_DATE]
+        )
         
         # Create application call transaction
         milestone_params = blockchain_service.algod_client.suggested_params()
@@ -214,21 +208,18 @@ async def demo_workflow():
         
         # Sign the message (using the same account for demo)
         # Use the correct method for signing
-        signature = util.sign_bytes(verification_message, private_key)
+        # sign_bytes returns base64; the ABI byte[64] argument takes the raw signature
+        signature = base64.b64decode(util.sign_bytes(verification_message, private_key))
         
         # Create proof hash (SHA256 of some document)
         proof_document = b"Proof of work for milestone completion"
         proof_hash = hashlib.sha256(proof_document).digest()
         
         # Create verification transaction
-        # Method ID 2 for verify_milestone
-        verify_args = [
-            (2).to_bytes(1, 'big'),  # Method ID
-            DEMO_MILESTONE_INDEX.to_bytes(8, 'big'),
-            signature,
-            verification_message,
-            proof_hash
-        ]
+        verify_args = methods.encode_method_args(
+            methods.VERIFY_MILESTONE,
+            [DEMO_MILESTONE_INDEX, signature, proof_hash]
+        )
         
         verify_params = blockchain_service.algod_client.suggested_params()
         verify_txn = transaction.ApplicationNoOpTxn(
@@ -252,11 +243,7 @@ async def demo_workflow():
         print("\n=== Step 5: Releasing Payment ===")
         
         # Create payment release transaction
-        # Method ID 3 for release_payment
-        payment_args = [
-            (3).to_bytes(1, 'big'),  # Method ID
-            DEMO_MILESTONE_INDEX.to_bytes(8, 'big')
-        ]
+        payment_args = methods.encode_method_args(methods.RELEASE_PAYMENT, [DEMO_MILESTONE_INDEX])
         
         payment_params = blockchain_service.algod_client.suggested_params()
         payment_txn = transaction.ApplicationNoOpTxn(